@@ -0,0 +1,80 @@
+"""Pre-warm the grid metric cache (cell area, zonal/meridional extents and level thickness) for each model grid"""
+
+import sys
+script_dir = sys.path[0]
+import os
+import pdb
+import argparse
+
+import iris
+
+repo_dir = '/'.join(script_dir.split('/')[:-1])
+module_dir = repo_dir + '/modules'
+sys.path.append(module_dir)
+try:
+    import general_io as gio
+    import spatial_weights
+except ImportError:
+    raise ImportError('Script and modules in wrong directories')
+
+
+def cache_metrics(cube):
+    """Calculate (and thereby cache) the grid metrics for a cube."""
+
+    coord_names = [coord.name() for coord in cube.dim_coords]
+    if coord_names[0] == 'time':
+        cube = cube[0, ...]
+        coord_names = coord_names[1:]
+    cached = []
+
+    if ('latitude' in coord_names) and ('longitude' in coord_names):
+        spatial_weights.area_array(cube)
+        spatial_weights.calc_meridional_weights(cube.coord('latitude'), coord_names, cube.shape)
+        spatial_weights.calc_zonal_weights(cube, coord_names)
+        cached.extend(['area', 'meridional', 'zonal'])
+
+    if 'depth' in coord_names:
+        depth_coord = cube.coord('depth')
+        if str(depth_coord.units) == 'dbar':
+            spatial_weights.calc_vertical_weights_2D(depth_coord, cube.coord('latitude'), coord_names, cube.shape)
+            cached.append('vertical_2D')
+        else:
+            spatial_weights.calc_vertical_weights_1D(depth_coord, coord_names, cube.shape)
+            cached.append('vertical_1D')
+
+    return cached
+
+
+def main(inargs):
+    """Run the program."""
+
+    cache_dir = gio.get_cache_dir('grid_metrics')
+    if inargs.clear:
+        spatial_weights.prune_grid_metric_cache(cache_dir, max_bytes=0)
+
+    for infile in inargs.infiles:
+        cube = iris.load_cube(infile, gio.check_iris_var(inargs.var))
+        cached = cache_metrics(cube)
+        print(infile, ':', ', '.join(cached) if cached else 'no metrics for this grid')
+
+    spatial_weights.prune_grid_metric_cache(cache_dir, max_bytes=inargs.max_size * 1e9)
+    cache_files = os.listdir(cache_dir)
+    cache_bytes = sum([os.path.getsize(os.path.join(cache_dir, name)) for name in cache_files])
+    print('%s: %i files, %.1f MB' %(cache_dir, len(cache_files), cache_bytes / 1e6))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     argument_default=argparse.SUPPRESS,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument("infiles", type=str, nargs='*', help="One input file for each model grid")
+    parser.add_argument("var", type=str, help="Variable standard name")
+
+    parser.add_argument("--max_size", type=float, default=2.0,
+                        help="Maximum size of the on-disk cache (GB) [default=2.0]")
+    parser.add_argument("--clear", action="store_true", default=False,
+                        help="Clear the cache before pre-warming it [default=False]")
+
+    args = parser.parse_args()
+    main(args)
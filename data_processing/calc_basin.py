@@ -41,7 +41,7 @@ def construct_basin_cube(basin_array, global_atts, dim_coords):
     for i, coord in enumerate(dim_coords):
         dim_coords_list.append((coord, i))
 
-    basin_cube = iris.cube.Cube(basin_array,
+    basin_cube = iris.cube.Cube(basin_array.astype(numpy.uint8),
                                 standard_name='region',
                                 long_name='Region Selection Index',
                                 var_name='basin',
@@ -67,6 +67,32 @@ def check_lon_coord(lon_coord):
     return lon_coord
 
 
+def lookup_basins(features, rule):
+    """Assign basins with a lookup table indexed by a set of boolean features.
+
+    Each grid point gets a code made up of one bit per feature. The rule
+      is evaluated once for every possible combination of the features
+      (rather than for every grid point) and the basins are then found
+      with a single lookup.
+
+    Args:
+      features (list): Boolean arrays (all the same shape)
+      rule (function): Takes one boolean array per feature and returns the basin values
+
+    """
+
+    nfeatures = len(features)
+    codes = numpy.zeros(features[0].shape, dtype=numpy.uint16)
+    for bit, feature in enumerate(features):
+        codes |= numpy.asarray(feature, dtype=numpy.uint16) << bit
+
+    combinations = numpy.arange(2 ** nfeatures)
+    combination_features = [((combinations >> bit) & 1).astype(bool) for bit in range(nfeatures)]
+    lookup_table = numpy.asarray(rule(*combination_features)).astype(numpy.uint8)
+
+    return lookup_table[codes]
+
+
 def basins_from_cmip(cmip_basin_cube, lat_array, lon_array, pacific_lon_bounds, indian_lon_bounds):
     """Define basins using CMIP basin file information.
 
@@ -85,22 +111,33 @@ def basins_from_cmip(cmip_basin_cube, lat_array, lon_array, pacific_lon_bounds,
         marginal seas = 17
         land = 18
 
+      The output is found with a single lookup table indexed by
+        CMIP value, hemisphere and longitude band.
+
     """
 
-    # Break up the southern ocean
-    basin_array = numpy.where(cmip_basin_cube.data == 1, 12, cmip_basin_cube.data)
-    basin_array = numpy.where((basin_array == 12) & (lon_array >= pacific_lon_bounds[0]) & (lon_array <= pacific_lon_bounds[1]), 14, basin_array)
-    basin_array = numpy.where((basin_array == 12) & (lon_array >= indian_lon_bounds[0]) & (lon_array <= indian_lon_bounds[1]), 15, basin_array)
-
-    # Define the rest of the new regions
-    basin_array = numpy.where((basin_array == 2) & (lat_array >= 0), 11, basin_array)
-    basin_array = numpy.where((basin_array == 2) & (lat_array < 0), 12, basin_array)
-    basin_array = numpy.where((basin_array == 3) & (lat_array >= 0), 13, basin_array)
-    basin_array = numpy.where((basin_array == 3) & (lat_array < 0), 14, basin_array)
-    basin_array = numpy.where(basin_array == 5, 15, basin_array)
-    basin_array = numpy.where(basin_array == 4, 16, basin_array)
-    basin_array = numpy.where(basin_array == 0, 18, basin_array)
-    basin_array = numpy.where((basin_array >= 6) & (basin_array <= 10), 17, basin_array)
+    # lookup_table[cmip value, hemisphere (south, north), lon band (other, pacific, indian)]
+    lookup_table = numpy.zeros([11, 2, 3], dtype=numpy.uint8)
+    lookup_table[0, ...] = 18
+    lookup_table[1, ...] = [12, 14, 15]  # break up the southern ocean
+    lookup_table[2, ...] = [[12], [11]]
+    lookup_table[3, ...] = [[14], [13]]
+    lookup_table[4, ...] = 16
+    lookup_table[5, ...] = 15
+    lookup_table[6:11, ...] = 17
+
+    cmip_mask = numpy.ma.getmask(cmip_basin_cube.data)
+    cmip_values = numpy.ma.filled(cmip_basin_cube.data, 0).astype(int)
+    assert cmip_values.min() >= 0
+    assert cmip_values.max() <= 10
+    hemisphere = (lat_array >= 0).astype(int)
+    pacific = (lon_array >= pacific_lon_bounds[0]) & (lon_array <= pacific_lon_bounds[1])
+    indian = (lon_array >= indian_lon_bounds[0]) & (lon_array <= indian_lon_bounds[1])
+    lon_band = numpy.where(pacific, 1, numpy.where(indian, 2, 0))
+
+    basin_array = lookup_table[cmip_values, hemisphere, lon_band]
+    if cmip_mask is not numpy.ma.nomask:
+        basin_array = numpy.ma.masked_array(basin_array, mask=cmip_mask)
 
     assert basin_array.min() == 11
     assert basin_array.max() == 18
@@ -108,6 +145,34 @@ def basins_from_cmip(cmip_basin_cube, lat_array, lon_array, pacific_lon_bounds,
     return basin_array
 
 
+def _manual_basin_rule(pacific, indian, north_america, central_america, indonesia, 
+                       north_indian, south, marginal, arctic, land):
+    """Basin values for each combination of the basins_manually features."""
+
+    # Split the world into three basins
+    basin_array = numpy.where(pacific, 13, 11)
+    basin_array = numpy.where(indian, 15, basin_array)
+    basin_array = numpy.where((basin_array == 13) & (north_america | central_america), 11, basin_array)
+    basin_array = numpy.where((basin_array == 15) & indonesia, 13, basin_array)
+    basin_array = numpy.where((basin_array == 15) & north_indian, 17, basin_array)
+
+    # Break Pacific and Atlantic into north and south
+    basin_array = numpy.where((basin_array == 11) & south, 12, basin_array)
+    basin_array = numpy.where((basin_array == 13) & south, 14, basin_array)
+
+    basin_array = numpy.where(marginal, 17, basin_array)
+    basin_array = numpy.where(arctic, 16, basin_array)
+    basin_array = numpy.where(land, 18, basin_array)
+
+    return basin_array
+
+
+def _in_box(lat_array, lon_array, lat_bounds, lon_bounds):
+    """Find the points in a lat/lon box."""
+
+    return (lon_array >= lon_bounds[0]) & (lon_array <= lon_bounds[1]) & (lat_array >= lat_bounds[0]) & (lat_array <= lat_bounds[1])
+
+
 def basins_manually(cube, lat_array, lon_array, pacific_lon_bounds, indian_lon_bounds):
     """Define basins manually (i.e. without assistance from CMIP basin file)
 
@@ -124,39 +189,31 @@ def basins_manually(cube, lat_array, lon_array, pacific_lon_bounds, indian_lon_b
     """
 
     assert cube.shape == lat_array.shape == lon_array.shape 
+    assert cube.data.mask.shape, "reference data needs land mask"
 
-    # Split the world into three basins
-    basin_array = numpy.ones(lat_array.shape) * 11
-    basin_array = numpy.where((lon_array >= pacific_lon_bounds[0]) & (lon_array <= pacific_lon_bounds[1]), 13, basin_array)
-    basin_array = numpy.where((lon_array >= indian_lon_bounds[0]) & (lon_array <= indian_lon_bounds[1]), 15, basin_array)
-    basin_array = numpy.where((basin_array == 13) & (lon_array >= 275) & (lat_array >= 9), 11, basin_array)
-    basin_array = numpy.where((basin_array == 13) & (lon_array >= 260) & (lat_array >= 16), 11, basin_array)
-    basin_array = numpy.where((basin_array == 15) & (lon_array >= 105) & (lat_array >= -8), 13, basin_array)
-    basin_array = numpy.where((basin_array == 15) & (lat_array >= 25), 17, basin_array)
-
-    # Break Pacific and Atlantic into north and south
-    basin_array = numpy.where((basin_array == 11) & (lat_array < 0), 12, basin_array)
-    basin_array = numpy.where((basin_array == 13) & (lat_array < 0), 14, basin_array)
-
-    # Marginal seas
     hudson_lat_bounds = [51, 75]
     hudson_lon_bounds = [265, 296]
-    basin_array = numpy.where((lon_array >= hudson_lon_bounds[0]) & (lon_array <= hudson_lon_bounds[1]) & (lat_array >= hudson_lat_bounds[0]) & (lat_array <= hudson_lat_bounds[1]), 17, basin_array)
-
     baltic_lat_bounds = [54, 65.5]
     baltic_lon_bounds = [8.5, 33]
-    basin_array = numpy.where((lon_array >= baltic_lon_bounds[0]) & (lon_array <= baltic_lon_bounds[1]) & (lat_array >= baltic_lat_bounds[0]) & (lat_array <= baltic_lat_bounds[1]), 17, basin_array)
-
     med_red_black_lat_bounds = [12.5, 45.5]
     med_red_black_lon_bounds1 = [0, 43]
     med_red_black_lon_bounds2 = [354, 360]
-    basin_array = numpy.where((lon_array >= med_red_black_lon_bounds1[0]) & (lon_array <= med_red_black_lon_bounds1[1]) & (lat_array >= med_red_black_lat_bounds[0]) & (lat_array <= med_red_black_lat_bounds[1]), 17, basin_array)
-    basin_array = numpy.where((lon_array >= med_red_black_lon_bounds2[0]) & (lon_array <= med_red_black_lon_bounds2[1]) & (lat_array >= med_red_black_lat_bounds[0]) & (lat_array <= med_red_black_lat_bounds[1]), 17, basin_array)
-
-    basin_array = numpy.where(lat_array >= 67, 16, basin_array)  # arctic ocean
-
-    assert cube.data.mask.shape, "reference data needs land mask"
-    basin_array = numpy.where(cube.data.mask == True, 18, basin_array)  # Land
+    marginal = _in_box(lat_array, lon_array, hudson_lat_bounds, hudson_lon_bounds)
+    marginal |= _in_box(lat_array, lon_array, baltic_lat_bounds, baltic_lon_bounds)
+    marginal |= _in_box(lat_array, lon_array, med_red_black_lat_bounds, med_red_black_lon_bounds1)
+    marginal |= _in_box(lat_array, lon_array, med_red_black_lat_bounds, med_red_black_lon_bounds2)
+
+    features = [(lon_array >= pacific_lon_bounds[0]) & (lon_array <= pacific_lon_bounds[1]),
+                (lon_array >= indian_lon_bounds[0]) & (lon_array <= indian_lon_bounds[1]),
+                (lon_array >= 275) & (lat_array >= 9),
+                (lon_array >= 260) & (lat_array >= 16),
+                (lon_array >= 105) & (lat_array >= -8),
+                lat_array >= 25,
+                lat_array < 0,
+                marginal,
+                lat_array >= 67,  # arctic ocean
+                cube.data.mask == True]  # land
+    basin_array = lookup_basins(features, _manual_basin_rule)
     
     assert basin_array.min() == 11
     assert basin_array.max() == 18
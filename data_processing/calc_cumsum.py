@@ -27,6 +27,7 @@ sys.path.append(modules_dir)
 
 try:
     import general_io as gio
+    import result_cache
     import convenient_universal as uconv
     import timeseries
 except ImportError:
@@ -74,6 +75,11 @@ author:
                         help="Convert units from a flux to a magnitude [default: False]")
     parser.add_argument("--annual", action="store_true", default=False,
                         help="Output annual mean [default=False]")
+    parser.add_argument("--result_cache", action="store_true", default=False,
+                        help="Reuse the output of an identical earlier run (see manage_result_cache.py) [default: False]")
 
     args = parser.parse_args()            
-    main(args)
+    if args.result_cache:
+        result_cache.run_cached(main, args, __file__)
+    else:
+        main(args)
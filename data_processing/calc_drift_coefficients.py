@@ -28,6 +28,7 @@ sys.path.append(modules_dir)
 
 try:
     import general_io as gio
+    import result_cache
     import timeseries
 except ImportError:
     raise ImportError('Must run this script from anywhere within the ocean-analysis git repo')
@@ -52,20 +53,28 @@ def save_history(cube, field, filename):
 
 
 def polyfit(data, time_axis, masked_array, outlier_threshold):
-    """Fit polynomial to data."""    
+    """Fit a cubic polynomial to every timeseries in the data.
+
+    Returns the coefficients in a + bx + cx^2 + dx^3 order. Timeseries
+      with missing values are masked if the data is a masked array
+      (i.e. the first time step has missing values), otherwise they
+      are fitted to their valid points (as per numpy.ma.polyfit).
+
+    """    
+
+    if outlier_threshold:
+        data, outlier_idx = timeseries.outlier_removal(data, outlier_threshold)
+    coeffs = timeseries.polyfit_columns(data, time_axis, 3)
 
     if not masked_array:
-        if outlier_threshold:
-            data, outlier_idx = timeseries.outlier_removal(data, outlier_threshold)
-        coeffs = numpy.ma.polyfit(time_axis, data, 3)[::-1]
-    elif data.mask.sum() > 0:
-        coeffs = numpy.array([data.fill_value]*4) 
-    else:    
-        if outlier_threshold:
-            data, outlier_idx = timeseries.outlier_removal(data, outlier_threshold)
-        coeffs = numpy.ma.polyfit(time_axis, data, 3)[::-1]
+        ntimes = data.shape[0]
+        flat_data = numpy.ma.asarray(data).reshape(ntimes, -1)
+        flat_coeffs = numpy.ma.getdata(coeffs).reshape(4, -1).copy()
+        for column in numpy.flatnonzero(numpy.ma.getmaskarray(coeffs).reshape(4, -1)[0, :]):
+            flat_coeffs[:, column] = numpy.ma.polyfit(time_axis, flat_data[:, column], 3)
+        coeffs = numpy.ma.masked_array(flat_coeffs.reshape(coeffs.shape))
 
-    return coeffs
+    return coeffs[::-1, ...]
 
 
 def is_masked_array(array):
@@ -94,28 +103,21 @@ def calc_coefficients(cube, coord_names, masked_array=True, convert_annual=False
         assert coord_names[1] == 'depth', 'coordinate order must be time, depth, ...'
         out_shape = list(cube.shape)
         out_shape[0] = 4
-        coefficients = numpy.zeros(out_shape)   #, dtype=numpy.float32)
+        coefficients = numpy.ma.zeros(out_shape)   #, dtype=numpy.float32)
         for d, cube_slice in enumerate(cube.slices_over('depth')):
             print('Depth:', cube_slice.coord('depth').points[0])
             if convert_annual:
                 cube_slice = timeseries.convert_to_annual(cube_slice, chunk=chunk_annual)
             time_axis = cube_slice.coord(time_var).points  #.astype(numpy.float32)
-            coefficients[:,d, ::] = numpy.ma.apply_along_axis(polyfit, 0, cube_slice.data, time_axis,
-                                                              masked_array, outlier_threshold)
-        fill_value = cube_slice.data.fill_value 
-        coefficients = numpy.ma.masked_values(coefficients, fill_value)
+            coefficients[:,d, ::] = polyfit(cube_slice.data, time_axis, masked_array, outlier_threshold)
     else:
         if convert_annual:
             cube = timeseries.convert_to_annual(cube)
         time_axis = cube.coord(time_var).points  # .astype(numpy.float32)
-        if cube.ndim == 1:
-            coefficients = polyfit(cube.data, time_axis, masked_array, outlier_threshold)
-        else:   
-            coefficients = numpy.ma.apply_along_axis(polyfit, 0, cube.data, time_axis,
-                                                     masked_array, outlier_threshold)
-            if masked_array:
-                fill_value = cube.data.fill_value 
-                coefficients = numpy.ma.masked_values(coefficients, fill_value)
+        coefficients = polyfit(cube.data, time_axis, masked_array, outlier_threshold)
+
+    if not masked_array:
+        coefficients = coefficients.data
     
     time_start = time_axis[0]
     time_end = time_axis[-1]
@@ -230,7 +232,12 @@ notes:
                         help="Remove points that deviate from the rolling median by greater than this threshold [default: None]")
     parser.add_argument("--no_data_checks", action="store_true", default=False,
                         help="Do not do data checks when reading infiles [default: False]")
+    parser.add_argument("--result_cache", action="store_true", default=False,
+                        help="Reuse the output of an identical earlier run (see manage_result_cache.py) [default: False]")
 
     args = parser.parse_args()
-    main(args)
+    if args.result_cache:
+        result_cache.run_cached(main, args, __file__)
+    else:
+        main(args)
 
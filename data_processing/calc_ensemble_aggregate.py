@@ -13,7 +13,6 @@ import iris
 from iris.experimental.equalise_cubes import equalise_attributes
 import cmdline_provenance as cmdprov
 import numpy as np
-import seaborn as sns
 
 # Import my modules
 
@@ -79,24 +78,64 @@ def unify_variable(cube_list):
     return cube_list
 
 
-def ci_bounds(data, bound):
-    """Calculate 95% confidence interval bounds like seaborn does.
+def bootstrap_ci(data, n_boot=10000, ci=95, seed=0, max_elements=5e7):
+    """Calculate bootstrap confidence interval bounds like seaborn does.
 
     https://stackoverflow.com/questions/46125182/is-seaborn-confidence-interval-computed-correctly
 
+    Rather than bootstrapping each grid point separately, one set of resample
+      indexes is drawn (from a seeded random number generator) and shared
+      by all grid points. The resampled means then come from a single matrix
+      multiply of the resample counts with the data (processed in chunks of
+      grid points to limit memory use).
+
+    Args:
+      data (numpy.ndarray): Ensemble member must be the first axis
+      n_boot (int): Number of bootstrap resamples
+      ci (float): Confidence interval (%)
+      seed (int): Seed for the random number generator
+      max_elements (float): Maximum size of each array of resampled means
+
+    Returns:
+      lower, upper (numpy.ma.MaskedArray): Same shape as data.shape[1:].
+        Points where any ensemble member is missing are masked.
+
     """
 
-    boots = sns.algorithms.bootstrap(data)
-    cis = sns.utils.ci(boots, 95)
-    result = cis[0] if bound == 'lower' else cis[1]
+    nmembers = data.shape[0]
+    output_shape = data.shape[1:]
+    mask = np.ma.getmaskarray(data).reshape(nmembers, -1).any(axis=0)
+    flat_data = np.ma.filled(data.astype(float), 0).reshape(nmembers, -1)
+    npoints = flat_data.shape[1]
+
+    rng = np.random.default_rng(seed)
+    resample_indexes = rng.integers(0, nmembers, size=(n_boot, nmembers))
+    offsets = (np.arange(n_boot) * nmembers)[:, np.newaxis]
+    counts = np.bincount((resample_indexes + offsets).ravel(), minlength=n_boot * nmembers)
+    weights = counts.reshape(n_boot, nmembers) / nmembers
+
+    percentiles = [50 - ci / 2, 50 + ci / 2]
+    bounds = np.zeros([2, npoints])
+    step = max(1, int(max_elements // n_boot))
+    for start in range(0, npoints, step):
+        boot_means = weights @ flat_data[:, start:start + step]
+        bounds[:, start:start + step] = np.nanpercentile(boot_means, percentiles, axis=0)
 
-    return result
+    lower = np.ma.masked_array(bounds[0], mask=mask).reshape(output_shape)
+    upper = np.ma.masked_array(bounds[1], mask=mask).reshape(output_shape)
+
+    return lower, upper
 
 
 def calc_ensagg(cube_list, operator='mean'):
-    """Calculate the ensemble mean"""
+    """Calculate the ensemble aggregate.
+
+    The ci operator returns both bounds of the bootstrap confidence
+      interval (lower, upper), so the bootstrap only has to be done once.
+
+    """
 
-    assert operator in ['mean', 'median', 'ci-upper', 'ci-lower']
+    assert operator in ['mean', 'median', 'ci', 'ci-upper', 'ci-lower']
 
     operator_dict = {'mean': iris.analysis.MEAN, 
                      'median': iris.analysis.MEDIAN}
@@ -105,16 +144,20 @@ def calc_ensagg(cube_list, operator='mean'):
     cube_list = unify_variable(cube_list)
     ensemble_cube = cube_list.merge_cube()
     if 'ci' in operator:
-        bound = operator.split('-')[-1]
         coord_names = [coord.name() for coord in ensemble_cube.dim_coords]
         member_axis = coord_names.index('ensemble_member')
         assert member_axis == 0
-        ci_bound = np.apply_along_axis(ci_bounds, 0, ensemble_cube.data, bound)
-        ensemble_agg = ensemble_cube[0, ::]
-        ensemble_agg.data = ci_bound
+        lower, upper = bootstrap_ci(ensemble_cube.data)
+        lower_cube = ensemble_cube[0, ::]
+        lower_cube.remove_coord('ensemble_member')
+        upper_cube = lower_cube.copy(data=upper)
+        lower_cube.data = lower
+        if operator == 'ci':
+            return lower_cube, upper_cube
+        ensemble_agg = lower_cube if operator == 'ci-lower' else upper_cube
     else:
         ensemble_agg = ensemble_cube.collapsed('ensemble_member', operator_dict[operator], mdtol=0)
-    ensemble_agg.remove_coord('ensemble_member')
+        ensemble_agg.remove_coord('ensemble_member')
 
     return ensemble_agg
 
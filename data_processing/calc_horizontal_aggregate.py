@@ -50,45 +50,83 @@ def select_basin(cube, basin_cube, basin_name):
     """Select an ocean basin."""
 
     assert basin_cube.shape == cube.shape[-2:]
-    basin_array = uconv.broadcast_array(basin_cube.data, [cube.ndim - 2, cube.ndim - 1], cube.shape) 
-    assert basin_array.min() == 11
-    assert basin_array.max() == 18
+    basin_indexes = uconv.get_basin_indexes(basin_cube.data)
+    assert min(basin_indexes.keys()) == 11
+    assert max(basin_indexes.keys()) == 18
 
-    basins = {'atlantic': basin_array <= 12,
-              'indo-pacific': (basin_array >= 13) & (basin_array <= 15),
-              'globe': basin_array <= 16}
+    basins = {'atlantic': [11, 12],
+              'indo-pacific': [13, 14, 15],
+              'globe': [11, 12, 13, 14, 15, 16]}
 
     assert basin_name in basins.keys()
 
-    cube.data.mask = numpy.where((cube.data.mask == False) & basins[basin_name], False, True)
+    selection = uconv.basin_selection(basin_cube.data, basins[basin_name])
+    data = numpy.ma.asarray(cube.data)
+    data.mask = numpy.ma.getmaskarray(data) | ~selection
+    cube.data = data
 
     return cube
 
 
-def horiz_aggregate(cube, coord_names, keep_coord, horiz_bounds, agg_method, weights):
-    """Calculate the horizontal aggregate for a given band."""
+def band_aggregate(data, band_matrix, agg_method, weights=None, max_elements=5e7):
+    """Aggregate each horizontal slice of the data over horizontal bands.
+
+    Args:
+      data (numpy.ndarray): Data with the horizontal dimensions last
+      band_matrix (scipy.sparse.csr_matrix): Band assignment for each grid cell
+        (nbands, npoints), as returned by grids.get_horizontal_band_matrix
+      agg_method (iris.analysis.Aggregator): SUM or MEAN
+      weights (numpy.ndarray, optional): Weights for the mean, with the same
+        trailing dimensions as the data (ignored for SUM)
+      max_elements (float): Maximum number of data points processed at once
+
+    Returns:
+      numpy.ma.MaskedArray of shape data.shape[:-2] + (nbands,)
+
+    """
+
+    assert agg_method in [iris.analysis.SUM, iris.analysis.MEAN]
+    nbands, npoints = band_matrix.shape
+    flat_data = numpy.ma.asarray(data).reshape(-1, npoints)
+    nslices = flat_data.shape[0]
+    if weights is not None:
+        weights = numpy.ma.filled(weights, 0).astype(numpy.float64).reshape(-1, npoints)
+
+    totals = numpy.zeros([nslices, nbands])
+    counts = numpy.zeros([nslices, nbands])
+    step = max(1, int(max_elements // npoints))
+    for start in range(0, nslices, step):
+        stop = min(start + step, nslices)
+        valid = ~numpy.ma.getmaskarray(flat_data[start:stop, :])
+        values = numpy.where(valid, numpy.ma.getdata(flat_data[start:stop, :]), 0.0)
+        if (weights is not None) and (agg_method == iris.analysis.MEAN):
+            slice_weights = weights[numpy.arange(start, stop) % weights.shape[0], :]
+            values = values * slice_weights
+            valid = valid * slice_weights
+        totals[start:stop, :] = band_matrix.dot(values.T).T
+        counts[start:stop, :] = band_matrix.dot(valid.T.astype(numpy.float64)).T
+
+    empty = counts == 0
+    if agg_method == iris.analysis.MEAN:
+        counts[empty] = 1.0
+        totals = totals / counts
+    new_data = numpy.ma.masked_array(totals, mask=empty)
+
+    return new_data.reshape(data.shape[:-2] + (nbands,))
 
-    horiz_cube = grids.extract_horizontal_region_curvilinear(cube, keep_coord, horiz_bounds)
-    if weights and (agg_method == 'mean'):
-        extracted_weights_cube = grids.extract_horizontal_region_curvilinear(weights, keep_coord, horiz_bounds)
-        extracted_weights_data = extracted_weights_cube.data
-    else:
-        extracted_weights_data = None
-    horiz_agg = horiz_cube.collapsed(coord_names[-2:], agg_method, weights=extracted_weights_data)
-    horiz_agg.remove_coord('latitude')
-    horiz_agg.remove_coord('longitude')
-    
-    for coord_name in coord_names[-2:]:
-        try:
-            horiz_agg.remove_coord(coord_name)
-        except iris.exceptions.CoordinateNotFoundError:
-            pass
 
-    return horiz_agg
+def curvilinear_agg(cube, ref_cube, keep_coord, agg_method, weights=None):
+    """Horizontal aggregation for curvilinear data.
 
+    Args:
+      cube (iris.cube.Cube)
+      ref_cube (iris.cube.Cube): Reference grid for the output
+      keep_coord (str): latitude or longitude
+      agg_method (iris.analysis.Aggregator): SUM or MEAN
+      weights (numpy.ndarray, optional): Weights for the mean (trailing dimensions of cube).
+        Applied to MEAN only, as for rectilinear data.
 
-def curvilinear_agg(cube, ref_cube, keep_coord, agg_method, weights=None):
-    """Horizontal aggregation for curvilinear data."""
+    """
 
     coord_names = [coord.name() for coord in cube.dim_coords]
     coord_var_names = [coord.var_name for coord in cube.dim_coords]
@@ -116,12 +154,9 @@ def curvilinear_agg(cube, ref_cube, keep_coord, agg_method, weights=None):
     nhoriz = len(new_horiz_bounds)
     target_shape.append(nhoriz)
     
-    new_data = numpy.ma.zeros(target_shape)
-    for horiz_index in range(0, nhoriz):
-        horiz_agg = horiz_aggregate(cube, coord_names, keep_coord,
-                                    new_horiz_bounds[horiz_index],
-                                    agg_method, weights)
-        new_data[..., horiz_index] = horiz_agg.data
+    band_matrix = grids.get_horizontal_band_matrix(cube.coord(keep_coord).points, new_horiz_bounds)
+    new_data = band_aggregate(cube.data, band_matrix, agg_method, weights=weights)
+    assert list(new_data.shape) == target_shape
 
     target_coords.append((ref_cube.coord(keep_coord), target_horiz_index))
     new_cube = iris.cube.Cube(new_data,
@@ -190,12 +225,9 @@ def main(inargs):
 
         if inargs.weights:
             assert cube.ndim - weights_cube.ndim == 1
-            broadcast_weights_cube = cube.copy()
-            broadcast_weights_array = uconv.broadcast_array(weights_cube.data, [1, weights_cube.ndim], cube.shape)
-            broadcast_weights_cube.data = broadcast_weights_array
+            weights_array = weights_cube.data
         else:
-            broadcast_weights_cube = None
-            broadcast_weights_array = None
+            weights_array = None
             
         aux_coord_names = [coord.name() for coord in cube.aux_coords]
         if 'latitude' in aux_coord_names:
@@ -206,9 +238,13 @@ def main(inargs):
                 ref_cube = grids.make_grid(lats, lons)
             horiz_aggregate = curvilinear_agg(cube, ref_cube, keep_coord,
                                               aggregation_functions[inargs.aggregation],
-                                              weights=broadcast_weights_cube)
+                                              weights=weights_array)
         else:
             # rectilinear grid
+            if inargs.weights:
+                broadcast_weights_array = uconv.broadcast_array(weights_array, [1, weights_cube.ndim], cube.shape)
+            else:
+                broadcast_weights_array = None
             horiz_aggregate = cube.collapsed(collapse_coord, aggregation_functions[inargs.aggregation],
                                              weights=broadcast_weights_array)
             horiz_aggregate.remove_coord(collapse_coord)
@@ -261,7 +297,7 @@ if __name__ == '__main__':
     parser.add_argument("--area", type=str, default=None, 
                         help="""Multiply data by area (using this file) [default = None]""")
     parser.add_argument("--weights", type=str, default=None, 
-                        help="""Weights file for aggregation [default = None]""")
+                        help="""Weights file for aggregation (mean only) [default = None]""")
 
     parser.add_argument("--cumsum", action="store_true", default=False,
                         help="Output the cumulative sum [default: False]")
@@ -59,27 +59,42 @@ def add_metadata(temperature_cube, temperature_atts, ohc_cube, inargs):
     return ohc_cube
 
 
-def ohc(temperature_cube, volume_data, density, specific_heat, coord_names, vertical_integral=False, chunk=False):
+def ohc(temperature_cube, volume_data, density, specific_heat, coord_names, vertical_integral=False,
+        max_memory=1e9):
     """Calculate the ocean heat content.
 
-    Chunking is an option to avoid memory errors.
+    The calculation is lazy and streamed one time chunk at a time
+      (when the output is saved), so the full temperature array is
+      never in memory. The volume data are broadcast against each chunk. 
+
+    Args:
+      temperature_cube (iris.cube.Cube): Data with time as the first axis
+      volume_data (numpy.ndarray): Cell volume with the same trailing dimensions
+        as the temperature data (or a time dimension of length one)
+      density (float)
+      specific_heat (float)
+      coord_names (list)
+      vertical_integral (bool): Sum over the depth axis
+      max_memory (float): Memory ceiling (bytes) for the data in each time chunk
 
     """
 
-    temperature_cube.data = temperature_cube.data * volume_data
+    assert coord_names[0] == 'time'
+    temperature_data = gio.time_chunked_data(temperature_cube, max_memory=max_memory)
 
+    ohc_data = temperature_data * volume_data
+    template_cube = temperature_cube.copy(data=temperature_cube.lazy_data())
     if vertical_integral:
-        if chunk:
-            tv = uconv.chunked_collapse_by_time(temperature_cube, 'depth', iris.analysis.SUM)
-        else:
-            tv = temperature_cube.collapsed('depth', iris.analysis.SUM)
-        tv.remove_coord('depth')
-    else:
-        tv = temperature_cube
+        depth_axis = temperature_cube.coord_dims('depth')[0]
+        ohc_data = ohc_data.sum(axis=depth_axis)
+        template_cube = template_cube[:, 0, ...]
+        template_cube.remove_coord('depth')
+        template_cube.add_cell_method(iris.coords.CellMethod('sum', coords='depth'))
+    ohc_data = ohc_data * (density * specific_heat)
 
-    ohc = (tv * density * specific_heat) 
-    
-    return ohc
+    ohc_cube = template_cube.copy(data=ohc_data)
+
+    return ohc_cube
 
 
 def read_area_file(area_file):
@@ -130,16 +145,17 @@ def main(inargs):
     if inargs.regrid:
         area_cube = read_area_file(inargs.regrid)
         temperature_cube, coord_names, regrid_status = grids.curvilinear_to_rectilinear(temperature_cube, weights=area_cube.data)
-        volume_data = spatial_weights.volume_array(temperature_cube)
+        volume_data = spatial_weights.volume_array(temperature_cube[0:1, ...])
         grid = 'y72x144'
     else:
         assert inargs.volume_file, "Must provide volume file if not regridding data"
-        volume_data, metadata_dict = get_volume(inargs.volume_file, temperature_cube, level_subset, metadata_dict)
+        volume_data, metadata_dict = get_volume(inargs.volume_file, temperature_cube[0, ...], level_subset, metadata_dict)
         coord_names = [coord.name() for coord in temperature_cube.dim_coords]
         grid = None
 
+    max_memory = inargs.max_memory * 1e9
     ohc_cube = ohc(temperature_cube, volume_data, inargs.density, inargs.specific_heat,
-                   coord_names, vertical_integral=inargs.vertical_integral, chunk=inargs.chunk)
+                   coord_names, vertical_integral=inargs.vertical_integral, max_memory=max_memory)
 
     ohc_cube = add_metadata(temperature_cube, temperature_atts, ohc_cube, inargs)
     log = cmdprov.new_log(infile_history=metadata_dict, git_repo=repo_dir) 
@@ -192,7 +208,9 @@ notes:
                         help="Specific heat of seawater (in J / kg.K). Default of 4000 J/kg.K from Hobbs2016")
 
     parser.add_argument("--chunk", action="store_true", default=False,
-                        help="Split input files on time axis to avoid memory errors [default: False]")
+                        help="Split input files on time axis for the annual conversion to avoid memory errors [default: False]")
+    parser.add_argument("--max_memory", type=float, default=1.0,
+                        help="Memory ceiling (GB) for each time chunk of temperature data [default: 1.0]")
 
     args = parser.parse_args()             
     main(args)
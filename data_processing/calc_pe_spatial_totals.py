@@ -22,6 +22,7 @@ sys.path.append(modules_dir)
 
 try:
     import general_io as gio
+    import result_cache
     import spatial_weights
     import timeseries
     import convenient_universal as uconv
@@ -67,8 +68,8 @@ def create_pe_region_coord():
     return pe_region_coord
 
 
-def get_regional_aggregates(agg_method, var_data, pe_data, lats, basins, area_data):
-    """Calculate the regional aggregates
+def get_basin_index(basins):
+    """Get the index (in basin_names) of the basin at each grid point.
 
     Basin definitions:
       north atlantic = 11
@@ -79,59 +80,159 @@ def get_regional_aggregates(agg_method, var_data, pe_data, lats, basins, area_da
       arctic = 16
       marginal seas = 17
       land = 18
-      
+
+    Points that aren't in any basin are given an index of -1.
+
     """
 
-    assert agg_method in ['sum', 'mean']
+    basins = np.ma.getdata(basins)
+    basin_selection = [(basins >=11) & (basins <= 12),
+                       (basins >= 13) & (basins <= 14),
+                       basins == 15,
+                       basins == 16,
+                       basins == 17,
+                       basins == 18]
 
-    basin_selection = {'atlantic': (basins >=11) & (basins <= 12),
-                       'pacific': (basins >= 13) & (basins <= 14),
-                       'indian': basins == 15,
-                       'arctic': basins == 16,
-                       'marginal seas': basins == 17,
-                       'land': basins == 18}
-
-    pe_selection = {'SH precip': (pe_data >= 0) & (lats < -20),
-                    'SH evap': (pe_data < 0) & (lats < 0),
-                    'tropical precip': (pe_data >= 0) & (lats <= 20) & (lats >= -20),
-                    'NH evap': (pe_data < 0) & (lats >= 0),
-                    'NH precip': (pe_data >= 0) & (lats > 20)}
-
-    output = np.ma.zeros([6, 8])
-    area_totals = np.ma.zeros([6, 8])
-    for pe_num, pe_name in enumerate(pe_names):
-        for basin_num, basin_name in enumerate(basin_names):
-            selection = pe_selection[pe_name] & basin_selection[basin_name]
-            if agg_method == 'sum':
-                output[pe_num, basin_num] = var_data[selection].sum()
-            elif var_data[selection].size:
-                area_totals[pe_num, basin_num] = area_data[selection].sum()
-                output[pe_num, basin_num] = np.ma.average(var_data[selection],
-                                                          weights=area_data[selection])
-  
-    if agg_method == 'sum':
-        assert np.allclose(var_data.sum(), output.sum())
-    else:
-        assert np.allclose(area_data.sum(), area_totals.sum())
+    return np.select(basin_selection, range(len(basin_names)), default=-1)
 
-    for pe_num in range(5):
-        if agg_method == 'sum':
-            output[pe_num, 6] = output[pe_num, 0:5].sum()  # ocean
-            output[pe_num, 7] = output[pe_num, 0:6].sum()  # globe
-        else:
-            area_totals[pe_num, 6] = area_totals[pe_num, 0:5].sum()  # ocean
-            area_totals[pe_num, 7] = area_totals[pe_num, 0:6].sum()  # globe
-            output[pe_num, 6] = np.ma.average(output[pe_num, 0:5], weights=area_totals[pe_num, 0:5])
-            output[pe_num, 7] = np.ma.average(output[pe_num, 0:6], weights=area_totals[pe_num, 0:6])
 
-    for basin_num in range(8):
+def get_pe_index(pe_data, lats):
+    """Get the index (in pe_names) of the P-E region at each grid point.
+
+    Points that aren't in any P-E region are given an index of -1.
+
+    """
+
+    precip = pe_data >= 0
+    evap = pe_data < 0
+    pe_selection = [precip & (lats < -20),
+                    evap & (lats < 0),
+                    precip & (lats <= 20) & (lats >= -20),
+                    evap & (lats >= 0),
+                    precip & (lats > 20)]
+
+    return np.select(pe_selection, range(len(pe_names)), default=-1)
+
+
+def _weighted_mean(values, weights, mask, axis):
+    """Weighted mean ignoring masked values.
+
+    Returns the mean and the new mask (where there are no unmasked weights).
+
+    """
+
+    weights = np.where(mask, 0, weights)
+    numerator = (np.where(mask, 0, values) * weights).sum(axis=axis)
+    denominator = weights.sum(axis=axis)
+    new_mask = denominator == 0
+    mean = numerator / np.where(new_mask, 1, denominator)
+
+    return mean, new_mask
+
+
+def _realise(data):
+    """Realise a (numpy or dask) data block as a masked array."""
+
+    if hasattr(data, 'compute'):
+        data = data.compute()
+
+    return np.ma.asarray(data)
+
+
+def get_regional_aggregates(agg_method, var_data, pe_data, lats, basins, area_data, max_elements=5e7):
+    """Calculate the regional aggregates for all time steps.
+
+    Each grid point is given a single (time, P-E region, basin) code,
+      so the sum or area weighted mean for every region and time step
+      comes from a grouped reduction (numpy.bincount). The data are
+      processed (and lazy data realised) a block of time steps at a time.
+
+    Args:
+      agg_method (str): sum or mean
+      var_data (numpy.ndarray or dask.array.Array): Data to aggregate (time, y, x) or (y, x)
+      pe_data (numpy.ndarray or dask.array.Array): P-E data (time, y, x)
+      lats (numpy.ndarray): Latitude values (y, x)
+      basins (numpy.ndarray): Basin values (y, x)
+      area_data (numpy.ndarray): Cell areas (y, x)
+      max_elements (float): Maximum number of data points processed at once
+
+    Returns:
+      numpy.ndarray of shape (time, 6, 8)
+
+    """
+
+    assert agg_method in ['sum', 'mean']
+
+    ntimes = pe_data.shape[0]
+    npoints = basins.size
+    npe = len(pe_names)
+    nbasins = len(basin_names)
+    ncodes = npe * nbasins
+
+    basin_index = get_basin_index(basins).reshape(1, npoints)
+    lats = np.ma.getdata(lats).reshape(1, npoints)
+    area_data = np.ma.filled(area_data, 0).astype(np.float64).reshape(1, npoints)
+
+    sums = np.zeros([ntimes, ncodes])
+    valid_areas = np.zeros([ntimes, ncodes])
+    area_totals = np.zeros([ntimes, ncodes])
+    step = max(1, int(max_elements // npoints))
+    for start in range(0, ntimes, step):
+        stop = min(start + step, ntimes)
+        nsteps = stop - start
+
+        pe_block = np.ma.getdata(_realise(pe_data[start:stop, ...])).reshape(nsteps, npoints)
+        pe_index = get_pe_index(pe_block, lats)
+        assigned = (pe_index >= 0) & (basin_index >= 0)
+        time_offset = np.arange(nsteps)[:, np.newaxis] * ncodes
+        codes = np.where(assigned, time_offset + pe_index * nbasins + basin_index, nsteps * ncodes).ravel()
+
+        var_block = var_data[start:stop, ...] if var_data.ndim == 3 else var_data[np.newaxis, ...]
+        var_block = _realise(var_block).reshape(-1, npoints)
+        valid = ~np.ma.getmaskarray(var_block)
+        values = np.where(valid, np.ma.getdata(var_block), 0.0)
+        values = np.broadcast_to(values, (nsteps, npoints))
+
+        minlength = nsteps * ncodes + 1
         if agg_method == 'sum':
-            output[5, basin_num] = output[0:5, basin_num].sum()  # globe
+            block_sums = np.bincount(codes, weights=values.ravel(), minlength=minlength)
+            assert np.allclose(block_sums[:-1].reshape(nsteps, ncodes).sum(axis=1), values.sum(axis=1))
         else:
-            area_totals[5, basin_num] = area_totals[0:5, basin_num].sum()  # globe
-            output[5, basin_num] = np.ma.average(output[0:5, basin_num], weights=area_totals[0:5, basin_num])
+            valid_weights = np.broadcast_to(valid * area_data, (nsteps, npoints)).ravel()
+            block_sums = np.bincount(codes, weights=values.ravel() * valid_weights, minlength=minlength)
+            block_valid_areas = np.bincount(codes, weights=valid_weights, minlength=minlength)
+            block_areas = np.bincount(codes, weights=np.broadcast_to(area_data, (nsteps, npoints)).ravel(),
+                                      minlength=minlength)
+            valid_areas[start:stop, :] = block_valid_areas[:-1].reshape(nsteps, ncodes)
+            area_totals[start:stop, :] = block_areas[:-1].reshape(nsteps, ncodes)
+            assert np.allclose(area_totals[start:stop, :].sum(axis=1), area_data.sum())
+        sums[start:stop, :] = block_sums[:-1].reshape(nsteps, ncodes)
+
+    sums = sums.reshape(ntimes, npe, nbasins)
+    output = np.zeros([ntimes, 6, 8])
+    if agg_method == 'sum':
+        output[:, 0:5, 0:6] = sums
+        output[:, 0:5, 6] = output[:, 0:5, 0:5].sum(axis=-1)  # ocean
+        output[:, 0:5, 7] = output[:, 0:5, 0:6].sum(axis=-1)  # globe
+        output[:, 5, :] = output[:, 0:5, :].sum(axis=1)  # globe
+    else:
+        valid_areas = valid_areas.reshape(ntimes, npe, nbasins)
+        mask = np.zeros([ntimes, 6, 8], dtype=bool)
+        totals = np.zeros([ntimes, 6, 8])
+        totals[:, 0:5, 0:6] = area_totals.reshape(ntimes, npe, nbasins)
+        mask[:, 0:5, 0:6] = (valid_areas == 0)
+        output[:, 0:5, 0:6] = sums / np.where(valid_areas == 0, 1, valid_areas)
 
-    return output 
+        for basin_num, nregions in [(6, 5), (7, 6)]:  # ocean, globe
+            totals[:, 0:5, basin_num] = totals[:, 0:5, 0:nregions].sum(axis=-1)
+            output[:, 0:5, basin_num], mask[:, 0:5, basin_num] = _weighted_mean(output[:, 0:5, 0:nregions],
+                                                                                 totals[:, 0:5, 0:nregions],
+                                                                                 mask[:, 0:5, 0:nregions], -1)
+        output[:, 5, :], mask[:, 5, :] = _weighted_mean(output[:, 0:5, :], totals[:, 0:5, :],
+                                                        mask[:, 0:5, :], 1)
+        output[mask] = 0
+
+    return output
 
 
 def read_data(infiles, var, area_cube, annual=False, multiply_by_area=False, chunk_annual=False):
@@ -194,13 +295,8 @@ def main(inargs):
             assert data_cube.ndim == 2
             area_data = spatial_weights.area_array(data_cube)
 
-    region_data = np.zeros([pe_cube.shape[0], 6, 8])
-    tstep = 0
-    ntimes = pe_cube.shape[0]
-    for tstep in range(ntimes):
-        var_data = data_cube.data if inargs.data_var == 'cell_area' else data_cube[tstep, ::].data
-        region_data[tstep, :] = get_regional_aggregates(inargs.agg, var_data, pe_cube[tstep, ::].data,
-                                                        pe_lats, basin_cube.data, area_data)
+    region_data = get_regional_aggregates(inargs.agg, data_cube.core_data(), pe_cube.core_data(),
+                                          pe_lats, basin_cube.data, area_data)
         
     if inargs.cumsum:
         region_data = np.cumsum(region_data, axis=0)    
@@ -255,8 +351,13 @@ if __name__ == '__main__':
                         help="Output the cumulative sum [default: False]")
     parser.add_argument("--chunk", action="store_true", default=False,
                         help="Perform annual smoothing by year to avoid memory errors [default: False]")
+    parser.add_argument("--result_cache", action="store_true", default=False,
+                        help="Reuse the output of an identical earlier run (see manage_result_cache.py) [default: False]")
 
     args = parser.parse_args()            
     if args.data_var:
         assert args.data_files, "Need to provide --data_files"
-    main(args)
+    if args.result_cache:
+        result_cache.run_cached(main, args, __file__)
+    else:
+        main(args)
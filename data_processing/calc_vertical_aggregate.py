@@ -4,6 +4,7 @@ import sys
 script_dir = sys.path[0]
 import pdb
 import argparse
+import numpy
 
 import iris
 import cmdline_provenance as cmdprov
@@ -37,6 +38,7 @@ def main(inargs):
             vert_extents = spatial_weights.calc_vertical_weights_1D(depth_coord, dim_coord_names, cube.shape)
         elif depth_coord.units == 'dbar':
             vert_extents = spatial_weights.calc_vertical_weights_2D(depth_coord, cube.coord('latitude'), dim_coord_names, cube.shape)
+            vert_extents = numpy.broadcast_to(vert_extents, cube.shape)
         cube = cube.collapsed('depth', iris.analysis.MEAN, weights=vert_extents)
     cube.remove_coord('depth')
     
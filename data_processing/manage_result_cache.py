@@ -0,0 +1,65 @@
+"""Inspect and prune the cache of data processing results (see modules/result_cache.py)"""
+
+import sys
+script_dir = sys.path[0]
+import os
+import pdb
+import argparse
+import datetime
+
+repo_dir = '/'.join(script_dir.split('/')[:-1])
+module_dir = repo_dir + '/modules'
+sys.path.append(module_dir)
+try:
+    import general_io as gio
+    import result_cache
+except ImportError:
+    raise ImportError('Script and modules in wrong directories')
+
+
+def describe_entry(entry):
+    """One line description of a cache entry."""
+
+    last_used = datetime.datetime.fromtimestamp(entry['last_used']).strftime('%Y-%m-%d %H:%M')
+    source = entry.get('script', entry.get('function', 'unknown'))
+    outfile = entry.get('outfile', '')
+
+    return '%s  %8.1f MB  %s  %s %s' %(entry['key'], entry['size'] / 1e6, last_used, source, outfile)
+
+
+def main(inargs):
+    """Run the program."""
+
+    cache_dir = gio.get_cache_dir('results')
+
+    for key in inargs.remove:
+        result_cache.remove_entry(key, cache_dir=cache_dir)
+    if inargs.clear:
+        result_cache.prune_cache(cache_dir, max_bytes=0)
+    elif inargs.max_size is not None:
+        result_cache.prune_cache(cache_dir, max_bytes=inargs.max_size * 1e9)
+
+    entries = result_cache.list_entries(cache_dir)
+    if inargs.list:
+        for entry in entries:
+            print(describe_entry(entry))
+    cache_bytes = sum([entry['size'] for entry in entries])
+    print('%s: %i entries, %.1f MB' %(cache_dir, len(entries), cache_bytes / 1e6))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     argument_default=argparse.SUPPRESS,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument("--list", action="store_true", default=False,
+                        help="List the cache entries (most recently used first) [default=False]")
+    parser.add_argument("--max_size", type=float, default=None,
+                        help="Delete the least recently used entries until the cache is smaller than this (GB) [default=None]")
+    parser.add_argument("--remove", type=str, nargs='*', default=[],
+                        help="Keys of cache entries to delete")
+    parser.add_argument("--clear", action="store_true", default=False,
+                        help="Delete all cache entries [default=False]")
+
+    args = parser.parse_args()
+    main(args)
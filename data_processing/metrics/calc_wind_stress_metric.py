@@ -11,7 +11,7 @@ import sys, os, pdb
 import argparse
 import itertools
 import numpy
-from scipy.interpolate import interp1d
+from scipy.interpolate import CubicSpline, PPoly
 import iris
 import iris.coord_categorisation
 from iris.experimental.equalise_cubes import equalise_attributes
@@ -65,7 +65,12 @@ def create_land_mask(sftlf_cube, target_shape):
 
 
 def wind_stress_metrics(xdata, ydata, hemisphere, direction):
-    """Calculate location and magnitude metric for surface wind stress."""
+    """Calculate location and magnitude metric for surface wind stress.
+
+    ydata can be a single profile or an array of profiles (e.g. one for
+      each time step) with latitude as the last axis.
+
+    """
 
     assert hemisphere in ['nh', 'sh']
     assert direction in ['westerly', 'easterly']
@@ -84,12 +89,155 @@ def wind_stress_metrics(xdata, ydata, hemisphere, direction):
     x_filtered = numpy.where(selection, xdata, 0)
     y_filtered = numpy.where(selection, ydata, 0)
 
-    location = numpy.sum(x_filtered * y_filtered) / numpy.sum(y_filtered)  # centre of gravity
-    magnitude = numpy.sum(y_filtered)
+    location = numpy.sum(x_filtered * y_filtered, axis=-1) / numpy.sum(y_filtered, axis=-1)  # centre of gravity
+    magnitude = numpy.sum(y_filtered, axis=-1)
     
     return location, magnitude
 
 
+def spline_matrix(xdata, xnew):
+    """Matrix that applies cubic spline interpolation to a set of profiles.
+
+    The interpolated values are a linear function of the profile values,
+      so (for a fixed xdata) the spline can be factorised once and
+      applied to every profile with a matrix multiply:
+      ynew = ydata @ matrix.T
+
+    Returns:
+      numpy.ndarray: Shape (len(xnew), len(xdata))
+
+    """
+
+    return CubicSpline(xdata, numpy.eye(len(xdata)))(xnew)
+
+
+def _eval_pieces(coefficients, breaks, xpoints):
+    """Evaluate a set of piecewise polynomials at different points for each polynomial.
+
+    Args:
+      coefficients (numpy.ndarray): Local power basis coefficients (order, npieces, nprofiles)
+      breaks (numpy.ndarray): Breakpoints (npieces + 1)
+      xpoints (numpy.ndarray): Evaluation points (nprofiles, npoints). Missing points are NaN.
+
+    """
+
+    npieces = coefficients.shape[1]
+    piece = numpy.clip(numpy.searchsorted(breaks, xpoints, side='right') - 1, 0, npieces - 1)
+    profile = numpy.arange(xpoints.shape[0])[:, numpy.newaxis]
+    local_x = xpoints - breaks[piece]
+
+    result = numpy.zeros(xpoints.shape)
+    for order_coefficients in coefficients:
+        result = result * local_x + order_coefficients[piece, profile]
+
+    return result
+
+
+def exact_wind_stress_metrics(spline, hemisphere, direction, spacing):
+    """Calculate location and magnitude metric for surface wind stress from the spline itself.
+
+    Rather than resampling the spline on a dense grid, the sign changes
+      of each profile are found from the roots of the spline and the
+      profile (and latitude times profile) are integrated exactly between them.
+
+    Args:
+      spline (scipy.interpolate.CubicSpline): Spline fitted along axis 1 of a (time, lat) array
+      hemisphere (str): nh or sh
+      direction (str): westerly or easterly
+      spacing (float): The magnitude is divided by this latitude spacing so it 
+        matches the sum over a regular grid returned by wind_stress_metrics
+
+    """
+
+    assert hemisphere in ['nh', 'sh']
+    assert direction in ['westerly', 'easterly']
+
+    breaks = spline.x
+    lat_bounds_dict = {('sh', 'westerly'): [breaks[0], 0],
+                       ('nh', 'westerly'): [0, breaks[-1]],
+                       ('sh', 'easterly'): [-50, 0],
+                       ('nh', 'easterly'): [0, 40]}
+    lower_lat, upper_lat = numpy.clip(lat_bounds_dict[(hemisphere, direction)], breaks[0], breaks[-1])
+    sign = 1 if direction == 'westerly' else -1
+
+    # latitude * profile, in the local power basis of each piece
+    coefficients = spline.c
+    left_lats = breaks[:-1][:, numpy.newaxis]
+    lat_coefficients = numpy.zeros((coefficients.shape[0] + 1,) + coefficients.shape[1:])
+    lat_coefficients[:-1] += coefficients
+    lat_coefficients[1:] += left_lats * coefficients
+
+    integral = spline.antiderivative()
+    lat_integral = PPoly(lat_coefficients, breaks).antiderivative()
+
+    roots = spline.roots(extrapolate=False).reshape(-1)
+    max_roots = max([len(profile_roots) for profile_roots in roots] + [0])
+    xpoints = numpy.full([len(roots), max_roots + 2], numpy.nan)
+    xpoints[:, 0] = lower_lat
+    xpoints[:, 1] = upper_lat
+    for index, profile_roots in enumerate(roots):
+        inside = profile_roots[(profile_roots > lower_lat) & (profile_roots < upper_lat)]
+        xpoints[index, 2:2 + len(inside)] = inside
+    xpoints.sort(axis=1)
+
+    midpoints = (xpoints[:, :-1] + xpoints[:, 1:]) / 2
+    selection = sign * _eval_pieces(coefficients, breaks, midpoints) > 0
+    y_integrals = numpy.diff(_eval_pieces(integral.c, breaks, xpoints), axis=1)
+    xy_integrals = numpy.diff(_eval_pieces(lat_integral.c, breaks, xpoints), axis=1)
+
+    y_total = numpy.where(selection, y_integrals, 0).sum(axis=1)
+    xy_total = numpy.where(selection, xy_integrals, 0).sum(axis=1)
+
+    location = xy_total / y_total
+    magnitude = y_total / spacing
+
+    return location, magnitude
+
+
+def calc_metrics(xdata, ydata, method='resample', npoints=1000):
+    """Calculate the location and magnitude metrics for every time step.
+
+    Args:
+      xdata (numpy.ndarray): Latitude points
+      ydata (numpy.ndarray): Zonal mean wind stress (time, latitude)
+      method (str): Dense resampling of a cubic spline ('resample')
+        or exact integration of the spline ('exact')
+      npoints (int): Number of points on the (regular) resampled grid
+
+    Returns:
+      dict: Keys are (hemisphere, direction, metric), values have length ntime
+
+    """
+
+    assert method in ['resample', 'exact']
+
+    ydata = numpy.ma.getdata(ydata)
+    if xdata[0] > xdata[-1]:
+        xdata = xdata[::-1]
+        ydata = ydata[:, ::-1]
+    xnew = numpy.linspace(xdata[0], xdata[-1], num=npoints, endpoint=True)
+
+    if method == 'resample':
+        ynew = ydata @ spline_matrix(xdata, xnew).T
+    else:
+        spline = CubicSpline(xdata, ydata, axis=1)
+        spacing = xnew[1] - xnew[0]
+
+    hemispheres = ['sh', 'nh']
+    directions = ['easterly', 'westerly']
+
+    metric_dict = {}
+    for hemisphere, direction in itertools.product(hemispheres, directions):
+        if method == 'resample':
+            loc, mag = wind_stress_metrics(xnew, ynew, hemisphere, direction)
+        else:
+            loc, mag = exact_wind_stress_metrics(spline, hemisphere, direction, spacing)
+        metric_dict[(hemisphere, direction, 'location')] = loc
+        metric_dict[(hemisphere, direction, 'magnitude')] = mag
+
+    return metric_dict
+
+
 def create_outcubes(metric_dict, atts, units_dict, time_coord):
     """Create an iris cube for each metric."""
    
@@ -138,23 +286,7 @@ def main(inargs):
 
     # Calculate metrics
     xdata = cube.coord('latitude').points
-    xnew = numpy.linspace(xdata[0], xdata[-1], num=1000, endpoint=True)
-
-    hemispheres = ['sh', 'nh']
-    directions = ['easterly', 'westerly']
-    
-    metric_dict = {}
-    for hemisphere, direction in itertools.product(hemispheres, directions):
-        metric_dict[(hemisphere, direction, 'location')] = []
-        metric_dict[(hemisphere, direction, 'magnitude')] = []
-
-    for ycube in cube.slices(['latitude']):
-        func = interp1d(xdata, ycube.data, kind='cubic')
-        ynew = func(xnew)
-        for hemisphere, direction in itertools.product(hemispheres, directions):
-            loc, mag = wind_stress_metrics(xnew, ynew, hemisphere, direction)
-            metric_dict[(hemisphere, direction, 'location')].append(loc)
-            metric_dict[(hemisphere, direction, 'magnitude')].append(mag)
+    metric_dict = calc_metrics(xdata, cube.data, method=inargs.method)
             
     # Write the output file
     atts = cube.attributes
@@ -183,6 +315,9 @@ author:
     parser.add_argument("infiles", type=str, nargs='*', help="Wind stress (tauu) data files (can merge on time)")
     parser.add_argument("sftlf_file", type=str, help="Land area fraction file for ")
     parser.add_argument("outfile", type=str, help="Output file name")
+
+    parser.add_argument("--method", type=str, choices=('resample', 'exact'), default='resample',
+                        help="Resample the cubic spline onto a dense grid or integrate it exactly between its roots [default=resample]")
     
     args = parser.parse_args()            
 
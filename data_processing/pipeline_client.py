@@ -0,0 +1,161 @@
+"""Run a script through the persistent pipeline worker (see pipeline_worker.py).
+
+The script runs in a fork of the worker (with the Python modules already
+imported and the static grid files already loaded) and its output goes
+straight to this terminal. If no worker is running, the script is simply
+run with this Python interpreter instead.
+
+Example:
+  $ python pipeline_client.py calc_cumsum.py infile.nc var outfile.nc
+
+"""
+
+import sys
+import os
+import argparse
+import json
+import signal
+import socket
+import struct
+import subprocess
+import time
+
+
+def get_socket_path():
+    """Get the worker socket path.
+
+    Set with the OCEAN_ANALYSIS_WORKER_SOCKET environment variable
+      (default is worker-<hostname>.sock in the worker cache directory,
+      so workers on different hosts sharing a home directory don't clash).
+
+    """
+
+    default_dir = os.path.join(os.path.expanduser('~'), '.cache', 'ocean-analysis')
+    cache_dir = os.path.join(os.environ.get('OCEAN_ANALYSIS_CACHE', default_dir), 'worker')
+    default_path = os.path.join(cache_dir, 'worker-%s.sock' %(socket.gethostname()))
+
+    return os.environ.get('OCEAN_ANALYSIS_WORKER_SOCKET', default_path)
+
+
+def send_message(sock, message):
+    """Send a (newline terminated) json message."""
+
+    sock.sendall((json.dumps(message) + '\n').encode())
+
+
+def _is_alive(pid):
+    """Check whether a process is still running."""
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
+
+
+def send_request(request, fds=[], timeout=None, poll_interval=10):
+    """Send a request (and optionally file descriptors) to the worker.
+
+    The request is a length prefixed json message, with the file
+      descriptors attached to the length prefix. The worker replies
+      with newline terminated json messages (for a script run, the pid
+      of the process running the script and then its exit code).
+
+    While waiting, the client checks every poll_interval seconds that
+      the process running the script is still alive. If the script
+      hasn't finished after timeout seconds, it is terminated.
+
+    Returns:
+      dict: The worker messages combined (no exit_code if the script
+        didn't finish, plus timed_out=True if it was terminated)
+
+    """
+
+    payload = json.dumps(request).encode()
+    response = {}
+    buffer = b''
+    start_time = time.time()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(get_socket_path())
+        socket.send_fds(sock, [struct.pack('!Q', len(payload))], fds)
+        sock.sendall(payload)
+        sock.shutdown(socket.SHUT_WR)
+        sock.settimeout(min(poll_interval, timeout) if timeout else poll_interval)
+        while True:
+            try:
+                chunk = sock.recv(65536)
+            except socket.timeout:
+                chunk = None
+            if chunk:
+                buffer = buffer + chunk
+                while b'\n' in buffer:
+                    line, buffer = buffer.split(b'\n', 1)
+                    response.update(json.loads(line))
+                continue
+            if chunk == b'' or 'exit_code' in response:
+                break
+            if 'pid' in response and not _is_alive(response['pid']):
+                break
+            if timeout and (time.time() - start_time > timeout):
+                if 'pid' in response:
+                    os.kill(response['pid'], signal.SIGTERM)
+                response['timed_out'] = True
+                break
+
+    return response
+
+
+def run_script(script, script_args, timeout=None):
+    """Run a script through the worker (or directly if no worker is running).
+
+    Returns:
+      int: Exit code
+
+    """
+
+    request = {'command': 'run',
+               'script': os.path.abspath(script),
+               'argv': script_args,
+               'cwd': os.getcwd(),
+               'env': dict(os.environ)}
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        response = send_request(request, fds=[0, 1, 2], timeout=timeout)
+    except (FileNotFoundError, ConnectionRefusedError):
+        try:
+            return subprocess.call([sys.executable, script] + script_args, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            print('%s did not finish within %i seconds' %(script, timeout), file=sys.stderr)
+            return 124
+
+    if response.get('timed_out'):
+        print('%s did not finish within %i seconds' %(script, timeout), file=sys.stderr)
+        return 124
+    elif 'exit_code' not in response:
+        print('pipeline worker stopped without finishing %s' %(script), file=sys.stderr)
+        return 1
+
+    return response['exit_code']
+
+
+def main(inargs):
+    """Run the program."""
+
+    sys.exit(run_script(inargs.script, inargs.script_args, timeout=inargs.timeout))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument("--timeout", type=float, default=os.environ.get('OCEAN_ANALYSIS_WORKER_TIMEOUT'),
+                        help="Terminate the script if it hasn't finished after this many seconds (default is the OCEAN_ANALYSIS_WORKER_TIMEOUT environment variable or no timeout)")
+    parser.add_argument("script", type=str, help="Script to run")
+    parser.add_argument("script_args", nargs=argparse.REMAINDER, help="Script arguments")
+
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,387 @@
+"""Persistent worker that runs scripts with the Python runtime kept warm.
+
+The worker imports iris and the other commonly used modules once and keeps
+a least recently used cache of static grid files (basin, areacello,
+volcello, sftlf and other fx files). Each script run (requested with
+pipeline_client.py) happens in a fork of the worker, so it starts with the
+modules imported and the grid files loaded, but otherwise runs exactly as
+it would from the command line (its own arguments, working directory,
+environment and output streams).
+
+Repo modules that have changed since they were imported are re-imported
+for the next run, but changes to the installed packages need a restart.
+
+The workflow Makefiles run their scripts with ${RUN_SCRIPT} (i.e.
+pipeline_client.py), which falls back to a normal run if no worker is running.
+
+Example:
+  $ python pipeline_worker.py start &
+  $ make -f water_mass_analysis.mk ...
+  $ python pipeline_worker.py stop
+
+"""
+
+import sys
+script_dir = sys.path[0]
+import os
+import pdb
+import argparse
+import collections
+import glob
+import importlib
+import json
+import runpy
+import socket
+import struct
+import threading
+import traceback
+
+repo_dir = '/'.join(script_dir.split('/')[:-1])
+module_dir = repo_dir + '/modules'
+sys.path.append(module_dir)
+try:
+    import pipeline_client
+except ImportError:
+    raise ImportError('Script and modules in wrong directories')
+
+
+preload_modules = ['numpy', 'scipy.interpolate', 'pandas', 'xarray', 'dask.array',
+                   'iris', 'iris.coord_categorisation', 'iris.util', 'cf_units', 'cftime',
+                   'cartopy.crs', 'matplotlib.pyplot', 'seaborn', 'statsmodels.api', 'gsw',
+                   'git', 'cmdline_provenance',
+                   'general_io', 'convenient_universal', 'timeseries', 'spatial_weights',
+                   'grids', 'water_mass', 'result_cache']
+static_file_patterns = ['_fx_', 'basin', 'areacello', 'volcello', 'sftlf', 'areacella', 'deptho']
+max_static_bytes = 4e9
+
+_static_cache = collections.OrderedDict()
+_module_mtimes = {}
+_original_load = None
+_original_load_cube = None
+
+
+def preload():
+    """Import the commonly used modules."""
+
+    for module_name in preload_modules:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            print('pipeline worker: could not import', module_name)
+    for module_file in glob.glob(os.path.join(module_dir, '*.py')):
+        _module_mtimes[module_file] = os.path.getmtime(module_file)
+
+
+def refresh_changed_modules():
+    """Remove repo modules that have changed from sys.modules (so the next run re-imports them)."""
+
+    changed = False
+    for module_file in glob.glob(os.path.join(module_dir, '*.py')):
+        mtime = os.path.getmtime(module_file)
+        if _module_mtimes.get(module_file) != mtime:
+            _module_mtimes[module_file] = mtime
+            changed = True
+    if changed:
+        for module_name, module in list(sys.modules.items()):
+            module_file = getattr(module, '__file__', None) or ''
+            if os.path.dirname(os.path.abspath(module_file)) == os.path.abspath(module_dir):
+                del sys.modules[module_name]
+
+
+def is_static_file(path):
+    """Check whether a file is a static grid file (e.g. basin, areacello, volcello)."""
+
+    name = os.path.basename(path)
+    return name.endswith('.nc') and any([pattern in name for pattern in static_file_patterns])
+
+
+def _static_key(path):
+    """Cache key for a static file."""
+
+    path = os.path.realpath(path)
+    return (path, os.path.getmtime(path))
+
+
+def load_static_file(path):
+    """Load a static grid file into the cache (data realised)."""
+
+    key = _static_key(path)
+    if key in _static_cache:
+        _static_cache.move_to_end(key)
+        return
+
+    cubes = _original_load(path)
+    nbytes = 0
+    for cube in cubes:
+        nbytes = nbytes + cube.data.nbytes
+    _static_cache[key] = (cubes, nbytes)
+
+    total_bytes = sum([entry[1] for entry in _static_cache.values()])
+    while len(_static_cache) > 1 and total_bytes > max_static_bytes:
+        oldest_key, (oldest_cubes, oldest_bytes) = _static_cache.popitem(last=False)
+        total_bytes = total_bytes - oldest_bytes
+
+
+def _cached_cubes(uris, callback):
+    """Copies of the cached cubes for a file (or None if it isn't cached)."""
+
+    import iris
+
+    if callback is not None or not isinstance(uris, str) or not os.path.isfile(uris):
+        return None
+    key = _static_key(uris)
+    if key not in _static_cache:
+        return None
+
+    return iris.cube.CubeList([cube.copy() for cube in _static_cache[key][0]])
+
+
+def _cached_load(uris, constraints=None, callback=None):
+    """iris.load that reads static files from the cache."""
+
+    cubes = _cached_cubes(uris, callback)
+    if cubes is None:
+        return _original_load(uris, constraints, callback)
+
+    return cubes.extract(constraints) if constraints is not None else cubes
+
+
+def _cached_load_cube(uris, constraint=None, callback=None):
+    """iris.load_cube that reads static files from the cache."""
+
+    cubes = _cached_cubes(uris, callback)
+    if cubes is None:
+        return _original_load_cube(uris, constraint, callback)
+
+    if constraint is None:
+        cubes = cubes.merge()
+        if len(cubes) != 1:
+            return _original_load_cube(uris, constraint, callback)
+        return cubes[0]
+
+    return cubes.extract_cube(constraint)
+
+
+def install_static_cache():
+    """Make iris.load and iris.load_cube use the static file cache."""
+
+    global _original_load, _original_load_cube
+    try:
+        import iris
+    except ImportError:
+        return
+
+    _original_load = iris.load
+    _original_load_cube = iris.load_cube
+    iris.load = _cached_load
+    iris.load_cube = _cached_load_cube
+
+
+def warm_static_files(request):
+    """Load any static grid files in the script arguments into the cache.
+
+    The data are realised with the synchronous dask scheduler, so the
+      worker never starts the threaded scheduler's thread pool (the
+      pool doesn't survive a fork and computes in the script run hang).
+
+    """
+
+    import dask
+
+    with dask.config.set(scheduler='synchronous'):
+        for arg in request['argv']:
+            path = os.path.join(request['cwd'], arg)
+            if is_static_file(path) and os.path.isfile(path):
+                try:
+                    load_static_file(path)
+                except Exception as error:
+                    print('pipeline worker: could not cache %s (%s)' %(path, error))
+
+
+def reset_dask_pools():
+    """Discard any dask thread pools inherited from the worker (after a fork)."""
+
+    threaded = sys.modules.get('dask.threaded')
+    if threaded is None:
+        return
+    threaded.default_pool = None
+    threaded.pools.clear()
+    threaded.pools_lock = threading.Lock()
+
+
+def run_script(request, fds):
+    """Run a script (in a forked worker) as if it was run from the command line.
+
+    Returns:
+      int: Exit code
+
+    """
+
+    reset_dask_pools()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for target_fd, client_fd in enumerate(fds):
+        os.dup2(client_fd, target_fd)
+    os.chdir(request['cwd'])
+    os.environ.clear()
+    os.environ.update(request['env'])
+    sys.argv = [request['script']] + request['argv']
+    sys.path[0] = os.path.dirname(request['script'])
+
+    try:
+        runpy.run_path(request['script'], run_name='__main__')
+        exit_code = 0
+    except SystemExit as error:
+        if error.code is None:
+            exit_code = 0
+        elif isinstance(error.code, int):
+            exit_code = error.code
+        else:
+            print(error.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    return exit_code
+
+
+def read_request(conn):
+    """Read a length prefixed json request (and any attached file descriptors)."""
+
+    header, fds, flags, address = socket.recv_fds(conn, 8, 3)
+    while len(header) < 8:
+        chunk = conn.recv(8 - len(header))
+        if not chunk:
+            raise ConnectionError('incomplete request')
+        header = header + chunk
+    nbytes = struct.unpack('!Q', header)[0]
+    payload = b''
+    while len(payload) < nbytes:
+        chunk = conn.recv(min(nbytes - len(payload), 2**20))
+        if not chunk:
+            raise ConnectionError('incomplete request')
+        payload = payload + chunk
+
+    return json.loads(payload), fds
+
+
+def reap_children():
+    """Clean up finished script runs."""
+
+    try:
+        while os.waitpid(-1, os.WNOHANG)[0]:
+            pass
+    except ChildProcessError:
+        pass
+
+
+def status():
+    """Description of the worker state."""
+
+    return {'pid': os.getpid(),
+            'static_files': [key[0] for key in _static_cache],
+            'static_bytes': sum([entry[1] for entry in _static_cache.values()])}
+
+
+def serve(socket_path):
+    """Listen for requests until asked to stop."""
+
+    try:
+        pipeline_client.send_request({'command': 'status'})
+        sys.exit('pipeline worker already running at ' + socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(64)
+    server.settimeout(5)
+    print('pipeline worker listening at', socket_path)
+
+    try:
+        while True:
+            reap_children()
+            try:
+                conn, address = server.accept()
+            except socket.timeout:
+                continue
+            conn.settimeout(None)
+            try:
+                request, fds = read_request(conn)
+            except (ConnectionError, ValueError) as error:
+                print('pipeline worker: bad request (%s)' %(error))
+                conn.close()
+                continue
+
+            if request['command'] == 'stop':
+                pipeline_client.send_message(conn, status())
+                conn.close()
+                break
+            elif request['command'] == 'status':
+                pipeline_client.send_message(conn, status())
+                conn.close()
+                continue
+
+            if _original_load:
+                warm_static_files(request)
+            refresh_changed_modules()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                server.close()
+                exit_code = run_script(request, fds)
+                try:
+                    pipeline_client.send_message(conn, {'exit_code': exit_code})
+                finally:
+                    os._exit(0)
+            try:
+                pipeline_client.send_message(conn, {'pid': pid})
+            except OSError:
+                pass
+            conn.close()
+            for fd in fds:
+                os.close(fd)
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def main(inargs):
+    """Run the program."""
+
+    global max_static_bytes
+
+    socket_path = pipeline_client.get_socket_path()
+    if inargs.command == 'start':
+        max_static_bytes = inargs.max_cache_size * 1e9
+        preload()
+        install_static_cache()
+        serve(socket_path)
+    else:
+        try:
+            response = pipeline_client.send_request({'command': inargs.command})
+        except (FileNotFoundError, ConnectionRefusedError):
+            sys.exit('no pipeline worker running at ' + socket_path)
+        print(json.dumps(response, indent=1))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     argument_default=argparse.SUPPRESS,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument("command", type=str, choices=('start', 'stop', 'status'), help="Worker command")
+
+    parser.add_argument("--max_cache_size", type=float, default=4.0,
+                        help="Maximum size of the static grid file cache (GB) [default=4.0]")
+
+    args = parser.parse_args()
+    main(args)
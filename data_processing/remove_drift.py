@@ -6,7 +6,10 @@ import os
 import pdb
 import argparse
 import re
+import multiprocessing
 import numpy
+import dask
+import dask.array as da
 import iris
 import iris.util
 import cf_units
@@ -21,54 +24,89 @@ except ImportError:
     raise ImportError('Script and modules in wrong directories')
 
 
+def evaluate_polynomial(x_data, coefficient_a_data, coefficient_b_data, coefficient_c_data, coefficient_d_data):
+    """Evaluate the cubic polynomial a + bx + cx^2 + dx^3 using Horner's scheme.
+
+    The x-axis data are broadcast against the coefficient arrays
+      (rather than the coefficients being repeated along the x-axis).
+
+    Args:
+      x_data (numpy.ndarray): One dimensional x-axis data
+      coefficient_data (numpy.ndarray): Multi-dimensional coefficient array (e.g. lat, lon, depth)
+
+    """
+
+    x_data = numpy.asarray(x_data).astype(numpy.float32)
+    x_data = x_data.reshape(x_data.shape + (1,) * numpy.ndim(coefficient_a_data))
+
+    polynomial = coefficient_d_data * x_data
+    polynomial += coefficient_c_data
+    polynomial *= x_data
+    polynomial += coefficient_b_data
+    polynomial *= x_data
+    polynomial += coefficient_a_data
+
+    return polynomial
+
+
 def apply_polynomial(x_data, coefficient_a_data, coefficient_b_data, coefficient_c_data, coefficient_d_data,
-                     poly_start=None, chunk=False):
+                     poly_start=None):
     """Evaluate cubic polynomial.
 
     Args:
       x_data (numpy.ndarray): One dimensional x-axis data
       coefficient_data (numpy.ndarray): Multi-dimensional coefficient array (e.g. lat, lon, depth)
-      chunk (bool): Chunk the polynomial calculation to avoid memory errors
+      poly_start (numpy.ndarray): Polynomial value at the start of the experiment
+        (defaults to the value at the first x-axis point)
 
     """
     
-    x_data = x_data.astype(numpy.float32)
-    coefficient_dict = {}
-    coefficient_dict['a'] = coefficient_a_data
-    coefficient_dict['b'] = coefficient_b_data
-    coefficient_dict['c'] = coefficient_c_data
-    coefficient_dict['d'] = coefficient_d_data
-
-    while x_data.ndim < coefficient_a_data.ndim + 1:
-        x_data = x_data[..., numpy.newaxis]
-    for letter in ['a', 'b', 'c', 'd']:
-        coef = coefficient_dict[letter]
-        coef = numpy.repeat(coef[numpy.newaxis, ...], x_data.shape[0], axis=0)
-        assert x_data.ndim == coef.ndim
-        coefficient_dict[letter] = coef
-
-    if chunk:
-        polynomial = numpy.zeros(coefficient_dict['b'].shape, dtype='float32')
-        result = numpy.zeros(coefficient_dict['b'].shape, dtype='float32')
-        for index in range(0, coefficient_dict['b'].shape[-1]):
-            # loop to avoid memory error with large arrays 
-            poly = coefficient_dict['a'] + coefficient_dict['b'][..., index] * x_data[..., 0] + coefficient_dict['c'][..., index] * x_data[..., 0]**2 + coefficient_dict['d'][..., index] * x_data[..., 0]**3
-            if not type(poly_start) == numpy.ma.core.MaskedArray:
-                poly_start = poly[0, ::]
-            result[..., index] = poly - poly_start
-            polynomial[..., index] = poly 
-    else:
-        polynomial = coefficient_dict['a'] + coefficient_dict['b'] * x_data + coefficient_dict['c'] * x_data**2 + coefficient_dict['d'] * x_data**3
-        if not type(poly_start) == numpy.ma.core.MaskedArray:
-            try:
-                poly_start = polynomial[0, ::]
-            except IndexError:
-                poly_start = polynomial[0]
-        result = polynomial - poly_start
+    polynomial = evaluate_polynomial(x_data, coefficient_a_data, coefficient_b_data,
+                                     coefficient_c_data, coefficient_d_data)
+    if not type(poly_start) == numpy.ma.core.MaskedArray:
+        poly_start = polynomial[0, ...]
+    result = polynomial - poly_start
 
     return result, polynomial 
 
 
+def _subtract_drift_block(data_block, x_block, coefficient_data, poly_start):
+    """Subtract the drift from one (time) chunk of data."""
+
+    drift_signal = evaluate_polynomial(x_block.ravel(), *coefficient_data) - poly_start
+    new_data = numpy.ma.getdata(data_block) - numpy.ma.getdata(drift_signal)
+
+    return numpy.ma.masked_array(new_data, mask=numpy.ma.getmask(drift_signal))
+
+
+def subtract_drift(data_cube, time_values, coefficient_data, poly_start, time_chunk=None):
+    """Subtract the drift from a data cube, one time chunk at a time.
+
+    The result is a lazy (dask) array, so the drift is only evaluated
+      for one time chunk at a time as the output is written to file.
+
+    Args:
+      data_cube (iris.cube.Cube)
+      time_values (numpy.ndarray): Time axis values (synced with the coefficients)
+      coefficient_data (list): Coefficient a, b, c and d arrays
+      poly_start (numpy.ndarray): Polynomial value at the start of the experiment
+      time_chunk (int): Number of time steps in each chunk
+
+    """
+
+    data = gio.time_chunked_data(data_cube, chunk_size=time_chunk)
+
+    x_data = da.from_array(numpy.asarray(time_values), chunks=(data.chunks[0],))
+    x_data = x_data[(slice(None),) + (numpy.newaxis,) * (data.ndim - 1)]
+
+    meta = numpy.ma.masked_array(numpy.zeros((0,) * data.ndim))
+    new_data = da.map_blocks(_subtract_drift_block, data, x_data, dtype=numpy.float64, meta=meta,
+                             coefficient_data=coefficient_data, poly_start=poly_start)
+    new_cube = data_cube.copy(data=new_data)
+
+    return new_cube
+
+
 def check_attributes(data_attrs, control_attrs):
     """Make sure the correct control run has been used."""
 
@@ -210,14 +248,23 @@ def check_time_adjustment(time_values, coefficient_cube, branch_time, fnum):
         assert time_diff == 0
 
 
-def check_data(new_cube, orig_cube, infile):
-    """Check that the new data is valid."""
+def check_data(new_cube, orig_cube, infile, time_chunk=None):
+    """Check that the new data is valid.
 
-    orig_max = orig_cube.data.max()
-    orig_min = orig_cube.data.min()
+    The data are checked one time chunk at a time, so lazy data
+      are never realised all at once.
+
+    """
 
-    new_max = new_cube.data.max()
-    new_min = new_cube.data.min()
+    chunk_stats = []
+    orig_chunks = gio.iterate_time_chunks(orig_cube, chunk_size=time_chunk)
+    new_chunks = gio.iterate_time_chunks(new_cube, chunk_size=time_chunk)
+    for (start, orig_chunk), (start, new_chunk) in zip(orig_chunks, new_chunks):
+        stats = [orig_chunk.data.max(), orig_chunk.data.min(), new_chunk.data.max(), new_chunk.data.min()]
+        chunk_stats.append([numpy.ma.filled(stat, numpy.nan) for stat in stats])  # nan for fully masked chunks
+    chunk_stats = numpy.array(chunk_stats, dtype=numpy.float64)
+    orig_max, new_max = numpy.nanmax(chunk_stats[:, [0, 2]], axis=0)
+    orig_min, new_min = numpy.nanmin(chunk_stats[:, [1, 3]], axis=0)
 
     valid_max = orig_max * 1.4 if orig_max > 0.0 else orig_max * 0.6
     valid_min = orig_min * 1.4 if orig_min < 0.0 else orig_min * 0.6 
@@ -226,9 +273,110 @@ def check_data(new_cube, orig_cube, infile):
     assert new_min >= valid_min, f'New data min is {new_min} compared to old value of {orig_min}, {infile}'
 
 
+def to_shared_memory(data):
+    """Copy a (masked) array into shared memory.
+
+    Process pool workers created by fork can then all read the
+      same copy of the array.
+
+    """
+
+    shared_data = numpy.frombuffer(multiprocessing.RawArray('d', data.size)).reshape(data.shape)
+    shared_data[...] = numpy.ma.getdata(data)
+    mask = numpy.ma.getmask(data)
+    if mask is not numpy.ma.nomask:
+        shared_mask = numpy.frombuffer(multiprocessing.RawArray('b', data.size), dtype=bool).reshape(data.shape)
+        shared_mask[...] = mask
+        mask = shared_mask
+
+    return numpy.ma.masked_array(shared_data, mask=mask, copy=False)
+
+
+def dedrift_file(fnum, filename, inargs, coefficient_a_cube, coefficient_data,
+                 time_diff, branch_time, new_time_unit, poly_start, sanity_summary):
+    """Remove the drift from a single data file.
+
+    Returns the new cube, or None if it was written to an output file
+      (i.e. if outfile is a directory).
+
+    """
+
+    # Read data
+    data_cube = iris.load_cube(filename, gio.check_iris_var(inargs.var))
+
+    # Reinstate time dim_coord if necessary
+    aux_coord_names = [coord.name() for coord in data_cube.aux_coords]
+    if 'time' in aux_coord_names:
+        data_cube = iris.util.new_axis(data_cube, 'time')
+    if inargs.annual:
+        assert inargs.timescale == 'annual'
+        data_cube = timeseries.convert_to_annual(data_cube, chunk=12)
+    data_cube = check_data_units(data_cube, coefficient_a_cube)
+    data_cube = gio.check_time_units(data_cube)
+    data_cube.cell_methods = ()
+    if not inargs.no_parent_check:
+        check_attributes(data_cube.attributes, coefficient_a_cube.attributes)
+
+    # Sync the data time axis with the coefficient time axis        
+    time_coord = data_cube.coord('time')
+    time_coord.convert_units(new_time_unit)
+        
+    time_values = time_coord.points.astype(numpy.float32) - time_diff
+    if not inargs.no_time_check:
+        check_time_adjustment(time_values, coefficient_a_cube, branch_time, fnum)    
+
+    # Remove the drift
+    if not inargs.dummy:
+        new_cube = subtract_drift(data_cube, time_values, coefficient_data, poly_start,
+                                  time_chunk=inargs.time_chunk)
+        if not inargs.no_data_check:
+            check_data(new_cube, data_cube, filename, time_chunk=inargs.time_chunk)
+    else:
+        print('fake run - drift signal not subtracted')
+        new_cube = data_cube
+    new_cube.metadata = data_cube.metadata
+    if sanity_summary:
+        new_cube.attributes['drift_removal'] = sanity_summary
+
+    if inargs.outfile[-1] == '/':        
+        infile = filename.split('/')[-1]
+        if inargs.annual:
+            infile = re.sub('Omon', 'Oyr', infile)
+        outfile = inargs.outfile + infile
+        metadata_dict = {infile: data_cube.attributes['history'], 
+                         inargs.coefficient_file: coefficient_a_cube.attributes['history']}
+        new_cube.attributes['history'] = gio.write_metadata(file_info=metadata_dict)
+
+        #assert new_cube.data.dtype == numpy.float32
+        iris.save(new_cube, outfile, netcdf_format='NETCDF3_CLASSIC')
+        print('output:', outfile)
+        new_cube = None
+
+    return new_cube
+
+
+_pool_state = {}
+
+
+def _dedrift_file(fnum):
+    """Remove the drift from a single data file in a process pool worker.
+
+    The workers inherit the shared memory coefficients (and the other
+      dedrift_file arguments) from the parent process via fork.
+
+    """
+
+    with dask.config.set(scheduler='synchronous'):
+        dedrift_file(fnum, _pool_state['data_files'][fnum], **_pool_state['kwargs'])
+
+
 def main(inargs):
     """Run the program."""
     
+    assert (inargs.outfile[-3:] == '.nc') or (inargs.outfile[-1] == '/')
+    if inargs.workers > 1:
+        assert inargs.outfile[-1] == '/', "Parallel processing requires an output file for each input file"
+
     # Read drift coefficients
     coefficient_a_cube = iris.load_cube(inargs.coefficient_file, 'coefficient a')
     coefficient_b_cube = iris.load_cube(inargs.coefficient_file, 'coefficient b')
@@ -239,6 +387,10 @@ def main(inargs):
                                                   coefficient_d_cube, inargs.var)
     else:
         sanity_summary = None
+    coefficient_data = [coefficient_a_cube.data, coefficient_b_cube.data,
+                        coefficient_c_cube.data, coefficient_d_cube.data]
+    if inargs.workers > 1:
+        coefficient_data = [to_shared_memory(data) for data in coefficient_data]
 
     # Read first data cube to get some information
     first_data_cube = iris.load_cube(inargs.data_files[0], gio.check_iris_var(inargs.var))
@@ -251,82 +403,33 @@ def main(inargs):
 
     time_diff, branch_time, new_time_unit = time_adjustment(first_data_cube, coefficient_a_cube,
                                                             inargs.timescale, branch_time=inargs.branch_time)
+
+    # The drift is defined relative to the start of the experiment
+    # (i.e. the branch time for the first data file)
+    start_time = first_data_cube.coord('time').points[0:1].astype(numpy.float32) - time_diff
+    poly_start = evaluate_polynomial(start_time, *coefficient_data)[0, ...]
                 
     data_history = first_data_cube.attributes['history']
     del first_data_cube
 
-    new_cubelist = []
-    for fnum, filename in enumerate(inargs.data_files):
-        # Read data
-        data_cube = iris.load_cube(filename, gio.check_iris_var(inargs.var))
-
-        # Reinstate time dim_coord if necessary
-        aux_coord_names = [coord.name() for coord in data_cube.aux_coords]
-        if 'time' in aux_coord_names:
-            data_cube = iris.util.new_axis(data_cube, 'time')
-        if inargs.annual:
-            assert inargs.timescale == 'annual'
-            data_cube = timeseries.convert_to_annual(data_cube, chunk=12)
-        data_cube = check_data_units(data_cube, coefficient_a_cube)
-        data_cube = gio.check_time_units(data_cube)
-        data_cube.cell_methods = ()
-        if not inargs.no_parent_check:
-            check_attributes(data_cube.attributes, coefficient_a_cube.attributes)
-
-        # Sync the data time axis with the coefficient time axis        
-        time_coord = data_cube.coord('time')
-        time_coord.convert_units(new_time_unit)
-        
-        time_values = time_coord.points.astype(numpy.float32) - time_diff
-        if not inargs.no_time_check:
-            check_time_adjustment(time_values, coefficient_a_cube, branch_time, fnum)    
-
-        # Remove the drift
-        if fnum == 0:
-            drift_signal, start_polynomial = apply_polynomial(time_values, coefficient_a_cube.data,
-                                                              coefficient_b_cube.data, coefficient_c_cube.data,
-                                                              coefficient_d_cube.data, poly_start=None,
-                                                              chunk=inargs.chunk)
-        else:
-            try:
-                start = start_polynomial[0, ::]
-            except IndexError:
-                start = start_polynomial[0]
-            drift_signal, scraps = apply_polynomial(time_values, coefficient_a_cube.data, coefficient_b_cube.data, coefficient_c_cube.data, coefficient_d_cube.data,
-                                                    poly_start=start, chunk=inargs.chunk)
-
-        if not inargs.dummy:
-            new_cube = data_cube - drift_signal
-            #assert new_cube.data.mask.sum() == drift_signal.mask.sum()
-            new_cube.data.mask = drift_signal.mask
-            if not inargs.no_data_check:
-                check_data(new_cube, data_cube, filename)
-        else:
-            print('fake run - drift signal not subtracted')
-            new_cube = data_cube
-        new_cube.metadata = data_cube.metadata
-        if sanity_summary:
-            new_cube.attributes['drift_removal'] = sanity_summary
-
-        assert (inargs.outfile[-3:] == '.nc') or (inargs.outfile[-1] == '/')
-
-        if inargs.outfile[-3:] == '.nc':
-            new_cubelist.append(new_cube)
-        elif inargs.outfile[-1] == '/':        
-            infile = filename.split('/')[-1]
-            if inargs.annual:
-                infile = re.sub('Omon', 'Oyr', infile)
-            outfile = inargs.outfile + infile
-            metadata_dict = {infile: data_cube.attributes['history'], 
-                             inargs.coefficient_file: coefficient_a_cube.attributes['history']}
-            new_cube.attributes['history'] = gio.write_metadata(file_info=metadata_dict)
+    dedrift_kwargs = {'inargs': inargs, 'coefficient_a_cube': coefficient_a_cube,
+                      'coefficient_data': coefficient_data, 'time_diff': time_diff,
+                      'branch_time': branch_time, 'new_time_unit': new_time_unit,
+                      'poly_start': poly_start, 'sanity_summary': sanity_summary}
 
-            #assert new_cube.data.dtype == numpy.float32
-            iris.save(new_cube, outfile, netcdf_format='NETCDF3_CLASSIC')
-            print('output:', outfile)
-            del new_cube
-            del drift_signal
-            
+    if inargs.workers > 1:
+        _pool_state.update(data_files=inargs.data_files, kwargs=dedrift_kwargs)
+        try:
+            with multiprocessing.get_context('fork').Pool(inargs.workers) as pool:
+                pool.map(_dedrift_file, range(len(inargs.data_files)), chunksize=1)
+        finally:
+            _pool_state.clear()
+    else:
+        new_cubelist = []
+        for fnum, filename in enumerate(inargs.data_files):
+            new_cube = dedrift_file(fnum, filename, **dedrift_kwargs)
+            if new_cube is not None:
+                new_cubelist.append(new_cube)
 
     if inargs.outfile[-3:] == '.nc':
         new_cubelist = iris.cube.CubeList(new_cubelist)
@@ -367,8 +470,10 @@ notes:
     parser.add_argument("--no_data_check", action="store_true", default=False,
                         help="Do not perform check of new dta bounds [default: False]")
 
-    parser.add_argument("--chunk", action="store_true", default=False,
-                        help="Split the polynomial calculation up to avoid memory errors [default: False]")
+    parser.add_argument("--time_chunk", type=int, default=None,
+                        help="Number of time steps to process at once [default: as many as fit in 1GB]")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes for dedrifting the data files in parallel (outfile must be a directory) [default: 1]")
     
     parser.add_argument("--coefficient_check", action="store_true", default=False,
                         help="Check for crazy coefficient values [default: False]")
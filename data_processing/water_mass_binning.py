@@ -6,13 +6,14 @@ import os
 import pdb
 import argparse
 import logging
+import multiprocessing
 
 import numpy as np
+import dask
 import iris
 import iris.coord_categorisation
 import iris.util
 import cmdline_provenance as cmdprov
-from statsmodels.stats.weightstats import DescrStatsW
 
 repo_dir = '/'.join(script_dir.split('/')[:-1])
 module_dir = repo_dir + '/modules'
@@ -20,6 +21,7 @@ sys.path.append(module_dir)
 try:
     import water_mass
     import general_io as gio
+    import result_cache
     import convenient_universal as uconv
     import spatial_weights
 except ImportError:
@@ -149,66 +151,107 @@ def construct_cube(outdata_dict, w_cube, t_cube, s_cube, b_cube,
     return outcube_list
 
 
-def clipping_details(orig_data, clipped_data, bin_edges, var_name):
-    """Details of the clipping"""
+def clipping_details(bin_counts, npoints_over, var_name):
+    """Details of the clipping.
 
-    bin_min = bin_edges[0]
-    bin_second_min = bin_edges[1]
-    bin_max = bin_edges[-1]
-    bin_second_max = bin_edges[-2]
+    Args:
+      bin_counts (np.ndarray) -- Counts for each bin index before clipping
+        (i.e. the first element is the number of values under the first
+        edge and the last is the number of values at or over the final edge)
+      npoints_over (int)      -- Number of values over the final edge
+      var_name (str)          -- Binning variable name
 
-    npoints_under = np.sum(orig_data < bin_min)
-    npoints_min = np.sum(orig_data <= bin_second_min) - npoints_under
-    npoints_clip_min = np.sum(clipped_data <= bin_second_min) - np.sum(clipped_data < bin_min)
-    assert npoints_clip_min == npoints_under + npoints_min
+    """
 
-    npoints_over = np.sum(orig_data > bin_max)
-    npoints_max = np.sum(orig_data <= bin_max) - np.sum(orig_data <= bin_second_max)
-    npoints_clip_max = np.sum(clipped_data <= bin_max) - np.sum(clipped_data <= bin_second_max)
-    assert npoints_clip_max == npoints_over + npoints_max
+    npoints_under = bin_counts[0]
+    npoints_min = bin_counts[1]
+    npoints_max = bin_counts[-2] + (bin_counts[-1] - npoints_over)
 
     logging.info(f"First {var_name} bin had {npoints_min} values, clipping added {npoints_under}")
     logging.info(f"Last {var_name} bin had {npoints_max} values, clipping added {npoints_over}")
-    
 
-def bin_data(df, var_list, edge_list, b_cube, mul_ts=False):
+
+def get_bin_indexes(data, bin_edges, var_name):
+    """Get the bin index for each data value.
+
+    Matches the np.histogramdd bin definition (the final bin includes
+      the final edge) and clips values outside of the edges to the
+      first or last bin.
+
+    """
+
+    nbins = len(bin_edges) - 1
+    indexes = np.searchsorted(bin_edges, data, side='right') - 1
+    bin_counts = np.bincount(indexes + 1, minlength=nbins + 2)
+    npoints_over = np.count_nonzero(data > bin_edges[-1]) if bin_counts[-1] else 0
+    clipping_details(bin_counts, npoints_over, var_name)
+    np.clip(indexes, 0, nbins - 1, out=indexes)
+
+    return indexes
+
+
+def bin_data(df, t_edges, s_edges, b_edges, b_cube, mul_ts=False):
     """Bin the data.
 
+    The temperature, salinity and temperature-salinity distributions
+      are all derived from a single joint (salinity, temperature, basin)
+      histogram, which is calculated with np.bincount on precomputed
+      bin indexes (one pass over the data for each weights variable).
+
     Args:
-      df (pandas.DataFrame)  -- Data
-      var_list (list)        -- Variables for binning axes
-      edge_list (list)       -- Bin edges for each bin axis variable
-      mul_ts (bool)          -- Bin weights times T and S too
+      df (water_mass.WaterMassData) -- Data
+      t_edges (np.ndarray)    -- Temperature bin edges
+      s_edges (np.ndarray)    -- Salinity bin edges
+      b_edges (np.ndarray)    -- Basin bin edges
+      b_cube (iris.cube.Cube) -- Basin cube
+      mul_ts (bool)           -- Bin weights times T and S too
+
+    Returns:
+      Dictionary of binned data with the same keys as the
+        construct_cube outdata_dict (e.g. w_tbin, wt_tsbin)
 
     """
 
-    data_list = []
-    for var, edges in zip(var_list, edge_list):
-        assert var in ['temperature', 'salinity', 'basin']
-        values = np.clip(df[var].values, edges[0], edges[-1])
-        clipping_details(df[var].values, values, edges, var)
-        data_list.append(values)
-    data = np.array(data_list).T
-
-    w_data = df['weight'].astype(np.float64).values
-    w_dist, edges = np.histogramdd(data, weights=w_data, bins=edge_list)
-    binned_total_weight = w_dist.sum()
-    orig_total_weight = w_data.sum()
-    logging.info(f"Global total before binning: {orig_total_weight}")
-    logging.info(f"Global total after binning: {binned_total_weight}")
-    np.testing.assert_allclose(orig_total_weight, binned_total_weight, rtol=0.05)
-    w_dist = select_basin(w_dist, b_cube)
+    salinity = 'salinity' in df
+    nt = len(t_edges) - 1
+    nb = len(b_edges) - 1
+
+    t_data = df['temperature']
+    joint_index = get_bin_indexes(t_data, t_edges, 'temperature') * nb
+    joint_index += get_bin_indexes(df['basin'], b_edges, 'basin')
+    hist_shape = (nt, nb)
+    if salinity:
+        s_data = df['salinity']
+        ns = len(s_edges) - 1
+        joint_index += get_bin_indexes(s_data, s_edges, 'salinity') * (nt * nb)
+        hist_shape = (ns, nt, nb)
+    nbins = int(np.prod(hist_shape))
+
+    w_data = df['weight'].astype(np.float64)
+    weights_dict = {'w': w_data}
     if mul_ts:
-        wt_dist, edges = np.histogramdd(data, weights=w_data * df['temperature'].values, bins=edge_list)
-        wt_dist = select_basin(wt_dist, b_cube)
-        if 'salinity' in df:
-            ws_dist, edges = np.histogramdd(data, weights=w_data * df['salinity'].values, bins=edge_list)
-            ws_dist = select_basin(ws_dist, b_cube)
-            return w_dist, ws_dist, wt_dist
+        weights_dict['wt'] = w_data * t_data
+        if salinity:
+            weights_dict['ws'] = w_data * s_data
+
+    outdata_dict = {}
+    for wvar, weights in weights_dict.items():
+        dist = np.bincount(joint_index, weights=weights, minlength=nbins).reshape(hist_shape)
+        if wvar == 'w':
+            binned_total_weight = dist.sum()
+            orig_total_weight = w_data.sum()
+            logging.info(f"Global total before binning: {orig_total_weight}")
+            logging.info(f"Global total after binning: {binned_total_weight}")
+            np.testing.assert_allclose(orig_total_weight, binned_total_weight, rtol=0.05)
+        dist = select_basin(dist, b_cube)
+        if salinity:
+            outdata_dict[wvar + '_tsbin'] = dist
+            outdata_dict[wvar + '_sbin'] = dist.sum(axis=1)
+            outdata_dict[wvar + '_tbin'] = dist.sum(axis=0)
         else:
-            return w_dist, wt_dist
-    else:
-        return w_dist
+            outdata_dict[wvar + '_tbin'] = dist
+
+    return outdata_dict
     
 
 def select_basin(data, b_cube, basin='globe'):
@@ -230,7 +273,7 @@ def select_basin(data, b_cube, basin='globe'):
     return data
 
 
-def get_weights_data(file_list, var):
+def get_weights_data(file_list, var, cache=False):
     """Read the weights data file/s"""
     
     w_var = mom_vars[var] if var in mom_vars else var
@@ -239,7 +282,7 @@ def get_weights_data(file_list, var):
         w_cube = gio.get_ocean_weights(file_list[0])
         history = w_cube.attributes['history'] 
     else:
-        w_cube, history = gio.combine_files(file_list, var, checks=True)
+        w_cube, history = gio.combine_files(file_list, var, checks=True, cache=cache)
 
     return w_cube, history
 
@@ -268,10 +311,10 @@ def get_log(inargs, w_history, t_history, s_history, b_cube, a_cube, v_cube):
     return log
 
 
-def get_bin_data(files, var, w_cube):
+def get_bin_data(files, var, w_cube, cache=False):
     """Get binning variable data."""
 
-    cube, history = gio.combine_files(files, var, checks=True)
+    cube, history = gio.combine_files(files, var, checks=True, cache=cache)
     w_coord_names = [coord.name() for coord in w_cube.dim_coords]
     coord_names = [coord.name() for coord in cube.dim_coords]
 
@@ -299,35 +342,362 @@ def get_bin_data(files, var, w_cube):
     return cube, history
 
 
-def weighted_percentiles(data, weights, percentiles):
+def _group_percentiles(data, weights, percentiles, groups, group_values):
+    """Weighted percentiles of each group for a single (1D) set of data.
+
+    Sorts the data once (by group and then value) and finds every
+      requested percentile of every group with a single search of
+      the cumulative weights.
+
+    """
+
+    order = np.lexsort((data, groups))
+    data = data[order]
+    groups = groups[order]
+    cweights = np.cumsum(weights[order], dtype=np.float64)
+
+    # Aggregate over ties (only the last element of each run of equal values is searched)
+    run_ends = np.ones(len(data), dtype=bool)
+    run_ends[:-1] = (data[1:] != data[:-1]) | (groups[1:] != groups[:-1])
+    values = data[run_ends]
+    run_groups = groups[run_ends]
+    cweights = cweights[run_ends]
+
+    ngroups = len(group_values)
+    if not len(cweights):
+        return np.full([ngroups, len(percentiles)], np.nan)
+    group_starts = np.searchsorted(run_groups, group_values, side='left')
+    group_ends = np.searchsorted(run_groups, group_values, side='right') - 1
+    empty = group_ends < group_starts
+    group_starts[empty] = 0
+    group_ends[empty] = 0
+    offsets = np.where(group_starts > 0, cweights[group_starts - 1], 0.0)
+    totals = cweights[group_ends] - offsets
+
+    targets = offsets[:, np.newaxis] + percentiles[np.newaxis, :] * totals[:, np.newaxis]
+    ii = np.searchsorted(cweights, targets.ravel(), side='left').reshape(targets.shape)
+    ii = np.clip(ii, group_starts[:, np.newaxis], group_ends[:, np.newaxis])
+    result = values[ii].astype(np.float64)
+
+    # Exact hits (use the midpoint of this and the next value)
+    tolerance = 1e-10 * np.maximum(totals, 1.0)[:, np.newaxis]
+    hits = (np.abs(targets - cweights[ii]) < tolerance) & (ii < group_ends[:, np.newaxis])
+    result[hits] = (values[ii[hits]] + values[ii[hits] + 1]) / 2
+    result[empty, :] = np.nan
+
+    return result
+
+
+def weighted_percentiles(data, weights, percentiles, groups=None, group_values=None):
     """Return the weighted percentiles.
 
+    Matches the statsmodels DescrStatsW.quantile definition (i.e. the
+      first value whose cumulative weight reaches the requested fraction
+      of the total, or the midpoint of two values on an exact hit),
+      but sorts the data only once per time step and finds all the
+      percentiles for all the groups (e.g. basins) in one search.
+
     Args:
-      data (np.ndarray) : Bin variable (e.g. temperature, salinity)
-      weights (np.ndarray): Weights (e.g. cell volume, area)
+      data (np.ndarray) : Bin variable (e.g. temperature, salinity).
+        Can be 1D or 2D (time, points)
+      weights (np.ndarray): Weights (e.g. cell volume, area).
+        Same shape as data or (for 2D data) just the points dimension
       percentiles (np.ndarray): Array of requested percentiles (e.g. 0-1 by 0.01)
+      groups (np.ndarray): Group (e.g. basin) of each data point (same shape as weights)
+      group_values (list): Groups to calculate percentiles for [default = all unique groups]
+
+    Returns:
+      np.ndarray: Shape ([time,] [group,] percentile). Groups with no data are NaN.
 
     """
-    
+
+    percentiles = np.atleast_1d(np.asarray(percentiles, dtype=np.float64))
+    assert percentiles.max() <= 1.0
+    assert percentiles.min() >= 0.0
+
+    data = np.ma.filled(data, np.nan)
+    weights = np.ma.filled(weights, 0)
+    grouped = groups is not None
+    if not grouped:
+        groups = np.zeros(weights.shape, dtype=np.uint8)
+        group_values = [0]
+    elif group_values is None:
+        group_values = np.unique(groups)
+    group_values = np.asarray(group_values)
+
+    time_axis = data.ndim == 2
+    data = np.atleast_2d(data)
+    weights = np.broadcast_to(weights, data.shape)
+    groups = np.broadcast_to(groups, data.shape)
+
+    result = np.zeros([data.shape[0], len(group_values), len(percentiles)])
+    for time_index in range(data.shape[0]):
+        valid = np.isfinite(data[time_index])
+        result[time_index] = _group_percentiles(data[time_index][valid], weights[time_index][valid],
+                                                percentiles, groups[time_index][valid], group_values)
+
+    if not grouped:
+        result = result[:, 0, :]
+    if not time_axis:
+        result = result[0]
+
+    return result
+
+
+def streaming_weighted_percentiles(chunk_func, percentiles, group_values=None, nbins=1000):
+    """Return approximate weighted percentiles for data too large to hold in memory.
+
+    Uses histogram refinement over three passes through the data:
+      the range of each group, a coarse histogram of each group (to find
+      the bin containing each percentile) and a fine histogram of just
+      those bins. The percentiles are then interpolated within the fine
+      bins, so the error is less than the group range / nbins**2.
+
+    Args:
+      chunk_func (function): Takes no arguments and returns an iterator
+        over (data, weights, groups) chunks (e.g. one depth level of a
+        full depth field at a time). groups can be None for a single group.
+      percentiles (np.ndarray): Array of requested percentiles (e.g. 0-1 by 0.01)
+      group_values (list): Groups to calculate percentiles for (required if chunks have groups)
+      nbins (int): Number of bins in the coarse and fine histograms
+
+    Returns:
+      np.ndarray: Shape ([group,] percentile). Groups with no data are NaN.
+
+    """
+
+    percentiles = np.atleast_1d(np.asarray(percentiles, dtype=np.float64))
     assert percentiles.max() <= 1.0
     assert percentiles.min() >= 0.0
 
-    wq = DescrStatsW(data=data, weights=weights)
-    bin_edges = wq.quantile(probs=percentiles, return_pandas=False)
+    grouped = group_values is not None
+    group_values = np.asarray(group_values) if grouped else np.array([0])
+    ngroups = len(group_values)
+    group_order = np.argsort(group_values)
+    sorted_group_values = group_values[group_order]
+
+    def chunks():
+        """Valid data, weights and group index for each chunk"""
+        for data, weights, groups in chunk_func():
+            data = np.ma.filled(data, np.nan).ravel()
+            weights = np.broadcast_to(np.ma.filled(weights, 0), data.shape).ravel()
+            if grouped:
+                groups = np.broadcast_to(groups, data.shape).ravel()
+                sorted_index = np.searchsorted(sorted_group_values, groups)
+                valid = np.isfinite(data) & (sorted_index < ngroups)
+                valid[valid] = sorted_group_values[sorted_index[valid]] == groups[valid]
+                group_index = group_order[np.minimum(sorted_index, ngroups - 1)]
+            else:
+                group_index = np.zeros(data.shape, dtype=int)
+                valid = np.isfinite(data)
+            yield data[valid], weights[valid].astype(np.float64), group_index[valid]
+
+    # Pass 1: range of each group
+    group_min = np.full(ngroups, np.inf)
+    group_max = np.full(ngroups, -np.inf)
+    for data, weights, group_index in chunks():
+        np.minimum.at(group_min, group_index, data)
+        np.maximum.at(group_max, group_index, data)
+    empty = group_min > group_max
+    group_min[empty] = 0
+    group_max[empty] = 0
+    coarse_width = np.maximum(group_max - group_min, np.finfo(np.float64).tiny) / nbins
+
+    def bin_index(data, lower, width):
+        return np.clip(((data - lower) / width).astype(int), 0, nbins - 1)
+
+    # Pass 2: coarse histogram
+    coarse_hist = np.zeros(ngroups * nbins)
+    for data, weights, group_index in chunks():
+        coarse_index = group_index * nbins + bin_index(data, group_min[group_index], coarse_width[group_index])
+        coarse_hist += np.bincount(coarse_index, weights=weights, minlength=ngroups * nbins)
+    coarse_hist = coarse_hist.reshape(ngroups, nbins)
+    coarse_cumulative = np.cumsum(coarse_hist, axis=1)
+    totals = coarse_cumulative[:, -1]
+    targets = percentiles[np.newaxis, :] * totals[:, np.newaxis]
+    target_bins = np.array([np.searchsorted(coarse_cumulative[group], targets[group], side='left')
+                            for group in range(ngroups)])
+    target_bins = np.clip(target_bins, 0, nbins - 1)
+
+    # Pass 3: fine histogram of the coarse bins that contain a percentile
+    refine_lookup = np.full([ngroups, nbins], -1)
+    refine_pairs = np.unique(np.column_stack([np.repeat(np.arange(ngroups), len(percentiles)),
+                                              target_bins.ravel()]), axis=0)
+    refine_group, refine_bin = refine_pairs[:, 0], refine_pairs[:, 1]
+    refine_lookup[refine_group, refine_bin] = np.arange(len(refine_pairs))
+    fine_hist = np.zeros(len(refine_pairs) * nbins)
+    for data, weights, group_index in chunks():
+        coarse_bin = bin_index(data, group_min[group_index], coarse_width[group_index])
+        row = refine_lookup[group_index, coarse_bin]
+        selection = row >= 0
+        row = row[selection]
+        group_index = group_index[selection]
+        bin_lower = group_min[group_index] + coarse_bin[selection] * coarse_width[group_index]
+        fine_index = row * nbins + bin_index(data[selection], bin_lower, coarse_width[group_index] / nbins)
+        fine_hist += np.bincount(fine_index, weights=weights[selection], minlength=len(refine_pairs) * nbins)
+    fine_hist = fine_hist.reshape(len(refine_pairs), nbins)
+
+    # Interpolate within the fine bins
+    result = np.zeros([ngroups, len(percentiles)])
+    for group in range(ngroups):
+        for pindex, target in enumerate(targets[group]):
+            coarse_bin = target_bins[group, pindex]
+            row = refine_lookup[group, coarse_bin]
+            below = coarse_cumulative[group, coarse_bin] - coarse_hist[group, coarse_bin]
+            fine_cumulative = below + np.cumsum(fine_hist[row])
+            fine_bin = min(np.searchsorted(fine_cumulative, target, side='left'), nbins - 1)
+            fine_width = coarse_width[group] / nbins
+            bin_weight = fine_hist[row, fine_bin]
+            fraction = (target - (fine_cumulative[fine_bin] - bin_weight)) / bin_weight if bin_weight > 0 else 0
+            bin_lower = group_min[group] + coarse_bin * coarse_width[group] + fine_bin * fine_width
+            result[group, pindex] = bin_lower + np.clip(fraction, 0, 1) * fine_width
+    result[empty, :] = np.nan
+
+    if not grouped:
+        result = result[0]
+
+    return result
+
+
+def init_outdata(ntimes, nt_values, ns_values, s_cube, mul_ts, shared=False):
+    """Initialise the output data arrays.
+
+    If shared is True, the arrays are allocated in shared memory
+      so they can be filled by process pool workers.
+
+    """
+
+    def new_array(shape):
+        if shared:
+            buffer = multiprocessing.RawArray('d', int(np.prod(shape)))
+            return np.frombuffer(buffer, dtype=np.float64).reshape(shape)
+        else:
+            return np.ma.zeros(shape)
+
+    wvar_list = ['w']
+    if mul_ts:
+        wvar_list = ['w', 'wt', 'ws'] if s_cube else ['w', 'wt']
+
+    outdata_dict = {}
+    for wvar in wvar_list:
+        outdata_dict[wvar + '_tbin'] = new_array([ntimes, nt_values])
+        if s_cube:
+            outdata_dict[wvar + '_sbin'] = new_array([ntimes, ns_values])
+            outdata_dict[wvar + '_tsbin'] = new_array([ntimes, ns_values, nt_values])
+
+    return outdata_dict
+
+
+def get_grid_cache_file(basin_file, measure_file=None):
+    """Get the name of the grid context file (saved next to the basin file)."""
+
+    cache_file = basin_file.replace('.nc', '')
+    if measure_file:
+        measure_name = os.path.basename(measure_file).split('_')[0]
+        cache_file = cache_file + '_' + measure_name
+    cache_file = cache_file + '_grid-context.npz'
+
+    return cache_file
+
+
+def bin_year(year_index, years, t_cube, s_cube, w_cube, grid, b_cube,
+             t_edges, s_edges, b_edges, w_dtype, index_cache=None):
+    """Bin the data for a single year."""
 
-    # manual method does not give a clean results...
-    #ix = np.argsort(data)
-    #data = data[ix] # sort data
-    #weights = weights[ix] # sort weights
-    #cdf = (np.cumsum(weights) - 0.5 * weights) / np.sum(weights) # 'like' a CDF function
-    #perc = np.arange(0, 1.01, 0.01)
-    #test2 = np.interp(perc, cdf, data)
+    year = years[year_index]
+    print(year)         
+    year_constraint = iris.Constraint(year=year)
+    t_year_cube = t_cube.extract(year_constraint)
+    if s_cube:
+        s_year_cube = s_cube.extract(year_constraint)
+    else:
+        s_year_cube = None
+    if w_dtype == 'spatial':
+        w_year_cube = w_cube
+    else:
+        w_year_cube = w_cube.extract(year_constraint)
+
+    df, s_units, t_units = water_mass.create_df(w_year_cube, t_year_cube, s_year_cube, b_cube,
+                                                multiply_weights_by_days_in_year_frac=True,
+                                                index_cache=index_cache, grid=grid)
+    bin_dict = bin_data(df, t_edges, s_edges, b_edges, b_cube, mul_ts=(w_dtype == 'spatial'))
+
+    return bin_dict, s_units, t_units
+
+
+def bin_month(month, t_cube, s_cube, w_cube, grid, b_cube,
+              t_edges, s_edges, b_edges, w_dtype, index_cache=None):
+    """Bin the data for a single month."""
+
+    print(month)         
+    t_month_cube = t_cube[month, ::]
+    if s_cube:
+        s_month_cube = s_cube[month, ::]
+    else:
+        s_month_cube = None
+
+    if w_dtype == 'spatial':
+        w_month_cube = w_cube
+    else:
+        w_month_cube = w_cube[month, ::]
+        
+    df, s_units, t_units = water_mass.create_df(w_month_cube, t_month_cube, s_month_cube, b_cube,
+                                                index_cache=index_cache, grid=grid)
+    bin_dict = bin_data(df, t_edges, s_edges, b_edges, b_cube, mul_ts=(w_dtype == 'spatial'))
 
-    return bin_edges
+    return bin_dict, s_units, t_units
+
+
+_pool_state = {}
+
+
+def _bin_time_step(time_index):
+    """Bin a single time step in a process pool worker.
+
+    The workers inherit the (lazy) input cubes and the shared memory
+      output arrays from the parent process (via fork), so each worker
+      only reads the data for the time steps it is given. The data are
+      realised with the synchronous dask scheduler, because the threaded
+      scheduler's thread pool (started by computes in the parent) doesn't
+      survive the fork.
+
+    """
+
+    bin_func = _pool_state['bin_func']
+    with dask.config.set(scheduler='synchronous'):
+        bin_dict, s_units, t_units = bin_func(time_index, index_cache=_pool_state['index_cache'],
+                                              **_pool_state['kwargs'])
+    for key, binned_data in bin_dict.items():
+        _pool_state['outdata'][key][time_index, ::] = binned_data
+
+    return s_units, t_units
+
+
+def bin_time_steps(bin_func, ntimes, outdata_dict, workers=1, **kwargs):
+    """Bin each time step, spreading them across a process pool if workers > 1."""
+
+    if workers > 1:
+        _pool_state.update(bin_func=bin_func, kwargs=kwargs,
+                           outdata=outdata_dict, index_cache={})
+        try:
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                units_list = pool.map(_bin_time_step, range(ntimes), chunksize=1)
+        finally:
+            _pool_state.clear()
+        s_units, t_units = units_list[-1]
+        outdata_dict = {key: np.ma.array(data) for key, data in outdata_dict.items()}
+    else:
+        index_cache = {}
+        for time_index in range(ntimes):
+            bin_dict, s_units, t_units = bin_func(time_index, index_cache=index_cache, **kwargs)
+            for key, binned_data in bin_dict.items():
+                outdata_dict[key][time_index, ::] = binned_data
+
+    return outdata_dict, s_units, t_units
 
 
 def process_data_by_year(t_cube, s_cube, w_cube,
-                         a_cube, v_cube, b_cube,
+                         grid, b_cube,
                          t_values, s_values, b_values,
                          nt_values, ns_values,
                          s_edges, t_edges, b_edges,
@@ -347,73 +717,16 @@ def process_data_by_year(t_cube, s_cube, w_cube,
     years = np.array(list(t_years))
     years.sort()
     
-    w_tbin_outdata = np.ma.zeros([len(years), nt_values])
-    if s_cube:
-        w_sbin_outdata = np.ma.zeros([len(years), ns_values])
-        w_tsbin_outdata = np.ma.zeros([len(years), ns_values, nt_values])
-    if w_dtype == 'spatial':
-        wt_tbin_outdata = np.ma.zeros([len(years), nt_values])
-        if s_cube:
-            ws_tbin_outdata = np.ma.zeros([len(years), nt_values])
-            ws_sbin_outdata = np.ma.zeros([len(years), ns_values])
-            wt_sbin_outdata = np.ma.zeros([len(years), ns_values])
-            ws_tsbin_outdata = np.ma.zeros([len(years), ns_values, nt_values])
-            wt_tsbin_outdata = np.ma.zeros([len(years), ns_values, nt_values])
-
-    for year_index, year in enumerate(years):
-        print(year)         
-        year_constraint = iris.Constraint(year=year)
-        t_year_cube = t_cube.extract(year_constraint)
-        if s_cube:
-            s_year_cube = s_cube.extract(year_constraint)
-        else:
-            s_year_cube = None
-        if w_dtype == 'spatial':
-            w_year_cube = w_cube
-        else:
-            w_year_cube = w_cube.extract(year_constraint)
-
-        if a_cube:
-            w_year_cube = spatial_weights.multiply_by_area(w_year_cube, area_cube=a_cube)
-        elif v_cube:
-            w_year_cube = spatial_weights.multiply_by_volume(w_year_cube, volume_cube=v_cube)
-
-        df, s_units, t_units = water_mass.create_df(w_year_cube, t_year_cube, s_year_cube, b_cube,
-                                                    multiply_weights_by_days_in_year_frac=True)
-        if w_dtype == 'spatial':
-            tbin_list = bin_data(df, ['temperature', 'basin'], [t_edges, b_edges], b_cube, mul_ts=True)
-            if s_cube:
-                sbin_list = bin_data(df, ['salinity', 'basin'], [s_edges, b_edges], b_cube, mul_ts=True)
-                tsbin_list = bin_data(df, ['salinity', 'temperature', 'basin'], [s_edges, t_edges, b_edges], b_cube, mul_ts=True)
-                w_tbin_outdata[year_index, ::], ws_tbin_outdata[year_index, ::], wt_tbin_outdata[year_index, ::] = tbin_list
-                w_sbin_outdata[year_index, ::], ws_sbin_outdata[year_index, ::], wt_sbin_outdata[year_index, ::] = sbin_list
-                w_tsbin_outdata[year_index, ::], ws_tsbin_outdata[year_index, ::], wt_tsbin_outdata[year_index, ::] = tsbin_list
-            else:
-                w_tbin_outdata[year_index, ::], wt_tbin_outdata[year_index, ::] = tbin_list
-        else:
-            w_tbin_outdata[year_index, ::] = bin_data(df, ['temperature', 'basin'], [t_edges, b_edges], b_cube)
-            if s_cube:
-                w_sbin_outdata[year_index, ::] = bin_data(df, ['salinity', 'basin'], [s_edges, b_edges], b_cube)
-                w_tsbin_outdata[year_index, ::] = bin_data(df, ['salinity', 'temperature', 'basin'], [s_edges, t_edges, b_edges], b_cube)
-            
-    outdata_dict = {}
-    outdata_dict['w_tbin'] = w_tbin_outdata
-    if s_cube:
-        outdata_dict['w_sbin'] = w_sbin_outdata
-        outdata_dict['w_tsbin'] = w_tsbin_outdata
-    if w_dtype == 'spatial':
-        outdata_dict['wt_tbin'] = wt_tbin_outdata
-        if s_cube:
-            outdata_dict['ws_tbin'] = ws_tbin_outdata        
-            outdata_dict['ws_sbin'] = ws_sbin_outdata
-            outdata_dict['wt_sbin'] = wt_sbin_outdata
-            outdata_dict['ws_tsbin'] = ws_tsbin_outdata
-            outdata_dict['wt_tsbin'] = wt_tsbin_outdata
-        mul_ts = True
-    else:
-        mul_ts = False
-
-    outcube_list = construct_cube(outdata_dict, w_year_cube, t_cube, s_cube, b_cube,
+    mul_ts = w_dtype == 'spatial'
+    outdata_dict = init_outdata(len(years), nt_values, ns_values, s_cube, mul_ts,
+                                shared=(inargs.workers > 1))
+    outdata_dict, s_units, t_units = bin_time_steps(bin_year, len(years), outdata_dict,
+                                                    workers=inargs.workers, years=years,
+                                                    t_cube=t_cube, s_cube=s_cube, w_cube=w_cube,
+                                                    grid=grid, b_cube=b_cube, t_edges=t_edges,
+                                                    s_edges=s_edges, b_edges=b_edges, w_dtype=w_dtype)
+
+    outcube_list = construct_cube(outdata_dict, w_cube, t_cube, s_cube, b_cube,
                                   t_values, t_edges, t_units, s_values, s_edges, s_units,
                                   log, years=years, mul_ts=mul_ts)
 
@@ -421,7 +734,7 @@ def process_data_by_year(t_cube, s_cube, w_cube,
 
 
 def process_data(t_cube, s_cube, w_cube,
-                 a_cube, v_cube, b_cube,
+                 grid, b_cube,
                  t_values, s_values, b_values,
                  nt_values, ns_values,
                  s_edges, t_edges, b_edges,
@@ -430,74 +743,16 @@ def process_data(t_cube, s_cube, w_cube,
 
     nmonths = t_cube.coord('time').shape[0]
     
-    w_tbin_outdata = np.ma.zeros([nmonths, nt_values])
-    if s_cube:
-        w_sbin_outdata = np.ma.zeros([nmonths, ns_values])
-    if t_cube and s_cube:
-        w_tsbin_outdata = np.ma.zeros([nmonths, ns_values, nt_values])
-
-    if w_dtype == 'spatial':
-        wt_tbin_outdata = np.ma.zeros([nmonths, nt_values])
-        if s_cube:
-            ws_tbin_outdata = np.ma.zeros([nmonths, nt_values])        
-            ws_sbin_outdata = np.ma.zeros([nmonths, ns_values])
-            wt_sbin_outdata = np.ma.zeros([nmonths, ns_values])
-            ws_tsbin_outdata = np.ma.zeros([nmonths, ns_values, nt_values])
-            wt_tsbin_outdata = np.ma.zeros([nmonths, ns_values, nt_values])
-
-    for month in range(nmonths):
-        print(month)         
-        t_month_cube = t_cube[month, ::]
-        if s_cube:
-            s_month_cube = s_cube[month, ::]
-        else:
-            s_month_cube = None
-
-        if w_dtype == 'spatial':
-            w_month_cube = w_cube
-        else:
-            w_month_cube = w_cube[month, ::]
-
-        if a_cube:
-            w_month_cube = spatial_weights.multiply_by_area(w_month_cube, area_cube=a_cube)
-        elif v_cube:
-            w_month_cube = spatial_weights.multiply_by_volume(w_month_cube, volume_cube=v_cube)
-        
-        df, s_units, t_units = water_mass.create_df(w_month_cube, t_month_cube, s_month_cube, b_cube)
-        if w_dtype == 'spatial':
-            tbin_list = bin_data(df, ['temperature', 'basin'], [t_edges, b_edges], b_cube, mul_ts=True)
-            if s_cube:
-                sbin_list = bin_data(df, ['salinity', 'basin'], [s_edges, b_edges], b_cube, mul_ts=True)
-                tsbin_list = bin_data(df, ['salinity', 'temperature', 'basin'], [s_edges, t_edges, b_edges], b_cube, mul_ts=True)
-                w_tbin_outdata[month, ::], ws_tbin_outdata[month, ::], wt_tbin_outdata[month, ::] = tbin_list
-                w_sbin_outdata[month, ::], ws_sbin_outdata[month, ::], wt_sbin_outdata[month, ::] = sbin_list
-                w_tsbin_outdata[month, ::], ws_tsbin_outdata[month, ::], wt_tsbin_outdata[month, ::] = tsbin_list
-            else:
-                w_tbin_outdata[month, ::], wt_tbin_outdata[month, ::] = tbin_list
-        else:
-            w_tbin_outdata[month, ::] = bin_data(df, ['temperature', 'basin'], [t_edges, b_edges], b_cube)
-            if s_cube:
-                w_sbin_outdata[month, ::] = bin_data(df, ['salinity', 'basin'], [s_edges, b_edges], b_cube)
-                w_tsbin_outdata[month, ::] = bin_data(df, ['salinity', 'temperature', 'basin'], [s_edges, t_edges, b_edges], b_cube)
-
-    outdata_dict = {}
-    outdata_dict['w_tbin'] = w_tbin_outdata
-    if s_cube:
-        outdata_dict['w_sbin'] = w_sbin_outdata
-        outdata_dict['w_tsbin'] = w_tsbin_outdata
-    if w_dtype == 'spatial':
-        outdata_dict['wt_tbin'] = wt_tbin_outdata
-        if s_cube:
-            outdata_dict['ws_tbin'] = ws_tbin_outdata
-            outdata_dict['ws_sbin'] = ws_sbin_outdata
-            outdata_dict['wt_sbin'] = wt_sbin_outdata
-            outdata_dict['ws_tsbin'] = ws_tsbin_outdata
-            outdata_dict['wt_tsbin'] = wt_tsbin_outdata
-        mul_ts = True
-    else:
-        mul_ts = False
-
-    outcube_list = construct_cube(outdata_dict, w_month_cube, t_cube, s_cube, b_cube,
+    mul_ts = w_dtype == 'spatial'
+    outdata_dict = init_outdata(nmonths, nt_values, ns_values, s_cube, mul_ts,
+                                shared=(inargs.workers > 1))
+    outdata_dict, s_units, t_units = bin_time_steps(bin_month, nmonths, outdata_dict,
+                                                    workers=inargs.workers,
+                                                    t_cube=t_cube, s_cube=s_cube, w_cube=w_cube,
+                                                    grid=grid, b_cube=b_cube, t_edges=t_edges,
+                                                    s_edges=s_edges, b_edges=b_edges, w_dtype=w_dtype)
+
+    outcube_list = construct_cube(outdata_dict, w_cube, t_cube, s_cube, b_cube,
                                   t_values, t_edges, t_units, s_values, s_edges, s_units,
                                   log, mul_ts=mul_ts)
 
@@ -517,10 +772,10 @@ def main(inargs):
     else:
         weights_dtype = 'full field'
 
-    w_cube, w_history = get_weights_data(inargs.weights_files, inargs.weights_var)
-    t_cube, t_history = get_bin_data(inargs.temperature_files, inargs.temperature_var, w_cube)
+    w_cube, w_history = get_weights_data(inargs.weights_files, inargs.weights_var, cache=inargs.result_cache)
+    t_cube, t_history = get_bin_data(inargs.temperature_files, inargs.temperature_var, w_cube, cache=inargs.result_cache)
     if inargs.salinity_files:
-        s_cube, s_history = get_bin_data(inargs.salinity_files, inargs.salinity_var, w_cube)
+        s_cube, s_history = get_bin_data(inargs.salinity_files, inargs.salinity_var, w_cube, cache=inargs.result_cache)
     else:
         s_cube = s_history = None
     b_cube = iris.load_cube(inargs.basin_file, 'region')
@@ -537,6 +792,15 @@ def main(inargs):
 
     log = get_log(inargs, w_history, t_history, s_history, b_cube, a_cube, v_cube)
 
+    measure_cube = a_cube if a_cube else v_cube
+    measure_file = inargs.area_file if a_cube else inargs.volume_file
+    cache_file = get_grid_cache_file(inargs.basin_file, measure_file) if inargs.grid_cache else None
+    grid = water_mass.get_grid_context(b_cube, measure_cube=measure_cube, cache_file=cache_file,
+                                       source_files=[inargs.basin_file, measure_file])
+    if grid.measure_name:
+        # weights are multiplied by the grid cell measure in water_mass.create_df
+        w_cube.units = spatial_weights.multiply_units_by_measure(w_cube.units, grid.measure_name)
+
     b_values, b_edges = uconv.get_basin_details(b_cube)
     t_min, t_max = inargs.temperature_bounds
     t_step = inargs.tbin_size
@@ -548,7 +812,7 @@ def main(inargs):
 
     if inargs.bin_freq == 'yr':
         outcube_list = process_data_by_year(t_cube, s_cube, w_cube,
-                                            a_cube, v_cube, b_cube,
+                                            grid, b_cube,
                                             t_values, s_values, b_values,
                                             nt_values, ns_values,
                                             s_edges, t_edges, b_edges,
@@ -556,7 +820,7 @@ def main(inargs):
                                             log, inargs) 
     elif inargs.bin_freq == 'mon':
         outcube_list = process_data(t_cube, s_cube, w_cube,
-                                    a_cube, v_cube, b_cube,
+                                    grid, b_cube,
                                     t_values, s_values, b_values,
                                     nt_values, ns_values,
                                     s_edges, t_edges, b_edges,
@@ -585,6 +849,12 @@ if __name__ == '__main__':
 
     parser.add_argument("--area_file", type=str, default=None, help="For multiplying weights by area")
     parser.add_argument("--volume_file", type=str, default=None, help="For multiplying weights by volume")
+    parser.add_argument("--grid_cache", action="store_true", default=False,
+                        help="Save/reuse the static grid information (basin, area/volume) in a file next to the basin file")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes for binning the time steps (or years) in parallel")
+    parser.add_argument("--result_cache", action="store_true", default=False,
+                        help="Reuse the output of an identical earlier run and cache the combined input files (see manage_result_cache.py)")
 
     parser.add_argument("--temperature_bounds", type=float, nargs=2, default=(-6, 50),
                         help='bounds for the temperature (Y) axis')
@@ -592,4 +862,7 @@ if __name__ == '__main__':
     parser.add_argument("--tbin_size", type=float, default=bin_default, help='temperature bin size')
 
     args = parser.parse_args()             
-    main(args)
+    if args.result_cache:
+        result_cache.run_cached(main, args, __file__)
+    else:
+        main(args)
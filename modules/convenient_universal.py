@@ -5,7 +5,9 @@ Functions:
   apply_land_ocean_mask -- Apply a land or ocean mask from an sftlf (land surface fraction) file
   apply_lon_filter      -- Set values outside of specified longitude range to zero
   broadcast_array       -- Broadcast an array to a target shape
+  basin_selection       -- Select grid points in a list of basins (via the basin index lists)
   calc_significance     -- Perform significance test
+  compact_basin_array   -- Convert basin data to the compact uint8 basin index format
   convert_to_joules     -- Convert units from Watts to Joules
   coordinate_paris      -- Generate lat/lon pairs
   create_basin_array    -- Create an ocean basin array
@@ -14,6 +16,7 @@ Functions:
   find_nearest          -- Find the closest array item to value
   find_duplicates       -- Return list of duplicates in a list
   fix_label             -- Fix formatting of an axis label taken from the command line
+  get_basin_indexes     -- Get the flattened indexes of the grid points in each basin
   get_bounds_list       -- Create a bounds (i.e. pairs) list from an edge list
   get_threshold         -- Turn the user input threshold into a numeric threshold
   hi_lo                 -- Determine the new highest and lowest value.
@@ -29,12 +32,16 @@ Functions:
 import numpy
 from scipy import stats
 import pdb, re
+import hashlib
 import inspect
 import iris
 import statsmodels.api as sm
 from statsmodels.tsa.stattools import acf
 
 
+_basin_index_cache = {}
+
+
 def add_globe_basin(data, basin_cube):
     """Add a global basin to a data array with a basin dimension.
 
@@ -213,6 +220,30 @@ def broadcast_array(array, axis_index, shape):
     return array
 
 
+def basin_selection(basin_data, basins_to_keep):
+    """Select grid points in a list of basins.
+
+    Uses the per-basin index lists (see get_basin_indexes) rather
+      than comparing the full basin array against each basin.
+
+    Args:
+      basin_data (numpy.ndarray): Basin values (e.g. from a basin file)
+      basins_to_keep (list): Basin values to select
+
+    Returns:
+      Boolean numpy.ndarray with the shape of basin_data (True = selected)
+
+    """
+
+    basin_indexes = get_basin_indexes(basin_data)
+    selection = numpy.zeros(basin_data.size, dtype=bool)
+    for basin in basins_to_keep:
+        if basin in basin_indexes:
+            selection[basin_indexes[basin]] = True
+
+    return selection.reshape(basin_data.shape)
+
+
 def calc_significance(data_subset, data_all, standard_name):
     """Perform significance test.
 
@@ -337,6 +368,20 @@ def coordinate_pairs(lat_axis, lon_axis):
     return lat_mesh.flatten(), lon_mesh.flatten()
 
 
+def compact_basin_array(basin_data):
+    """Convert basin data to the compact uint8 basin index format.
+
+    Masked, non-finite or out of range (i.e. not 0-254) values are set to 255.
+
+    """
+
+    values = numpy.ma.filled(numpy.ma.masked_invalid(basin_data), 255)
+    valid = (values >= 0) & (values < 255) & (values == numpy.round(values))
+    compact_data = numpy.where(valid, values, 255).astype(numpy.uint8)
+
+    return compact_data
+
+
 def create_basin_array(cube):
     """Create an ocean basin array.
 
@@ -425,6 +470,28 @@ def fix_label(label):
     return label 
 
 
+def get_basin_indexes(basin_data):
+    """Get the flattened indexes of the grid points in each basin.
+
+    The index lists are found with a single sort of the compact
+      (uint8) basin array and are cached for each basin array.
+
+    Returns:
+      dict: basin value -> numpy.ndarray of (sorted) flattened indexes
+
+    """
+
+    compact_data = compact_basin_array(basin_data).ravel()
+    key = hashlib.sha1(compact_data.tobytes()).hexdigest()
+    if key not in _basin_index_cache:
+        order = numpy.argsort(compact_data, kind='stable')
+        counts = numpy.bincount(compact_data, minlength=256)
+        index_lists = numpy.split(order, numpy.cumsum(counts)[:-1])
+        _basin_index_cache[key] = {basin: index_lists[basin] for basin in numpy.flatnonzero(counts[:255])}
+
+    return _basin_index_cache[key]
+
+
 def get_bounds_list(edges):
     """Create a bounds (i.e. pairs) list from an edge list"""
 
@@ -515,12 +582,10 @@ def mask_marginal_seas(data_cube, basin_cube):
 
     """
 
-    data_cube.data = numpy.ma.asarray(data_cube.data)
-
-    ndim = data_cube.ndim
-    basin_array = broadcast_array(basin_cube.data, [ndim - 2, ndim - 1], data_cube.shape)
-
-    data_cube.data.mask = numpy.where((data_cube.data.mask == False) & (basin_array <= 5), False, True)
+    data = numpy.ma.asarray(data_cube.data)
+    selection = basin_selection(basin_cube.data, range(0, 6))
+    data.mask = numpy.ma.getmaskarray(data) | ~selection
+    data_cube.data = data
 
     return data_cube
 
@@ -546,10 +611,10 @@ def mask_unwanted_seas(data_cube, basin_cube, basins_to_keep):
 
     """
 
-    ndim = data_cube.ndim
-    basin_array = broadcast_array(basin_cube.data, [ndim - 2, ndim - 1], data_cube.shape)
-
-    data_cube.data.mask = numpy.where((data_cube.data.mask == False) & numpy.isin(basin_array, basins_to_keep), False, True)
+    data = numpy.ma.asarray(data_cube.data)
+    selection = basin_selection(basin_cube.data, basins_to_keep)
+    data.mask = numpy.ma.getmaskarray(data) | ~selection
+    data_cube.data = data
 
     return data_cube
 
@@ -10,18 +10,22 @@ Functions:
   check_xarrayDataset       -- Check xarray.Dataset for data format compliance
   combine_files             -- Create an iris cube from multiple input files
   create_outdir             -- Create the output directory if it doesn't exist already
+  get_cache_dir             -- Get the directory for cached files
   get_cmip5_file_details    -- Extract details from a CMIP5 filename
   get_ocean_weights         -- Read the volcello or areacello weights file and sainity check
   get_subset_kwargs         -- Get keyword arguments for xarray subsetting
   get_time_constraint       -- Get the time constraint used for reading an iris cube 
   get_timescale             -- Get the timescale
+  get_time_chunk_size       -- Get the number of time steps that fit within a memory ceiling
   get_timestamp             -- Return a time stamp that includes the command line entry
   iris_vertical_constraint  -- Define vertical constraint for iris cube loading.
+  iterate_time_chunks       -- Iterate over a cube one time chunk at a time
   read_dates                -- Read in a list of dates
   set_dim_atts              -- Set dimension attributes
   set_global_atts           -- Update the global attributes of an xarray.DataArray
   set_outfile_date          -- Take an outfile name and replace existing date with new one
   standard_datetime         -- Convert any arbitrary date/time to standard format: YYYY-MM-DD
+  time_chunked_data         -- Get the lazy data of a cube chunked along the time axis
   two_floats                -- Read floats lile -5e20 from the command line
   update_history_att        -- Update the global history attribute of an xarray.DataArray
   vertical_bounds_text      -- Geneate text describing the vertical bounds of a data selection
@@ -36,6 +40,7 @@ import os, sys, pdb
 import argparse
 import datetime
 import numpy as np
+import dask.array as da
 from dateutil import parser
 from collections import defaultdict
 import re
@@ -149,7 +154,7 @@ def check_evap_sign(cube):
         model = cube.attributes['model_id']
                   
     if model in wrong_sign_models:
-        cube.data = cube.data * -1
+        cube.data = cube.core_data() * -1
 
     return cube
 
@@ -231,7 +236,7 @@ def check_hfds_sign(cube):
         model = cube.attributes['model_id']
                   
     if model in wrong_sign_models:
-        cube.data = cube.data * -1
+        cube.data = cube.core_data() * -1
         print('CHANGING HFDS SIGN')
 
     return cube
@@ -256,7 +261,7 @@ def check_wfo_sign(cube):
         model = cube.attributes['model_id']
                   
     if model in wrong_sign_models:
-        cube.data = cube.data * -1
+        cube.data = cube.core_data() * -1
         print('CHANGING WFO SIGN')
 
     return cube
@@ -378,8 +383,23 @@ def check_depth_coordinate(cube):
     return cube
 
 
+def data_sum(cube):
+    """Sum all the data in a cube (without realising lazy data)."""
+
+    total = cube.core_data().sum()
+    if cube.has_lazy_data():
+        total = total.compute()
+
+    return total
+
+
 def check_data(cube):
-    """Check (and fix if needed) the data in an iris cube."""
+    """Check (and fix if needed) the data in an iris cube.
+
+    Lazy data stays lazy (i.e. the fixes and checks are applied
+      to the underlying dask array).
+
+    """
 
     try:
         model = cube.attributes['source_id']
@@ -387,7 +407,10 @@ def check_data(cube):
         model = cube.attributes['model_id']
 
     if model in ['MRI-ESM2-0']:
-        cube.data = np.ma.masked_invalid(cube.data)
+        if cube.has_lazy_data():
+            cube.data = da.ma.masked_invalid(cube.lazy_data())
+        else:
+            cube.data = np.ma.masked_invalid(cube.data)
 
     if model in ['CNRM-CM6-1', 'CNRM-ESM2-1', 'IPSL-CM6A-LR', 'MIROC-ES2L']:
         cube = name_horiz_coords(cube)
@@ -402,11 +425,11 @@ def check_data(cube):
         cube = check_evap_sign(cube)
 
     if cube.long_name == 'Ocean Grid-Cell Area':
-        global_area = cube.data.sum()
+        global_area = data_sum(cube)
         check_global_ocean_area(global_area)
     
     if cube.standard_name == 'ocean_volume':
-        global_volume = cube.data.sum()
+        global_volume = data_sum(cube)
         check_global_ocean_volume(global_volume)
     
     if cube.standard_name in ['sea_water_salinity', 'sea_surface_salinity']:
@@ -426,7 +449,7 @@ def combine_cubes(cube_list, new_calendar=None, data_checks=False):
     for cube in cube_list:
         cube = clean_coordinate_attributes(cube)
         if cube.dtype != ref_dtype:
-            cube.data = cube.data.astype(ref_dtype)
+            cube.data = cube.core_data().astype(ref_dtype)
         if data_checks:
             cube = check_data(cube)
     cube = cube_list.concatenate_cube()
@@ -439,8 +462,22 @@ def combine_cubes(cube_list, new_calendar=None, data_checks=False):
     return cube
 
 
-def combine_files(files, var, new_calendar=None, checks=False):
-    """Create an iris cube from multiple input files."""
+def combine_files(files, var, new_calendar=None, checks=False, cache=False):
+    """Create an iris cube from multiple input files.
+
+    The data are kept lazy (as dask arrays) through the concatenation,
+      unit fixes and data checks, so they can be streamed with
+      iterate_time_chunks (or time_chunked_data) rather than realised
+      all at once.
+
+    If cache is True the combined cube is saved to (or read from)
+      the result cache (see result_cache.cached_combine_files).
+
+    """
+
+    if cache:
+        import result_cache
+        return result_cache.cached_combine_files(files, var, new_calendar=new_calendar, checks=checks)
 
     files = uconv.single2list(files)
 
@@ -512,6 +549,23 @@ def fix_time_descriptor(time_unit_text):
     return time_unit_text
 
 
+def get_cache_dir(subdir=None):
+    """Get the directory for cached files (created if it doesn't exist already).
+
+    The location can be set with the OCEAN_ANALYSIS_CACHE environment
+      variable (default ~/.cache/ocean-analysis).
+
+    """
+
+    default_dir = os.path.join(os.path.expanduser('~'), '.cache', 'ocean-analysis')
+    cache_dir = os.environ.get('OCEAN_ANALYSIS_CACHE', default_dir)
+    if subdir:
+        cache_dir = os.path.join(cache_dir, subdir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    return cache_dir
+
+
 def get_cmip5_file_details(cube):
     """Extract model, experiment and run information from CMIP5 file attributes.
 
@@ -556,9 +610,9 @@ def get_ocean_weights(infile):
 
     assert cube.var_name in ['areacello', 'volcello']
     if cube.var_name == 'volcello':
-        check_global_ocean_volume(cube.data.sum())
+        check_global_ocean_volume(data_sum(cube))
     else:
-        check_global_ocean_area(cube.data.sum())
+        check_global_ocean_area(data_sum(cube))
 
     return cube 
 
@@ -656,6 +710,20 @@ def get_timescale(times):
     return timescale
 
 
+def get_time_chunk_size(cube, max_memory=1e9):
+    """Get the number of time steps that fit within a memory ceiling.
+
+    Args:
+      cube (iris.cube.Cube): Cube with time as the first axis
+      max_memory (float): Memory ceiling (bytes) for the data in each chunk
+
+    """
+
+    step_bytes = np.prod(cube.shape[1:]) * cube.dtype.itemsize
+
+    return max(1, int(max_memory // step_bytes))
+
+
 def get_timestamp():
     """Return a time stamp that includes the command line entry."""
     
@@ -685,6 +753,34 @@ def iris_vertical_constraint(min_depth, max_depth):
     return level_constraint
 
 
+def iterate_time_chunks(cube, chunk_size=None, max_memory=1e9):
+    """Iterate over a cube one time chunk at a time.
+
+    Yields the start index and the cube for each chunk, with the
+      chunk data realised. When the input cube has lazy data
+      (e.g. from combine_files) only one chunk is in memory at a time.
+
+    Args:
+      cube (iris.cube.Cube): Cube with time as the first axis
+      chunk_size (int): Number of time steps in each chunk
+        (defaults to the number that fit within max_memory)
+      max_memory (float): Memory ceiling (bytes) for the data in each chunk
+
+    """
+
+    coord_names = [coord.name() for coord in cube.dim_coords]
+    assert coord_names[0] == 'time'
+
+    if not chunk_size:
+        chunk_size = get_time_chunk_size(cube, max_memory=max_memory)
+
+    ntimes = cube.shape[0]
+    for start in range(0, ntimes, chunk_size):
+        chunk_cube = cube[start:start + chunk_size, ...]
+        chunk_cube.data
+        yield start, chunk_cube
+
+
 def read_dates(infile):
     """Read a file of dates (one per line) and write to a list.
 
@@ -725,7 +821,7 @@ def salinity_unit_check(cube, valid_min=-15, valid_max=160, abort=True):
     """
 
     if cube.units == '1' and cube[0, ::].data.mean() < 1.0:
-        cube.data = cube.data * 1000
+        cube.data = cube.core_data() * 1000
 
     data_max = cube[0, ::].data.max()
     data_min = cube[0, ::].data.min()
@@ -888,6 +984,27 @@ def temperature_unit_check(cube, output_unit, abort=True):
     return cube
 
 
+def time_chunked_data(cube, chunk_size=None, max_memory=1e9):
+    """Get the lazy data of a cube chunked along the time axis.
+
+    Calculations on the result (e.g. with dask.array.map_blocks)
+      are streamed one time chunk at a time when they are computed
+      or saved, so only a few chunks are in memory at once.
+
+    Args:
+      cube (iris.cube.Cube): Cube with time as the first axis
+      chunk_size (int): Number of time steps in each chunk
+        (defaults to the number that fit within max_memory)
+      max_memory (float): Memory ceiling (bytes) for the data in each chunk
+
+    """
+
+    if not chunk_size:
+        chunk_size = get_time_chunk_size(cube, max_memory=max_memory)
+
+    return cube.lazy_data().rechunk((chunk_size,) + cube.shape[1:])
+
+
 def two_floats(value):
     """Read floats lile -5e20 from the command line.
 
@@ -5,14 +5,18 @@ Functions:
                                  grid if necessary
   make_grid                   -- Make a dummy cube with desired grid
   get_grid_spacing            -- Return an array of grid spacings
+  get_horizontal_band_matrix  -- Get the sparse matrix assigning grid cells to horizontal bands
+  get_regrid_weights          -- Get the sparse curvilinear to rectilinear regridding weights
   regrid_1D                   -- Regrid data with only one spatial dimension
 
 """
 
 import pdb, os, sys
+import hashlib
 import numpy
+import scipy.sparse
+import dask.array as da
 import iris
-from iris.experimental.regrid import regrid_weighted_curvilinear_to_rectilinear
 
 cwd = os.getcwd()
 repo_dir = '/'
@@ -25,10 +29,15 @@ modules_dir = os.path.join(repo_dir, 'modules')
 sys.path.append(modules_dir)
 try:
     import convenient_universal as uconv
+    import general_io as gio
 except ImportError:
     raise ImportError('Must run this script from anywhere within the ocean-analysis git repo')
 
 
+_band_matrix_cache = {}
+_regrid_weights_cache = {}
+
+
 def _check_coord_names(cube, coord_names):
     """Remove specified coordinate name.
 
@@ -114,14 +123,152 @@ def get_grid_res(horiz_shape):
     return new_res
 
 
-def curvilinear_to_rectilinear(cube, weights=None, target_grid_cube=None, grid_res=2.5):
+def _regrid_indices(edges, points):
+    """Find the index of the target cell containing each source point.
+
+    Points outside the target grid are given an index of -1.
+
+    """
+
+    ncells = len(edges) - 1
+    if edges[-1] > edges[0]:
+        indices = numpy.searchsorted(edges, points, side='right') - 1
+    else:
+        indices = ncells - numpy.searchsorted(edges[::-1], points, side='left')
+    indices = numpy.where((indices >= 0) & (indices < ncells), indices, -1)
+
+    return indices
+
+
+def get_regrid_weights(src_lats, src_lons, target_grid_cube, weights=None, cache_dir=None):
+    """Get the sparse curvilinear to rectilinear regridding weights.
+
+    Each source point is assigned to the target cell that contains it
+      (as per iris regrid_weighted_curvilinear_to_rectilinear).
+      The weights are cached (in memory and on disk) for each
+      source grid, target grid and weights combination.
+
+    Args:
+      src_lats (numpy.ndarray): Source latitude auxillary coordinate values
+      src_lons (numpy.ndarray): Source longitude auxillary coordinate values
+      target_grid_cube (iris.cube.Cube): Cube on target grid
+      weights (numpy.ndarray, optional): Source weights (e.g. cell area)
+      cache_dir (str, optional): Directory for the on-disk cache
+
+    Returns:
+      scipy.sparse.csr_matrix of shape (target size, source size)
+
+    """
+
+    for coord_name in ['latitude', 'longitude']:
+        if not target_grid_cube.coord(coord_name).has_bounds():
+            target_grid_cube.coord(coord_name).guess_bounds()
+    lat_edges = target_grid_cube.coord('latitude').contiguous_bounds()
+    lon_edges = target_grid_cube.coord('longitude').contiguous_bounds()
+
+    src_lats = numpy.ascontiguousarray(src_lats, dtype=numpy.float64).flatten()
+    src_lons = numpy.ascontiguousarray(src_lons, dtype=numpy.float64).flatten()
+    if weights is None:
+        weights = numpy.ones(src_lats.shape)
+    weights = numpy.ascontiguousarray(numpy.ma.filled(weights, 0), dtype=numpy.float64).flatten()
+    assert weights.shape == src_lats.shape
+
+    key_arrays = [src_lats, src_lons, weights, lat_edges.astype(numpy.float64), lon_edges.astype(numpy.float64)]
+    key = hashlib.sha1(b''.join([array.tobytes() for array in key_arrays])).hexdigest()
+
+    if key in _regrid_weights_cache:
+        return _regrid_weights_cache[key]
+
+    cache_file = os.path.join(cache_dir, 'regrid-weights_%s.npz' %(key)) if cache_dir else None
+    if cache_file and os.path.isfile(cache_file):
+        regrid_weights = scipy.sparse.load_npz(cache_file).tocsr()
+    else:
+        min_lon = lon_edges.min()
+        wrapped_lons = ((src_lons - min_lon) % 360) + min_lon
+        x_indexes = _regrid_indices(lon_edges, wrapped_lons)
+        y_indexes = _regrid_indices(lat_edges, src_lats)
+        nx = len(lon_edges) - 1
+        ny = len(lat_edges) - 1
+
+        valid = (x_indexes >= 0) & (y_indexes >= 0) & (weights != 0)
+        rows = y_indexes[valid] * nx + x_indexes[valid]
+        columns = numpy.flatnonzero(valid)
+        shape = (ny * nx, src_lats.size)
+        regrid_weights = scipy.sparse.csr_matrix((weights[valid], (rows, columns)), shape=shape)
+
+        if cache_file:
+            tmp_file = cache_file.replace('.npz', '.%i.tmp.npz' %(os.getpid()))
+            scipy.sparse.save_npz(tmp_file, regrid_weights)
+            os.replace(tmp_file, cache_file)
+
+    _regrid_weights_cache[key] = regrid_weights
+
+    return regrid_weights
+
+
+def _apply_regrid_weights(data, regrid_weights, max_elements=5e7):
+    """Regrid each horizontal slice of the data (horizontal dimensions last)."""
+
+    ntarget, npoints = regrid_weights.shape
+    flat_data = numpy.ma.asarray(data).reshape(-1, npoints)
+    nslices = flat_data.shape[0]
+
+    totals = numpy.zeros([nslices, ntarget])
+    sum_weights = numpy.zeros([nslices, ntarget])
+    step = max(1, int(max_elements // npoints))
+    for start in range(0, nslices, step):
+        stop = min(start + step, nslices)
+        valid = ~numpy.ma.getmaskarray(flat_data[start:stop, :])
+        values = numpy.where(valid, numpy.ma.getdata(flat_data[start:stop, :]), 0.0)
+        totals[start:stop, :] = regrid_weights.dot(values.T).T
+        sum_weights[start:stop, :] = regrid_weights.dot(valid.T.astype(numpy.float64)).T
+
+    empty = sum_weights == 0
+    sum_weights[empty] = 1.0
+    new_data = numpy.ma.masked_array(totals / sum_weights, mask=empty)
+
+    return new_data
+
+
+def _regrid_core_data(core_data, regrid_weights, target_horiz_shape, dtype):
+    """Regrid real or lazy data (horizontal dimensions last).
+
+    Lazy data stay lazy: the weights are applied to one block of
+      leading (e.g. time) dimension slices at a time, with the
+      horizontal dimensions rechunked so each block holds whole slices.
+
+    """
+
+    def regrid_block(block):
+        new_block = _apply_regrid_weights(block, regrid_weights)
+        return new_block.reshape(block.shape[:-2] + target_horiz_shape).astype(dtype)
+
+    if not isinstance(core_data, da.Array):
+        return regrid_block(core_data)
+
+    ndim = core_data.ndim
+    core_data = core_data.rechunk({ndim - 2: -1, ndim - 1: -1})
+    new_chunks = core_data.chunks[:-2] + ((target_horiz_shape[0],), (target_horiz_shape[1],))
+    meta = numpy.ma.masked_array(numpy.zeros((0,) * ndim, dtype=dtype))
+
+    return core_data.map_blocks(regrid_block, chunks=new_chunks, dtype=dtype, meta=meta)
+
+
+def curvilinear_to_rectilinear(cube, weights=None, target_grid_cube=None, grid_res=2.5,
+                               cache_dir='default'):
     """Regrid curvilinear data to a rectilinear grid if necessary.
 
+    The regridding weights are calculated once (see get_regrid_weights)
+      and applied to blocks of time and depth slices (lazily if the data
+      are lazy, so the regridded data can be streamed to disk).
+
     Args:
       cube (iris.Cube.cube) - Cube to regrid
       weights (numpy.ndarray) - Area cube for area weighted mean
       target_grid_cube (iris.Cube.cube) - Cube on target grid
       grid_res (float) - Uniform grid resolution for if no target supplied
+      cache_dir (str) - Directory for cached regridding weights
+        (default is gio.get_cache_dir('regrid'), None for no on-disk cache) 
       
     """
 
@@ -141,24 +288,49 @@ def curvilinear_to_rectilinear(cube, weights=None, target_grid_cube=None, grid_r
             lons = numpy.arange(0, 360, grid_res)
             target_grid_cube = make_grid(lats, lons)
 
-        # Interate over slices (experimental regridder only works on 2D slices)
         cube, coord_names = _check_coord_names(cube, coord_names)
-        slice_dims = coord_names
-
-        if 'time' in slice_dims:
-            slice_dims.remove('time')
-        if 'depth' in slice_dims:
-            slice_dims.remove('depth')
-    
-        cube_list = []
-        for i, cube_slice in enumerate(cube.slices(slice_dims)):
-            cube_slice.coord(axis='x').coord_system = iris.coord_systems.GeogCS(iris.fileformats.pp.EARTH_RADIUS)
-            cube_slice.coord(axis='y').coord_system = iris.coord_systems.GeogCS(iris.fileformats.pp.EARTH_RADIUS)
-            regridded_cube = regrid_weighted_curvilinear_to_rectilinear(cube_slice, weights, target_grid_cube)
-            cube_list.append(regridded_cube)
-
-        new_cube = iris.cube.CubeList(cube_list)
-        new_cube = new_cube.merge_cube()
+        horiz_dims = cube.coord_dims('latitude')
+        assert horiz_dims == (cube.ndim - 2, cube.ndim - 1)
+
+        if cache_dir == 'default':
+            cache_dir = gio.get_cache_dir('regrid')
+        regrid_weights = get_regrid_weights(cube.coord('latitude').points,
+                                            cube.coord('longitude').points,
+                                            target_grid_cube, weights=weights,
+                                            cache_dir=cache_dir)
+
+        target_lat = target_grid_cube.coord('latitude').copy()
+        target_lon = target_grid_cube.coord('longitude').copy()
+        for coord in [target_lat, target_lon]:
+            coord.coord_system = iris.coord_systems.GeogCS(iris.fileformats.pp.EARTH_RADIUS)
+        target_horiz_shape = (len(target_lat.points), len(target_lon.points))
+        new_dtype = cube.dtype if cube.dtype.kind == 'f' else numpy.float64
+
+        new_data = _regrid_core_data(cube.core_data(), regrid_weights, target_horiz_shape, new_dtype)
+
+        dim_coords_and_dims = []
+        for coord in cube.dim_coords:
+            dim = cube.coord_dims(coord)[0]
+            if dim not in horiz_dims:
+                dim_coords_and_dims.append((coord.copy(), dim))
+        dim_coords_and_dims.append((target_lat, cube.ndim - 2))
+        dim_coords_and_dims.append((target_lon, cube.ndim - 1))
+
+        aux_coords_and_dims = []
+        for coord in cube.aux_coords:
+            dims = cube.coord_dims(coord)
+            if not set(dims).intersection(horiz_dims):
+                aux_coords_and_dims.append((coord.copy(), dims))
+
+        new_cube = iris.cube.Cube(new_data,
+                                  standard_name=cube.standard_name,
+                                  long_name=cube.long_name,
+                                  var_name=cube.var_name,
+                                  units=cube.units,
+                                  attributes=cube.attributes,
+                                  cell_methods=cube.cell_methods,
+                                  dim_coords_and_dims=dim_coords_and_dims,
+                                  aux_coords_and_dims=aux_coords_and_dims)
         coord_names = [coord.name() for coord in new_cube.dim_coords]
 
         regrid_status = True
@@ -185,6 +357,43 @@ def _create_region_mask(horiz_array, target_shape, horiz_bounds):
     return mask
 
 
+def get_horizontal_band_matrix(horiz_array, horiz_bounds):
+    """Get the sparse matrix assigning grid cells to horizontal bands.
+
+    A cell belongs to a band if lower_bound <= value < upper_bound
+      (as per extract_horizontal_region_curvilinear). Matrices are cached
+      so they can be reused across files and variables on the same grid.
+
+    Args:
+      horiz_array (numpy.ndarray): Horizontal (i.e. latitude or longitude)
+        auxillary coordinate values
+      horiz_bounds (numpy.ndarray): Bounds of each band, shape (nbands, 2)
+
+    Returns:
+      scipy.sparse.csr_matrix of shape (nbands, horiz_array.size)
+
+    """
+
+    horiz_array = numpy.ascontiguousarray(horiz_array, dtype=numpy.float64).flatten()
+    horiz_bounds = numpy.ascontiguousarray(horiz_bounds, dtype=numpy.float64)
+    key = hashlib.sha1(horiz_array.tobytes() + horiz_bounds.tobytes()).hexdigest()
+
+    if key not in _band_matrix_cache:
+        rows = []
+        columns = []
+        for band_index, (lower_bound, upper_bound) in enumerate(horiz_bounds):
+            band_columns = numpy.flatnonzero((horiz_array >= lower_bound) & (horiz_array < upper_bound))
+            rows.append(numpy.full(band_columns.size, band_index))
+            columns.append(band_columns)
+        rows = numpy.concatenate(rows)
+        columns = numpy.concatenate(columns)
+        values = numpy.ones(rows.size)
+        shape = (len(horiz_bounds), horiz_array.size)
+        _band_matrix_cache[key] = scipy.sparse.csr_matrix((values, (rows, columns)), shape=shape)
+
+    return _band_matrix_cache[key]
+
+
 def extract_horizontal_region_curvilinear(cube, keep_coord, horiz_bounds):
     """Extract region (defined by lat or lon bounds) of interest from a curvilinear grid.
 
@@ -5,6 +5,7 @@ Code for kernel density estimation.
 """
 
 import numpy as np
+from scipy.signal import fftconvolve
 from scipy.spatial.distance import cdist
 
 class gaussian_kde(object):
@@ -58,6 +59,8 @@ class gaussian_kde(object):
         Evaluate the estimated pdf on a provided set of points.
     kde(points) : ndarray
         Same as kde.evaluate(points)
+    kde.evaluate_grid(edges, method='binned') : ndarray
+        Evaluate the estimated pdf at the centres of a grid of bins.
     kde.pdf(points) : ndarray
         Alias for ``kde.evaluate(points)``.
     kde.set_bandwidth(bw_method='scott') : None
@@ -160,14 +163,19 @@ class gaussian_kde(object):
 
         self.set_bandwidth(bw_method=bw_method)
 
-    def evaluate(self, points):
+    def evaluate(self, points, max_elements=5e7):
         """Evaluate the estimated pdf on a set of points.
 
+        The distances between the points and the dataset are calculated in
+        chunks so that no more than `max_elements` are held in memory at once.
+
         Parameters
         ----------
         points : (# of dimensions, # of points)-array
             Alternatively, a (# of dimensions,) vector can be passed in and
             treated as a single point.
+        max_elements : float, optional
+            Maximum number of (point, datapoint) distances calculated at once.
 
         Returns
         -------
@@ -193,12 +201,96 @@ class gaussian_kde(object):
                     self.d)
                 raise ValueError(msg)
 
-        # compute the normalised residuals
-        chi2 = cdist(points.T, self.dataset.T, 'mahalanobis', VI=self.inv_cov) ** 2
-        # compute the pdf
-        result = np.sum(np.exp(-.5 * chi2) * self.weights, axis=1) / self._norm_factor
+        data_step = int(min(self.n, max(max_elements, 1)))
+        point_step = max(1, int(max_elements // data_step))
+        result = np.zeros(m)
+        for point_start in range(0, m, point_step):
+            point_chunk = points[:, point_start:point_start + point_step].T
+            for data_start in range(0, self.n, data_step):
+                data_chunk = self.dataset[:, data_start:data_start + data_step].T
+                weights_chunk = self.weights[data_start:data_start + data_step]
+                # compute the normalised residuals
+                chi2 = cdist(point_chunk, data_chunk, 'mahalanobis', VI=self.inv_cov) ** 2
+                # compute the pdf
+                result[point_start:point_start + point_step] += np.sum(np.exp(-.5 * chi2) * weights_chunk, axis=1)
+
+        return result / self._norm_factor
+
+    def evaluate_grid(self, edges, method='binned', cutoff=4, max_elements=5e7):
+        """Evaluate the estimated pdf at the centres of a grid of bins.
+
+        With the binned method the weighted dataset is first binned onto the
+        grid (extended by `cutoff` kernel standard deviations on each side,
+        so that nearby datapoints outside the grid still contribute) and the
+        result is convolved with the Gaussian kernel using an FFT. The cost is
+        then independent of the number of datapoints, at the expense of
+        moving each datapoint to the centre of its bin. Datapoints beyond the
+        extended grid are ignored.
+
+        Parameters
+        ----------
+        edges : sequence of d 1-D arrays
+            Bin edges for each dimension (e.g. the temperature and salinity
+            bin edges used for water mass binning). For the binned method
+            the edges must be regularly spaced.
+        method : str, optional
+            'binned' (default) or 'exact' (i.e. `kde.evaluate` at every bin centre)
+        cutoff : float, optional
+            Number of kernel standard deviations beyond which the kernel is
+            truncated (binned method only).
+        max_elements : float, optional
+            Passed to `kde.evaluate` (exact method only).
+
+        Returns
+        -------
+        values : ndarray, shape (len(edges[0]) - 1, len(edges[1]) - 1, ...)
+            The values at each bin centre.
+
+        Raises
+        ------
+        ValueError : if the number of dimensions or (for the binned method)
+                     the spacing of the edges is invalid.
 
-        return result
+        """
+        if len(edges) != self.d:
+            msg = "edges have dimension %s, dataset has dimension %s" % (len(edges),
+                self.d)
+            raise ValueError(msg)
+        edges = [np.asarray(dim_edges, dtype=float) for dim_edges in edges]
+        centres = [(dim_edges[1:] + dim_edges[:-1]) / 2 for dim_edges in edges]
+        grid_shape = tuple([len(dim_centres) for dim_centres in centres])
+
+        if method == 'exact':
+            grid = np.meshgrid(*centres, indexing='ij')
+            points = np.vstack([dim_grid.ravel() for dim_grid in grid])
+            return self.evaluate(points, max_elements=max_elements).reshape(grid_shape)
+        elif method != 'binned':
+            raise ValueError("`method` should be 'binned' or 'exact'.")
+
+        spacing = np.array([np.diff(dim_edges).mean() for dim_edges in edges])
+        for dim_edges, dim_spacing in zip(edges, spacing):
+            if not np.allclose(np.diff(dim_edges), dim_spacing):
+                raise ValueError("edges must be regularly spaced for the binned method.")
+
+        # number of bins covered by the kernel on either side of each bin
+        sigma = np.sqrt(np.diag(self.covariance))
+        half_widths = np.ceil(cutoff * sigma / spacing).astype(int)
+
+        extended_edges = [np.arange(-width, len(dim_edges) + width) * dim_spacing + dim_edges[0]
+                          for dim_edges, dim_spacing, width in zip(edges, spacing, half_widths)]
+        binned_weights, _ = np.histogramdd(self.dataset.T, bins=extended_edges, weights=self.weights)
+
+        offsets = [np.arange(-width, width + 1) * dim_spacing for dim_spacing, width in zip(spacing, half_widths)]
+        offset_grid = np.meshgrid(*offsets, indexing='ij')
+        offset_points = np.vstack([dim_grid.ravel() for dim_grid in offset_grid])
+        chi2 = np.sum(offset_points * np.dot(self.inv_cov, offset_points), axis=0)
+        kernel = np.exp(-.5 * chi2).reshape(offset_grid[0].shape)
+
+        result = fftconvolve(binned_weights, kernel, mode='valid')
+        result = np.clip(result, 0, None)  # FFT round-off can give tiny negative values
+        assert result.shape == grid_shape
+
+        return result / self._norm_factor
 
     __call__ = evaluate
 
@@ -259,7 +351,7 @@ class gaussian_kde(object):
             self.covariance_factor = self.scotts_factor
         elif bw_method == 'silverman':
             self.covariance_factor = self.silverman_factor
-        elif np.isscalar(bw_method) and not isinstance(bw_method, string_types):
+        elif np.isscalar(bw_method) and not isinstance(bw_method, str):
             self._bw_method = 'use constant'
             self.covariance_factor = lambda: bw_method
         elif callable(bw_method):
@@ -0,0 +1,319 @@
+"""On-disk cache of data processing results, keyed by input provenance.
+
+A cache entry is identified by a hash of the script (and module) source
+code, the package versions, the command line arguments and a fingerprint
+of each input file (its tracking_id and history attributes, or a checksum
+of its contents if it has no tracking_id). Moving, copying or touching an
+input file therefore doesn't invalidate the cache, but changing its
+contents does.
+
+Functions:
+  cache_key             -- Hash of the code, arguments and input files for a script run
+  cached_combine_files  -- general_io.combine_files with the combined cube cached on disk
+  file_fingerprint      -- Fingerprint of an input file that is independent of its path
+  list_entries          -- Metadata for each entry in the cache
+  prune_cache           -- Delete least recently used entries until the cache fits within a size limit
+  remove_entry          -- Delete an entry from the cache
+  run_cached            -- Run a script main function (or copy its output from the cache)
+
+"""
+
+# Import general Python modules
+
+import sys, os, pdb
+import glob
+import hashlib
+import json
+import shutil
+import tempfile
+import numpy
+import iris
+import xarray as xr
+
+# Import my modules
+
+cwd = os.getcwd()
+repo_dir = '/'
+for directory in cwd.split('/')[1:]:
+    repo_dir = os.path.join(repo_dir, directory)
+    if directory == 'ocean-analysis':
+        break
+
+modules_dir = os.path.join(repo_dir, 'modules')
+sys.path.append(modules_dir)
+
+try:
+    import general_io as gio
+except ImportError:
+    raise ImportError('Must run this script from anywhere within the ocean-analysis git repo')
+
+# Define functions
+
+max_cache_bytes = 50e9
+ignored_args = ['outfile', 'result_cache']
+_checksum_file = 'checksums.json'
+
+
+def _sha1_file(infile, block_size=2**24):
+    """Checksum of the contents of a file."""
+
+    sha1 = hashlib.sha1()
+    with open(infile, 'rb') as reader:
+        for block in iter(lambda: reader.read(block_size), b''):
+            sha1.update(block)
+
+    return sha1.hexdigest()
+
+
+def _write_json(data, outfile):
+    """Write a json file atomically (so concurrent runs never see a partial file)."""
+
+    tmp_fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(outfile), suffix='.tmp')
+    with os.fdopen(tmp_fd, 'w') as writer:
+        json.dump(data, writer, indent=1, default=str)
+    os.replace(tmp_file, outfile)
+
+
+def _read_json(infile):
+    """Read a json file (empty dict if it doesn't exist or is unreadable)."""
+
+    try:
+        with open(infile, 'r') as reader:
+            return json.load(reader)
+    except (OSError, ValueError):
+        return {}
+
+
+def file_fingerprint(infile, cache_dir=None):
+    """Fingerprint of an input file that is independent of its path.
+
+    CMIP files are identified by their tracking_id and history attributes
+      (the history distinguishes files processed by this repo, which
+      inherit the tracking_id of their input files). Other files are
+      identified by a checksum of their contents, which is remembered
+      (for a given path, size and modification time) so it only has to be
+      calculated once.
+
+    """
+
+    try:
+        with xr.open_dataset(infile, decode_cf=False) as dset:
+            tracking_id = dset.attrs.get('tracking_id')
+            history = dset.attrs.get('history', '')
+    except Exception:
+        tracking_id = None
+
+    if tracking_id:
+        fingerprint = hashlib.sha1((tracking_id + history).encode()).hexdigest()
+        return 'tracking_id:' + fingerprint
+
+    if cache_dir is None:
+        cache_dir = gio.get_cache_dir('results')
+    checksum_file = os.path.join(cache_dir, _checksum_file)
+    stat = os.stat(infile)
+    memo_key = '%s|%i|%f' %(os.path.realpath(infile), stat.st_size, stat.st_mtime)
+    checksums = _read_json(checksum_file)
+    if memo_key not in checksums:
+        checksums[memo_key] = _sha1_file(infile)
+        _write_json(checksums, checksum_file)
+
+    return 'sha1:' + checksums[memo_key]
+
+
+def _code_version(script_file):
+    """Hash of the script and module source code and key package versions."""
+
+    sha1 = hashlib.sha1()
+    source_files = [os.path.abspath(script_file)] + sorted(glob.glob(os.path.join(modules_dir, '*.py')))
+    for source_file in source_files:
+        with open(source_file, 'rb') as reader:
+            sha1.update(reader.read())
+    for package in [numpy, iris, xr]:
+        sha1.update(package.__version__.encode())
+
+    return sha1.hexdigest()
+
+
+def _fingerprint_arg(value, cache_dir):
+    """Replace any input file paths in an argument value with their fingerprint."""
+
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint_arg(item, cache_dir) for item in value]
+    elif isinstance(value, str) and os.path.isfile(value):
+        return file_fingerprint(value, cache_dir=cache_dir)
+    else:
+        return value
+
+
+def cache_key(script_file, inargs, cache_dir=None):
+    """Hash of the code, arguments and input files for a script run.
+
+    Args:
+      script_file (str): The script (i.e. __file__)
+      inargs (argparse.Namespace): Command line arguments.
+        Any argument that is the path of an existing file is treated as an input file.
+      cache_dir (str): Cache directory (for the input file checksums)
+
+    Returns:
+      key (str), description (dict)
+
+    """
+
+    args = {name: _fingerprint_arg(value, cache_dir) for name, value in sorted(vars(inargs).items())
+            if name not in ignored_args}
+    description = {'script': os.path.basename(script_file),
+                   'code_version': _code_version(script_file),
+                   'args': args}
+    key = hashlib.sha1(json.dumps(description, sort_keys=True, default=str).encode()).hexdigest()
+
+    return key, description
+
+
+def _store(cache_dir, key, outfile, description):
+    """Copy a file into the cache."""
+
+    tmp_fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    os.close(tmp_fd)
+    try:
+        shutil.copyfile(outfile, tmp_file)
+        os.replace(tmp_file, os.path.join(cache_dir, key + '.nc'))
+    except BaseException:
+        os.remove(tmp_file)
+        raise
+    _write_json(description, os.path.join(cache_dir, key + '.json'))
+
+
+def _lookup(cache_dir, key):
+    """Find a cache entry (and mark it as recently used)."""
+
+    cache_file = os.path.join(cache_dir, key + '.nc')
+    if not os.path.isfile(cache_file):
+        return None
+    os.utime(cache_file)
+
+    return cache_file
+
+
+def run_cached(main_func, inargs, script_file, cache_dir=None, max_bytes=None):
+    """Run a script main function (or copy its output from the cache).
+
+    If an identical run (same code, arguments and input files) is already
+      in the cache, its output is copied to inargs.outfile. Otherwise
+      main_func is run and its output is added to the cache.
+
+    Args:
+      main_func (function): Script main function (writes inargs.outfile)
+      inargs (argparse.Namespace): Command line arguments
+      script_file (str): The script (i.e. __file__)
+      cache_dir (str): Cache directory (default is gio.get_cache_dir('results'))
+      max_bytes (float): Maximum cache size (default is max_cache_bytes)
+
+    """
+
+    if cache_dir is None:
+        cache_dir = gio.get_cache_dir('results')
+    key, description = cache_key(script_file, inargs, cache_dir=cache_dir)
+
+    cache_file = _lookup(cache_dir, key)
+    if cache_file:
+        print('Copying cached result:', cache_file)
+        shutil.copyfile(cache_file, inargs.outfile)
+    else:
+        main_func(inargs)
+        description['outfile'] = os.path.abspath(inargs.outfile)
+        _store(cache_dir, key, inargs.outfile, description)
+        prune_cache(cache_dir, max_bytes=max_bytes)
+
+
+def cached_combine_files(files, var, new_calendar=None, checks=False, cache_dir=None, max_bytes=None):
+    """general_io.combine_files with the combined cube cached on disk.
+
+    Returns:
+      cube (iris.cube.Cube), history (list)
+
+    """
+
+    if cache_dir is None:
+        cache_dir = gio.get_cache_dir('results')
+    files = sorted(gio.uconv.single2list(files))
+    description = {'function': 'combine_files',
+                   'code_version': _code_version(gio.__file__),
+                   'args': {'files': [file_fingerprint(infile, cache_dir=cache_dir) for infile in files],
+                            'var': var, 'new_calendar': new_calendar, 'checks': checks}}
+    key = hashlib.sha1(json.dumps(description, sort_keys=True, default=str).encode()).hexdigest()
+
+    cache_file = _lookup(cache_dir, key)
+    if cache_file:
+        history = _read_json(os.path.join(cache_dir, key + '.json')).get('history', [])
+    else:
+        cube, history = gio.combine_files(files, var, new_calendar=new_calendar, checks=checks)
+        tmp_fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp.nc')
+        os.close(tmp_fd)
+        try:
+            iris.save(cube, tmp_file, saver='nc', netcdf_format='NETCDF4')
+            cache_file = os.path.join(cache_dir, key + '.nc')
+            os.replace(tmp_file, cache_file)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+        description['history'] = list(history)
+        _write_json(description, os.path.join(cache_dir, key + '.json'))
+        prune_cache(cache_dir, max_bytes=max_bytes)
+
+    cube = iris.load_cube(cache_file)
+
+    return cube, history
+
+
+def list_entries(cache_dir=None):
+    """Metadata for each entry in the cache (most recently used first).
+
+    Returns:
+      list of dicts with key, size (bytes), last_used (timestamp) and
+        the entry description (script or function and arguments)
+
+    """
+
+    if cache_dir is None:
+        cache_dir = gio.get_cache_dir('results')
+    entries = []
+    for cache_file in glob.glob(os.path.join(cache_dir, '*.nc')):
+        if cache_file.endswith('.tmp.nc'):
+            continue  # another process is still writing this entry
+        key = os.path.basename(cache_file)[:-3]
+        entry = _read_json(os.path.join(cache_dir, key + '.json'))
+        entry['key'] = key
+        try:
+            entry['size'] = os.path.getsize(cache_file)
+            entry['last_used'] = os.path.getmtime(cache_file)
+        except FileNotFoundError:
+            continue  # removed by another process
+        entries.append(entry)
+    entries.sort(key=lambda entry: entry['last_used'], reverse=True)
+
+    return entries
+
+
+def remove_entry(key, cache_dir=None):
+    """Delete an entry from the cache."""
+
+    if cache_dir is None:
+        cache_dir = gio.get_cache_dir('results')
+    for suffix in ['.nc', '.json']:
+        try:
+            os.remove(os.path.join(cache_dir, key + suffix))
+        except FileNotFoundError:
+            pass
+
+
+def prune_cache(cache_dir=None, max_bytes=None):
+    """Delete least recently used entries until the cache fits within max_bytes."""
+
+    if max_bytes is None:
+        max_bytes = max_cache_bytes
+    entries = list_entries(cache_dir)
+    total_bytes = sum([entry['size'] for entry in entries])
+    while entries and (total_bytes > max_bytes):
+        oldest_entry = entries.pop(-1)
+        total_bytes = total_bytes - oldest_entry['size']
+        remove_entry(oldest_entry['key'], cache_dir=cache_dir)
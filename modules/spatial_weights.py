@@ -9,7 +9,10 @@ Description:  Functions for calculating spatial weights
 
 import sys, os, pdb
 import argparse, math
+import hashlib
+import collections
 import numpy
+import dask.array as da
 import iris
 from iris.analysis.cartography import cosine_latitude_weights
 import gsw
@@ -36,16 +39,234 @@ except ImportError:
 
 # Define functions
 
+_grid_metric_cache = collections.OrderedDict()
+max_memory_cache_items = 32
+max_disk_cache_bytes = 2e9
+
+
+def grid_hash(metric_name, coords):
+    """Get a hash of the coordinates (points, bounds, units and coordinate system) that define a grid metric."""
+
+    hasher = hashlib.sha1(metric_name.encode())
+    for coord in coords:
+        hasher.update(coord.name().encode())
+        hasher.update(str(coord.units).encode())
+        hasher.update(str(coord.coord_system).encode())
+        hasher.update(numpy.ascontiguousarray(coord.points, dtype=numpy.float64).tobytes())
+        if coord.has_bounds():
+            hasher.update(numpy.ascontiguousarray(coord.bounds, dtype=numpy.float64).tobytes())
+
+    return hasher.hexdigest()
+
+
+def prune_grid_metric_cache(cache_dir, max_bytes=None):
+    """Delete the least recently used grid metric files until the cache fits within max_bytes."""
+
+    if max_bytes is None:
+        max_bytes = max_disk_cache_bytes
+    cache_files = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith('.npy') or name.endswith('.tmp.npy'):
+            continue  # not a cache entry, or another process is still writing it
+        try:
+            stat = os.stat(os.path.join(cache_dir, name))
+        except FileNotFoundError:
+            continue  # removed by another process
+        cache_files.append((stat.st_mtime, stat.st_size, os.path.join(cache_dir, name)))
+    cache_files.sort()
+    total_bytes = sum([size for mtime, size, cache_file in cache_files])
+    while cache_files and (total_bytes > max_bytes):
+        mtime, size, oldest_file = cache_files.pop(0)
+        total_bytes = total_bytes - size
+        try:
+            os.remove(oldest_file)
+        except FileNotFoundError:
+            pass
+
+
+def cached_grid_metric(metric_name, coords, calc_func, cache_dir='default'):
+    """Memoise a grid metric (e.g. cell area) calculation.
+
+    Metrics are kept in a process-level cache and an on-disk cache
+      (least recently used entries are evicted from both), keyed by
+      a hash of the coordinates that define the grid.
+
+    Args:
+      metric_name (str)
+      coords (list): iris coordinates that define the metric
+      calc_func (function): Calculates the metric (no arguments)
+      cache_dir (str): Directory for the on-disk cache
+        (default is gio.get_cache_dir('grid_metrics'), None for no on-disk cache)
+
+    Returns:
+      numpy.ndarray (read-only)
+
+    """
+
+    key = grid_hash(metric_name, coords)
+    if key in _grid_metric_cache:
+        _grid_metric_cache.move_to_end(key)
+        return _grid_metric_cache[key]
+
+    if cache_dir == 'default':
+        cache_dir = gio.get_cache_dir('grid_metrics')
+    cache_file = os.path.join(cache_dir, '%s_%s.npy' %(metric_name, key)) if cache_dir else None
+
+    metric = None
+    if cache_file and os.path.isfile(cache_file):
+        try:
+            metric = numpy.load(cache_file)
+            os.utime(cache_file)
+        except FileNotFoundError:
+            pass  # pruned by another process since the isfile check (or since the load)
+        except (OSError, ValueError):
+            metric = None  # partially written or corrupt, so recalculate and replace it
+    if metric is None:
+        metric = numpy.asarray(calc_func())
+        if cache_file:
+            tmp_file = cache_file.replace('.npy', '.%i.tmp.npy' %(os.getpid()))
+            numpy.save(tmp_file, metric)
+            os.replace(tmp_file, cache_file)
+            prune_grid_metric_cache(cache_dir)
+
+    metric.flags.writeable = False
+    _grid_metric_cache[key] = metric
+    while len(_grid_metric_cache) > max_memory_cache_items:
+        _grid_metric_cache.popitem(last=False)
+
+    return metric
+
+
+def _horizontal_grid_cube(lat_coord, lon_coord):
+    """Create a 2D (latitude, longitude) cube for calculating horizontal grid metrics."""
+
+    dummy_data = numpy.zeros([len(lat_coord.points), len(lon_coord.points)])
+    grid_cube = iris.cube.Cube(dummy_data, dim_coords_and_dims=[(lat_coord.copy(), 0), (lon_coord.copy(), 1)])
+
+    return grid_cube
+
+
+def _broadcast_horizontal(metric, cube):
+    """Broadcast a 2D (latitude, longitude) metric to the shape of a cube.
+
+    A copy is returned for 2D cubes, otherwise a read-only view.
+
+    """
+
+    lat_dim = cube.coord_dims('latitude')[0]
+    lon_dim = cube.coord_dims('longitude')[0]
+    if lon_dim < lat_dim:
+        metric = metric.transpose()
+
+    shape = [1] * cube.ndim
+    shape[lat_dim] = cube.shape[lat_dim]
+    shape[lon_dim] = cube.shape[lon_dim]
+    metric = metric.reshape(shape)
+
+    if cube.ndim == 2:
+        return metric.copy()
+    else:
+        return numpy.broadcast_to(metric, cube.shape)
+
+
 def area_array(cube):
-    """Create a cell area array."""
+    """Create a cell area array.
+
+    The horizontal cell areas are memoised (see cached_grid_metric).
+
+    """
 
     if not cube.coord('latitude').has_bounds():
         cube.coord('latitude').guess_bounds()
     if not cube.coord('longitude').has_bounds():
         cube.coord('longitude').guess_bounds()
-    area_weights = iris.analysis.cartography.area_weights(cube)
 
-    return area_weights
+    lat_coord = cube.coord('latitude')
+    lon_coord = cube.coord('longitude')
+    calc_area = lambda: iris.analysis.cartography.area_weights(_horizontal_grid_cube(lat_coord, lon_coord))
+    area_weights = cached_grid_metric('area', [lat_coord, lon_coord], calc_area)
+
+    return _broadcast_horizontal(area_weights, cube)
+
+
+def broadcast_view(data, target_shape):
+    """Broadcast data to a target shape without copying.
+
+    Args:
+      data (numpy.ndarray or dask.array.Array): Data corresponding to the
+        trailing dimensions of the target shape
+      target_shape (tuple)
+
+    Returns:
+      A read-only view (masked if the input data are masked) or lazy array
+
+    """
+
+    if isinstance(data, da.Array):
+        return da.broadcast_to(data, target_shape)
+
+    broadcast_data = numpy.broadcast_to(numpy.ma.getdata(data), target_shape)
+    if numpy.ma.isMaskedArray(data):
+        broadcast_mask = numpy.broadcast_to(numpy.ma.getmaskarray(data), target_shape)
+        broadcast_data = numpy.ma.masked_array(broadcast_data, mask=broadcast_mask, copy=False)
+
+    return broadcast_data
+
+
+def _broadcast_axis(values, axis_index, data_shape):
+    """Broadcast a one-dimensional array along an axis of the data (read-only view)."""
+
+    shape = [1] * len(data_shape)
+    shape[axis_index] = len(values)
+
+    return numpy.broadcast_to(values.reshape(shape), data_shape)
+
+
+def _unbroadcast(data):
+    """Strip the leading broadcast (zero stride) dimensions from a broadcast view.
+
+    The result has the trailing dimensions of the data only and
+      broadcasts back to the full shape in arithmetic.
+
+    """
+
+    if isinstance(data, da.Array) or (numpy.ndim(data) == 0):
+        return data
+
+    strides = [numpy.ma.getdata(data).strides]
+    mask = numpy.ma.getmask(data)
+    if mask is not numpy.ma.nomask:
+        strides.append(mask.strides)
+    nleading = 0
+    while (nleading < data.ndim - 1) and all([dim_strides[nleading] == 0 for dim_strides in strides]):
+        nleading = nleading + 1
+
+    return data[(0,) * nleading]
+
+
+def _multiply_data(cube, measure_data):
+    """Multiply the cube data by a cell measure array.
+
+    Lazy data stays lazy, while realised data are multiplied in place 
+      (unless that would change the data type). The masks are combined.
+      For lazy data a broadcast measure is reduced to its trailing
+      dimensions first, since dask would otherwise copy the full-size
+      broadcast view into the task graph.
+
+    """
+
+    if cube.has_lazy_data():
+        cube.data = cube.lazy_data() * _unbroadcast(measure_data)
+    elif numpy.result_type(cube.dtype, measure_data.dtype) == cube.dtype:
+        data = cube.data
+        if numpy.ma.isMaskedArray(measure_data):
+            data = numpy.ma.asarray(data)
+        data *= measure_data
+        cube.data = data
+    else:
+        cube.data = cube.data * measure_data
+
+    return cube
 
 
 def calc_meridional_weights(lat_coord, coord_names, data_shape):
@@ -62,7 +283,8 @@ def calc_meridional_weights(lat_coord, coord_names, data_shape):
       data_shape (tuple): Shape of data
 
     Returns:
-      iris.cube: Array of weights with shape matching data_shape
+      numpy.ndarray: Array of weights with shape matching data_shape
+        (a read-only broadcast view)
 
     """
 
@@ -71,13 +293,30 @@ def calc_meridional_weights(lat_coord, coord_names, data_shape):
     if not lat_coord.has_bounds():
         lat_coord.guess_bounds()
 
-    lat_diffs = numpy.apply_along_axis(lambda x: x[1] - x[0], 1, lat_coord.bounds)
-    lat_diffs = uconv.broadcast_array(lat_diffs, lat_index, data_shape)
-    lat_extents = (math.pi / 180.) * iris.analysis.cartography.DEFAULT_SPHERICAL_EARTH_RADIUS * lat_diffs
+    radius = iris.analysis.cartography.DEFAULT_SPHERICAL_EARTH_RADIUS
+    calc_extents = lambda: (math.pi / 180.) * radius * numpy.diff(lat_coord.bounds, axis=1)[:, 0]
+    lat_extents = cached_grid_metric('meridional', [lat_coord], calc_extents)
+    lat_extents = _broadcast_axis(lat_extents, lat_index, data_shape)
 
     return lat_extents
 
 
+def _level_diffs(depth_coord):
+    """Calculate the thickness of each vertical level."""
+
+    if not depth_coord.has_bounds():
+        level_bounds = guess_depth_bounds(depth_coord.points)  
+    else:    
+        level_bounds = depth_coord.bounds
+    level_diffs = numpy.diff(level_bounds, axis=1)[:, 0]
+
+    #guess_bounds can produce negative bound at surface
+    if level_bounds[0][0] < 0.0:
+        level_diffs[0] = level_diffs[0] + level_bounds[0][0]
+
+    return level_diffs
+
+
 def calc_vertical_weights_1D(depth_coord, coord_names, data_shape):
     """Calculate vertical weights for a 1D depth axis.
 
@@ -87,7 +326,8 @@ def calc_vertical_weights_1D(depth_coord, coord_names, data_shape):
       data_shape (tuple): Shape of data
 
     Returns:
-      iris.cube: Array of weights with shape matching data_shape
+      numpy.ndarray: Array of weights with shape matching data_shape
+        (a read-only broadcast view)
   
     """
 
@@ -95,22 +335,12 @@ def calc_vertical_weights_1D(depth_coord, coord_names, data_shape):
     print('Depth coordinate name: ', depth_coord.long_name)
     print('Depth coordinate units: ', str(depth_coord.units))
 
-    # Calculate weights
-    if not depth_coord.has_bounds():
-        level_bounds = guess_depth_bounds(depth_coord.points)  
-    else:    
-        level_bounds = depth_coord.bounds
-    level_diffs = numpy.apply_along_axis(lambda x: x[1] - x[0], 1, level_bounds)
-
-    #guess_bounds can produce negative bound at surface
-    if level_bounds[0][0] < 0.0:
-        level_diffs[0] = level_diffs[0] + level_bounds[0][0]
+    level_diffs = cached_grid_metric('vertical_1D', [depth_coord], lambda: _level_diffs(depth_coord))
+    assert level_diffs.min() > 0.0 
 
     # Broadcast to size of data
     depth_index = coord_names.index(depth_coord.name())
-    level_diffs = uconv.broadcast_array(level_diffs, depth_index, data_shape)
-
-    assert level_diffs.min() > 0.0 
+    level_diffs = _broadcast_axis(level_diffs, depth_index, data_shape)
 
     return level_diffs
 
@@ -125,30 +355,24 @@ def calc_vertical_weights_2D(pressure_coord, latitude_coord, coord_names, data_s
       data_shape (tuple): Shape of data
 
     Returns:
-      iris.cube: Array of weights with shape matching data_shape
+      numpy.ndarray: Array of weights with shape (depth, latitude, 1),
+        which broadcasts against data_shape
 
     """
     
-    if coord_names == ['time', 'depth', 'latitude', 'longitude']:
-        ntime, nlev, nlat, nlon = data_shape
-    elif coord_names == ['depth', 'latitude', 'longitude']:
-        nlev, nlat, nlon = data_shape
-        ntime = None
-
-    depth_diffs = numpy.zeros([nlev, nlat])
-    for lat_index in range(0, nlat):
-        height_vals = gsw.z_from_p(pressure_coord.points, latitude_coord.points[lat_index])
+    assert coord_names in [['time', 'depth', 'latitude', 'longitude'], ['depth', 'latitude', 'longitude']]
+    assert data_shape[-3:-1] == (len(pressure_coord.points), len(latitude_coord.points))
+
+    def calc_depth_diffs():
+        pressure_vals = pressure_coord.points[:, numpy.newaxis]
+        latitude_vals = latitude_coord.points[numpy.newaxis, :]
+        height_vals = gsw.z_from_p(pressure_vals, latitude_vals)
         depth_vals = gsw.depth_from_z(height_vals)
         depth_bounds = guess_depth_bounds(depth_vals)
-        depth_diffs[:, lat_index] = numpy.apply_along_axis(lambda x: x[1] - x[0], 1, depth_bounds)
 
-    # Braodcast
-    if ntime:
-        depth_diffs = depth_diffs[numpy.newaxis, ...]
-        depth_diffs = numpy.repeat(depth_diffs, ntime, axis=0)
+        return numpy.diff(depth_bounds, axis=-1)
 
-    depth_diffs = depth_diffs[..., numpy.newaxis]
-    depth_diffs = numpy.repeat(depth_diffs, nlon, axis=-1)
+    depth_diffs = cached_grid_metric('vertical_2D', [pressure_coord, latitude_coord], calc_depth_diffs)
 
     assert depth_diffs.min() > 0.0 
 
@@ -170,22 +394,25 @@ def calc_zonal_weights(cube, coord_names):
       coord_names (list): Names of each data coordinate
 
     Returns:
-      iris.cube: Array of weights with shape matching data_shape
+      numpy.ndarray: Array of weights with shape matching the cube
 
     """
 
     lon_coord = cube.coord('longitude')
-    lon_index = coord_names.index('longitude')
+    lat_coord = cube.coord('latitude')
 
     if not lon_coord.has_bounds():
         lon_coord.guess_bounds()
 
-    coslat = cosine_latitude_weights(cube)
-    radius = iris.analysis.cartography.DEFAULT_SPHERICAL_EARTH_RADIUS
+    def calc_extents():
+        coslat = cosine_latitude_weights(_horizontal_grid_cube(lat_coord, lon_coord))
+        radius = iris.analysis.cartography.DEFAULT_SPHERICAL_EARTH_RADIUS
+        lon_diffs = numpy.diff(lon_coord.bounds, axis=1)[:, 0]
+
+        return ((math.pi / 180.) * radius) * coslat * lon_diffs[numpy.newaxis, :]
 
-    lon_diffs = numpy.apply_along_axis(lambda x: x[1] - x[0], 1, lon_coord.bounds)
-    lon_diffs = uconv.broadcast_array(lon_diffs, lon_index, cube.shape)
-    lon_extents = (math.pi / 180.) * radius * coslat * lon_diffs
+    lon_extents = cached_grid_metric('zonal', [lat_coord, lon_coord], calc_extents)
+    lon_extents = _broadcast_horizontal(lon_extents, cube)
 
     return lon_extents
 
@@ -203,6 +430,7 @@ def get_depth_array(data_cube, depth_name):
     elif depth_coord.ndim == 2:
         assert coord_names == ['depth', 'latitude', 'longitude'], "2D weights will not work for curvilinear grid"
         depth_interval_array = calc_vertical_weights_2D(depth_coord, data_cube.coord('latitude'), coord_names, data_cube.shape)
+        depth_interval_array = numpy.broadcast_to(depth_interval_array, data_cube.shape)
 
     return depth_interval_array
 
@@ -210,20 +438,20 @@ def get_depth_array(data_cube, depth_name):
 def guess_depth_bounds(points, bound_position=0.5):
     """The guess_bounds method copied from iris.
     
-    This implementation is specifically for the depth axis 
+    This implementation is specifically for the depth axis,
+      which is the first axis of the points array. The bounds
+      are returned along a new last axis.
 
     """
 
-    diffs = numpy.diff(points)
-    diffs = numpy.insert(diffs, 0, diffs[0])
-    diffs = numpy.append(diffs, diffs[-1])
+    diffs = numpy.diff(points, axis=0)
+    diffs = numpy.concatenate([diffs[0:1, ...], diffs, diffs[-1:, ...]], axis=0)
 
-    min_bounds = points - diffs[:-1] * bound_position
-    max_bounds = points + diffs[1:] * (1 - bound_position)
+    min_bounds = points - diffs[:-1, ...] * bound_position
+    max_bounds = points + diffs[1:, ...] * (1 - bound_position)
 
-    bounds = numpy.array([min_bounds, max_bounds]).transpose()
-    if bounds[0, 0] < 0.0:
-        bounds[0, 0] = 0
+    bounds = numpy.stack([min_bounds, max_bounds], axis=-1)
+    bounds[0, ..., 0] = numpy.maximum(bounds[0, ..., 0], 0)
 
     return bounds
 
@@ -237,19 +465,14 @@ def multiply_by_area(cube, area_cube=None):
         if not cube_ndim == area_ndim:
             diff = cube_ndim - area_ndim
             assert cube.shape[diff:] == area_cube.shape
-            area_data = uconv.broadcast_array(area_cube.data, [cube_ndim - area_ndim, cube_ndim - 1], cube.shape)
+            area_data = broadcast_view(area_cube.data, cube.shape)
         else:
             area_data = area_cube.data
     else:
         area_data = area_array(cube)
 
-    units = str(cube.units)
-    cube.data = cube.data * area_data   
-
-    if 'm-2' in units:
-        cube.units = units.replace('m-2', '').replace("  ", " ")
-    else:
-        cube.units = units + ' m2'
+    cube = _multiply_data(cube, area_data)
+    cube.units = multiply_units_by_measure(cube.units, 'area')
 
     return cube
 
@@ -263,21 +486,29 @@ def multiply_by_volume(cube, volume_cube=None):
         if not cube_ndim == volume_ndim:
             diff = cube_ndim - volume_ndim
             assert cube.shape[diff:] == volume_cube.shape
-            volume_data = uconv.broadcast_array(volume_cube.data, [cube_ndim - volume_ndim, cube_ndim - 1], cube.shape)
+            volume_data = broadcast_view(volume_cube.data, cube.shape)
         else:
             volume_data = volume_cube.data
     else:
         volume_data = volume_array(cube)
 
-    units = str(cube.units)
-    cube.data = cube.data * volume_data   
+    cube = _multiply_data(cube, volume_data)
+    cube.units = multiply_units_by_measure(cube.units, 'volume')
+
+    return cube
+
+
+def multiply_units_by_measure(units, measure):
+    """Get the units that result from multiplying by cell area or volume."""
 
-    if 'm-3' in units:
-        cube.units = units.replace('m-3', '').replace("  ", " ")
+    power = {'area': '2', 'volume': '3'}[measure]
+    units = str(units)
+    if 'm-' + power in units:
+        new_units = units.replace('m-' + power, '').replace("  ", " ")
     else:
-        cube.units = units + ' m3'
+        new_units = units + ' m' + power
 
-    return cube
+    return new_units
 
 
 def volume_array(target_cube, volume_cube=None, area_cube=None):
@@ -304,7 +535,7 @@ def volume_from_area(target_cube, area_cube=None):
     assert target_coord_names[0:2] == ['time', 'depth'] and len(target_coord_names) == 4
 
     if area_cube:
-        area_data = uconv.broadcast_array(area_cube.data, [2, 3], target_cube.shape)
+        area_data = broadcast_view(area_cube.data, target_cube.shape)
     else:
         area_data = area_array(target_cube)
 
@@ -318,7 +549,11 @@ def volume_from_area(target_cube, area_cube=None):
 
 
 def volume_from_volume(target_cube, volume_cube):
-    """Create volume array from volume data cube."""
+    """Create volume array from volume data cube.
+
+    For data with a time axis, a read-only broadcast view is returned.
+
+    """
 
     target_coord_names = [coord.name() for coord in target_cube.dim_coords]
     volume_coord_names = [coord.name() for coord in volume_cube.dim_coords]
@@ -334,7 +569,7 @@ def volume_from_volume(target_cube, volume_cube):
 
     if target_coord_names[0] == 'time':
         assert target_coord_names[1:] == volume_coord_names
-        volume_data = uconv.broadcast_array(volume_data, [1, 3], target_cube.shape)
+        volume_data = broadcast_view(volume_data, target_cube.shape)
 
     assert volume_data.shape == target_cube.shape
 
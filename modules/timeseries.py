@@ -7,7 +7,9 @@ Functions:
   equalise_time_axes          -- Make all the time axes in an iris cube list the same
   flux_to_total               -- Convert a flux (i.e. per second quantity) to total
   get_control_time_constraint -- Define the time constraint for the control data
-  outlier_removal             -- Remove outliers from a timeseries
+  linear_trend_columns        -- Calculate the linear trend of every timeseries in an array at once
+  outlier_removal             -- Remove outliers from one or more timeseries
+  polyfit_columns             -- Fit a polynomial to every timeseries in an array at once
   runmean                     -- Calculae the running mean
 
 """
@@ -17,6 +19,7 @@ import math
 
 import numpy as np
 import pandas as pd
+import dask.array as da
 import iris
 import iris.coord_categorisation
 import cf_units
@@ -88,9 +91,7 @@ def calc_trend(cube, running_mean=False, per_yr=False,
     time_axis = cube.coord('time')
     time_axis = convert_to_seconds(time_axis)
 
-    trend = np.ma.apply_along_axis(linear_trend, 0, cube.data, time_axis.points, outlier_threshold)
-    if type(cube.data) == np.ma.core.MaskedArray:
-        trend = np.ma.masked_values(trend, cube.data.fill_value)
+    trend = linear_trend_columns(cube.data, time_axis.points, outlier_threshold)
 
     if per_yr:
         trend = trend * 60 * 60 * 24 * 365.25
@@ -141,6 +142,119 @@ def _chunked_year_aggregation(cube, agg_method, step=12, days_in_month=False):
     return annual_cube
 
 
+def _get_days_in_month(cube):
+    """Get the number of days spanned by each (monthly) time step."""
+
+    assert 'days' in str(cube.coord('time').units)
+    time_span_days = cube.coord('time').bounds[:, 1] - cube.coord('time').bounds[:, 0]
+    assert time_span_days.max() < 32
+    assert time_span_days.min() > 26
+
+    return time_span_days
+
+
+def _is_regular_monthly(cube):
+    """Check whether the data is made up of complete, consecutive years of monthly data.
+
+    Assumes the year and month auxiliary coordinates have been added.
+
+    """
+
+    years = cube.coord('year').points
+    months = cube.coord('month').points
+    if (years.size == 0) or (years.size % 12 != 0):
+        return False
+
+    years = years.reshape(-1, 12)
+    months = months.reshape(-1, 12)
+    regular = (years == years[:, 0:1]).all() and (np.diff(years[:, 0]) > 0).all()
+    regular = regular and (months == months[0, :]).all() and (len(set(months[0, :])) == 12)
+
+    return bool(regular)
+
+
+def _regular_annual_aggregation(cube, aggregation, chunk=False, days_in_month=False, years_per_chunk=3):
+    """Annual aggregation of regular monthly data.
+
+    The time axis is reshaped to (nyears, 12) and the data reduced
+      with a weighted sum over the months. Lazy (or chunked) data
+      is processed in chunks of whole years. As with aggregated_by,
+      the result keeps the input (floating point) dtype, gets a year
+      cell method and numeric time-varying auxiliary coordinates span
+      each year (other time-varying auxiliary coordinates are removed).
+
+    Args:
+      cube (iris.cube.Cube): Data with year and month auxiliary coordinates
+      aggregation (str): mean or sum
+      chunk (bool): Chunk along the time axis
+      days_in_month (bool): Weight each month by its number of days
+      years_per_chunk (int): Number of years in each chunk
+
+    """
+
+    ntimes = cube.shape[0]
+    nyears = ntimes // 12
+    weights_shape = (nyears, 12) + (1,) * (cube.ndim - 1)
+    if days_in_month:
+        days = _get_days_in_month(cube).reshape(nyears, 12)
+        weights = days / days.sum(axis=1, keepdims=True)
+    else:
+        weights = np.ones([nyears, 12])
+    weights = weights.reshape(weights_shape)
+
+    data = cube.core_data()
+    if chunk and not cube.has_lazy_data():
+        data = da.from_array(data, chunks=(12 * years_per_chunk,) + data.shape[1:])
+    lazy = isinstance(data, da.Array)
+    if lazy:
+        time_chunk = 12 * max(1, max(data.chunks[0]) // 12)
+        data = data.rechunk({0: time_chunk})
+        getmaskarray = da.ma.getmaskarray
+    else:
+        getmaskarray = np.ma.getmaskarray
+    data = data.reshape((nyears, 12) + cube.shape[1:])
+
+    annual_data = (data * weights).sum(axis=1)
+    if aggregation == 'mean' and not days_in_month:
+        valid_weights = (~getmaskarray(data) * weights).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            annual_data = annual_data / valid_weights
+    if cube.dtype.kind == 'f':
+        annual_data = annual_data.astype(cube.dtype)
+
+    annual_cube = cube.copy(data=cube.lazy_data())[::12, ...]
+    for coord in cube.aux_coords + (cube.coord('time'),):
+        coord_dims = cube.coord_dims(coord)
+        if (0 not in coord_dims) or (coord.name() in ['year', 'month']):
+            continue
+        elif (coord_dims == (0,)) and (coord.dtype.kind in 'iuf'):
+            points, bounds = _annual_coord_values(coord)
+            annual_coord = annual_cube.coord(coord.name())
+            annual_coord.bounds = None
+            annual_coord.points = points
+            annual_coord.bounds = bounds
+        else:
+            annual_cube.remove_coord(coord.name())
+    annual_cube.data = annual_data
+
+    # Match the cell method added by aggregated_by (days in month means are a weighted sum)
+    cell_method = 'sum' if (aggregation == 'sum') or days_in_month else 'mean'
+    annual_cube.add_cell_method(iris.coords.CellMethod(cell_method, coords='year'))
+
+    return annual_cube
+
+
+def _annual_coord_values(coord):
+    """Points and bounds spanning each year for a monthly (time-varying) coordinate."""
+
+    if coord.has_bounds():
+        bounds = np.stack([coord.bounds[::12, 0], coord.bounds[11::12, 1]], axis=-1)
+    else:
+        bounds = np.stack([coord.points[::12], coord.points[11::12]], axis=-1)
+
+    return bounds.mean(axis=-1), bounds
+
+
 def get_days_in_year(cube, return_df=False):
     """Generate an array of days in each year.
 
@@ -152,10 +266,7 @@ def get_days_in_year(cube, return_df=False):
     if not 'year' in aux_coord_names:
         iris.coord_categorisation.add_year(cube, 'time')
 
-    assert 'days' in str(cube.coord('time').units)
-    time_span_days = cube.coord('time').bounds[:, 1] - cube.coord('time').bounds[:, 0]
-    assert time_span_days.max() < 32
-    assert time_span_days.min() > 26
+    time_span_days = _get_days_in_month(cube)
   
     df = pd.DataFrame(data={'days_in_month': time_span_days, 'year': cube.coord('year').points})
     days_in_year = df.groupby('year').sum()
@@ -171,12 +282,12 @@ def _days_in_month_annual_mean(cube):
 
     df, days_in_year = get_days_in_year(cube, return_df=True)
     
-    df['weight'] = df.apply(lambda row: row['days_in_month'] / days_in_year.loc[row['year']], axis=1)
+    df['weight'] = df['days_in_month'] / df['year'].map(days_in_year)
     np.testing.assert_allclose(df.groupby('year').sum()['weight'].min(), 1.0)
     np.testing.assert_allclose(df.groupby('year').sum()['weight'].max(), 1.0)
 
-    weights_array = uconv.broadcast_array(df['weight'].values, 0, cube.shape)
-    cube.data = cube.data * weights_array
+    weights_shape = (cube.shape[0],) + (1,) * (cube.ndim - 1)
+    cube.data = cube.core_data() * df['weight'].values.reshape(weights_shape)
     cube = cube.aggregated_by(['year'], iris.analysis.SUM)
 
     return cube
@@ -185,6 +296,9 @@ def _days_in_month_annual_mean(cube):
 def convert_to_annual(cube, aggregation='mean', chunk=False, days_in_month=False):
     """Convert data to annual timescale.
 
+    Regular monthly data (complete, consecutive years) is reduced by
+      reshaping the time axis, otherwise iris aggregated_by is used.
+
     Args:
       cube (iris.cube.Cube)
       full_months(bool): Only include years with data for all 12 months
@@ -209,6 +323,10 @@ def convert_to_annual(cube, aggregation='mean', chunk=False, days_in_month=False
  
         if days_in_month:
             assert aggregation == 'mean'
+
+        if _is_regular_monthly(cube):
+            cube = _regular_annual_aggregation(cube, aggregation, chunk=chunk, days_in_month=days_in_month)
+        elif days_in_month:
             if chunk:
                 cube = _chunked_year_aggregation(cube, aggregator, step=36, days_in_month=True)
             else:
@@ -351,6 +469,45 @@ def fit_polynomial(data, time_axis, order, outlier_threshold):
     return coefficients
 
 
+def polyfit_columns(data, time_axis, order):
+    """Fit a polynomial to every timeseries in an array at once.
+
+    All the timeseries share the same time axis, so the least squares
+      problem is solved for every timeseries with a single pseudo-inverse
+      of the Vandermonde matrix. As per numpy.polyfit, the columns of the
+      Vandermonde matrix are scaled to improve the conditioning.
+
+    Args:
+      data (numpy.ndarray): Data with time as the first axis
+      time_axis (numpy.ndarray)
+      order (int): Order of the polynomial
+
+    Returns:
+      numpy.ma.MaskedArray of shape (order + 1, data.shape[1:]) with the 
+        coefficients ordered from the highest power (like numpy.polyfit).
+        Timeseries containing missing values are masked.
+
+    """
+
+    ntimes = data.shape[0]
+    out_shape = (order + 1,) + data.shape[1:]
+    flat_data = data.reshape(ntimes, -1)
+    column_mask = np.ma.getmaskarray(flat_data).any(axis=0)
+
+    time_axis = np.asarray(time_axis, dtype=np.float64)
+    vander = np.vander(time_axis, order + 1)
+    scale = np.sqrt((vander * vander).sum(axis=0))
+    rcond = ntimes * np.finfo(np.float64).eps
+    pinv = np.linalg.pinv(vander / scale, rcond=rcond)
+
+    coefficients = np.dot(pinv, np.ma.getdata(flat_data).astype(np.float64))
+    coefficients = coefficients / scale[:, np.newaxis]
+    mask = np.broadcast_to(column_mask, coefficients.shape)
+    coefficients = np.ma.masked_array(coefficients, mask=mask)
+
+    return coefficients.reshape(out_shape)
+
+
 def linear_trend(data, time_axis, outlier_threshold):
     """Calculate the linear trend.
 
@@ -375,6 +532,91 @@ def linear_trend(data, time_axis, outlier_threshold):
         return coefficients[0]
 
 
+def linear_trend_columns(data, time_axis, outlier_threshold=None):
+    """Calculate the linear trend of every timeseries in an array at once.
+
+    The ordinary least squares slope is calculated for all timeseries
+      together using the time axis moments. Timeseries with missing values
+      are fitted to their valid points only, while timeseries that start
+      with a missing value are masked (as per linear_trend).
+
+    Args:
+      data (numpy.ndarray): Data with time as the first axis
+      time_axis (numpy.ndarray)
+      outlier_threshold (float, optional): replace points that deviate from
+        the rolling median by greater than this threshold with the mean
+
+    Returns:
+      numpy.ma.MaskedArray of shape data.shape[1:]
+
+    """
+
+    ntimes = data.shape[0]
+    out_shape = data.shape[1:]
+    flat_data = np.ma.asarray(data).reshape(ntimes, -1)
+    if outlier_threshold:
+        flat_data, outlier_idx = outlier_removal(flat_data, outlier_threshold)
+    mask = np.ma.getmaskarray(flat_data)
+    values = np.where(mask, 0.0, np.ma.getdata(flat_data).astype(np.float64))
+
+    time_axis = np.asarray(time_axis, dtype=np.float64)
+    time_anomaly = time_axis - time_axis.mean()
+    sxx = np.dot(time_anomaly, time_anomaly)
+    sxy = np.dot(time_anomaly, values)
+    trend = sxy / sxx
+
+    out_mask = mask[0, :].copy()
+    partial = mask.any(axis=0) & ~out_mask
+    if partial.any():
+        weights = (~mask[:, partial]).astype(np.float64)
+        sw = weights.sum(axis=0)
+        swx = np.dot(time_anomaly, weights)
+        swxx = np.dot(time_anomaly ** 2, weights)
+        swy = values[:, partial].sum(axis=0)
+        denominator = sw * swxx - swx ** 2
+        degenerate = denominator <= 0
+        denominator[degenerate] = 1.0
+        trend[partial] = (sw * sxy[partial] - swx * swy) / denominator
+        out_mask[np.flatnonzero(partial)[degenerate]] = True
+
+    trend = np.ma.masked_array(trend, mask=out_mask)
+
+    return trend.reshape(out_shape)
+
+
+def _forward_fill(data):
+    """Fill NaNs along the first axis with the last valid value."""
+
+    valid = ~np.isnan(data)
+    index = np.where(valid, np.arange(data.shape[0])[:, np.newaxis], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+
+    return np.take_along_axis(data, index, axis=0)
+
+
+def _rolling_median(data, window=10, max_elements=5e7):
+    """Rolling median along the first axis of a 2D (time, points) array.
+
+    Reproduces pandas rolling(window).median() followed by a backward and
+      forward fill. Missing values should be NaN. The columns are processed
+      in blocks so the strided windows fit within max_elements.
+
+    """
+
+    ntimes, npoints = data.shape
+    median = np.full(data.shape, np.nan)
+    if ntimes >= window:
+        block = max(1, int(max_elements // (ntimes * window)))
+        for start in range(0, npoints, block):
+            windows = np.lib.stride_tricks.sliding_window_view(data[:, start:start+block], window, axis=0)
+            median[window-1:, start:start+block] = np.median(windows, axis=-1)
+
+    median = _forward_fill(median[::-1, :])[::-1, :]
+    median = _forward_fill(median)
+
+    return median
+
+
 def runmean(data, window_width, overlap=True):
     """Calculate the running mean.
     
@@ -395,27 +637,45 @@ def runmean(data, window_width, overlap=True):
 def outlier_removal(data, outlier_threshold, replacement_method='missing'):
     """Remove outliers from a timeseries.
 
+    The rolling median (window of 10) is calculated for all timeseries at once.
+
     Args:
-      data (numpy.array)
+      data (numpy.array): Data with time as the first axis
+        (i.e. a single timeseries or a (time, points) array)
       outlier_threshold (float): remove points that deviate from
         the rolling median by greater than this threshold
       replacement_method (str): method for replacing outliers
 
+    Returns:
+      clean_data (numpy.ma.MaskedArray)
+      outlier_idx: List of outlier time indexes for a single timeseries,
+        otherwise a tuple of index arrays (as per numpy.nonzero)
+
     """
 
     assert replacement_method in ['missing', 'mean']
 
-    data_series = pd.Series(data)
-    median = data_series.rolling(10).median().fillna(method='bfill').fillna(method='ffill')
+    ntimes = data.shape[0]
+    flat_data = np.ma.asarray(data).reshape(ntimes, -1)
+    mask = np.ma.getmaskarray(flat_data)
+    values = np.where(mask, np.nan, np.ma.getdata(flat_data).astype(np.float64))
 
-    difference = np.abs(data_series - median)
-    outlier_bools = difference > outlier_threshold
+    median = _rolling_median(values)
+    with np.errstate(invalid='ignore'):
+        outlier_bools = np.abs(values - median) > outlier_threshold
 
     if replacement_method == 'missing':
-        clean_data = np.ma.where(outlier_bools.values, data.mean(), data)
+        column_mean = flat_data.mean(axis=0)
+        clean_data = np.ma.where(outlier_bools, column_mean, flat_data)
+    else:
+        clean_data = np.ma.masked_where(outlier_bools, flat_data)
+    clean_data = clean_data.reshape(data.shape)
+    outlier_bools = outlier_bools.reshape(data.shape)
+
+    if data.ndim == 1:
+        outlier_idx = np.flatnonzero(outlier_bools).tolist()
     else:
-        clean_data = np.ma.masked_where(outlier_bools.values, data)
-    outlier_idx = list(data_series[outlier_bools].index)
+        outlier_idx = np.nonzero(outlier_bools)
 
     return clean_data, outlier_idx
 
@@ -1,7 +1,13 @@
 """Collection of functions for water mass analysis.
 
+Classes:
+  GridContext    -- Static grid information for water mass binning
+  WaterMassData  -- Column arrays for water mass analysis
+
 Functions:
-  create_df  -- Create data frame for water mass analysis 
+  create_df          -- Create column data for water mass analysis 
+  get_grid_context   -- Build (or load from disk) the static grid information
+
 
 """
 
@@ -9,7 +15,6 @@ Functions:
 
 import pdb, os, sys
 import numpy
-import pandas
 import logging
 logging.basicConfig(level=logging.DEBUG)
 
@@ -31,16 +36,110 @@ try:
 except ImportError:
     raise ImportError('Must run this script from anywhere within the ocean-analysis git repo')
 
-# Define functions
+# Define classes
 
-def multiply_by_days_in_year_frac(data, time_coord):
-    """Multiply monthly data by corresponding days in year fraction.
+class GridContext(object):
+    """Static grid information for water mass binning.
 
-    Useful when needing to account for the slightly different number
-      of days in each month.
+    Fields that don't change within a run (basin, cell area/volume,
+      latitude and longitude) are prepared once, so they can be
+      gathered at the ocean points of each time step without being
+      broadcast. The horizontal fields are stored as 2D (j, i) arrays
+      and the cell measure as a flattened array over the grid shape.
 
     """
 
+    __slots__ = ('shape', 'mask', 'ocean_index', 'basin', 'cell_measure',
+                 'measure_name', 'latitude', 'longitude', 'source')
+
+    def __init__(self, shape, mask, basin, cell_measure=None, measure_name=None,
+                 latitude=None, longitude=None, source=''):
+        self.shape = tuple(shape)
+        self.mask = mask
+        self.ocean_index = numpy.flatnonzero(~mask)
+        self.basin = basin
+        self.cell_measure = cell_measure
+        self.measure_name = measure_name
+        self.latitude = latitude
+        self.longitude = longitude
+        self.source = source
+
+    def save(self, outfile):
+        """Save to a numpy .npz file.
+
+        Only the ocean points of the cell measure are stored.
+
+        """
+
+        arrays = {'shape': numpy.array(self.shape),
+                  'ocean_index': self.ocean_index,
+                  'basin': self.basin,
+                  'source': numpy.array(self.source)}
+        if self.cell_measure is not None:
+            arrays['cell_measure'] = self.cell_measure[self.ocean_index]
+            arrays['measure_name'] = numpy.array(self.measure_name)
+        if self.latitude is not None:
+            arrays['latitude'] = self.latitude
+            arrays['longitude'] = self.longitude
+
+        tmp_file = outfile + '.%i.tmp.npz' %(os.getpid())
+        numpy.savez(tmp_file, **arrays)
+        os.replace(tmp_file, outfile)
+
+    @classmethod
+    def load(cls, infile):
+        """Load from a numpy .npz file created by the save method."""
+
+        with numpy.load(infile) as npz:
+            shape = tuple(int(size) for size in npz['shape'])
+            ocean_index = npz['ocean_index']
+            mask = numpy.ones(int(numpy.prod(shape)), dtype=bool)
+            mask[ocean_index] = False
+            basin = npz['basin']
+            if 'cell_measure' in npz:
+                cell_measure = numpy.zeros(mask.size)
+                cell_measure[ocean_index] = npz['cell_measure']
+                measure_name = str(npz['measure_name'])
+            else:
+                cell_measure = measure_name = None
+            latitude = npz['latitude'] if 'latitude' in npz else None
+            longitude = npz['longitude'] if 'longitude' in npz else None
+            source = str(npz['source'])
+
+        return cls(shape, mask.reshape(shape), basin, cell_measure=cell_measure,
+                   measure_name=measure_name, latitude=latitude,
+                   longitude=longitude, source=source)
+
+
+class WaterMassData(object):
+    """Column arrays for water mass analysis.
+
+    A lightweight alternative to a pandas DataFrame
+      (columns that weren't requested are None).
+
+    """
+
+    __slots__ = ('temperature', 'salinity', 'weight', 'basin',
+                 'latitude', 'longitude', 'percentile_weights')
+
+    def __init__(self, **columns):
+        for name in self.__slots__:
+            setattr(self, name, columns.get(name))
+
+    def __contains__(self, name):
+        return getattr(self, name, None) is not None
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def __len__(self):
+        return len(self.temperature)
+
+# Define functions
+
+def days_in_year_frac(time_coord):
+    """Get the days in year fraction for each month of monthly data."""
+
     assert 'days' in str(time_coord.units)
     time_span_days = time_coord.bounds[:, 1] - time_coord.bounds[:, 0]
     assert len(time_span_days) == 12
@@ -50,8 +149,19 @@ def multiply_by_days_in_year_frac(data, time_coord):
     assert days_in_year > 359
     assert days_in_year < 367
 
-    for month, time_span in enumerate(time_span_days):
-        data[month, ::] = data[month, ::] * (time_span / days_in_year)
+    return time_span_days / days_in_year
+
+
+def multiply_by_days_in_year_frac(data, time_coord):
+    """Multiply monthly data by corresponding days in year fraction.
+
+    Useful when needing to account for the slightly different number
+      of days in each month.
+
+    """
+
+    for month, frac in enumerate(days_in_year_frac(time_coord)):
+        data[month, ::] = data[month, ::] * frac
 
     return data
 
@@ -72,9 +182,140 @@ def broadcast_data(cube, target_shape):
     return data
 
 
+def broadcast_mask(data, target_shape):
+    """Broadcast the mask of a (static) array without copying it."""
+
+    mask = numpy.ma.getmaskarray(data)
+
+    return numpy.broadcast_to(mask, target_shape)
+
+
+def get_compressed_index(common_mask, index_cache=None):
+    """Get the flattened indexes of the unmasked points.
+
+    Args:
+      common_mask (numpy.ndarray) -- mask common to all the data
+      index_cache (dict) -- reuse the indexes from a previous
+        call (e.g. for the previous month) if the mask hasn't changed
+
+    """
+
+    if index_cache and numpy.array_equal(index_cache['mask'], common_mask):
+        return index_cache['index']
+
+    index = numpy.flatnonzero(~common_mask)
+    if index_cache is not None:
+        index_cache['mask'] = common_mask
+        index_cache['index'] = index
+
+    return index
+
+
+def gather(data, index, target_shape, axis_index=None):
+    """Select the compressed points from an array without broadcasting it.
+
+    Args:
+      data (numpy.ndarray) -- data to select from
+      index (numpy.ndarray) -- flattened indexes of the points in target_shape
+      target_shape (tuple) -- shape the indexes refer to
+      axis_index (int or tuple) -- position in the target shape that the
+        axis/axes of the data corresponds to (defaults to the trailing axes)
+
+    """
+
+    target_ndim = len(target_shape)
+    if axis_index is None:
+        end_axis_index = target_ndim - 1
+    elif type(axis_index) in [float, int]:
+        end_axis_index = axis_index
+    else:
+        end_axis_index = axis_index[-1]
+
+    flat_data = numpy.ma.getdata(data).ravel()
+    if flat_data.size == numpy.prod(target_shape):
+        return flat_data[index]
+
+    inner_size = int(numpy.prod(target_shape[end_axis_index + 1:]))
+    data_index = index // inner_size if inner_size > 1 else index
+
+    return flat_data[data_index % flat_data.size]
+
+
+def get_file_details(files):
+    """Get a string that identifies the current version of a list of files."""
+
+    details = []
+    for infile in files:
+        if infile:
+            details.append(f"{os.path.abspath(infile)}:{os.path.getsize(infile)}:{os.path.getmtime(infile)}")
+
+    return ' '.join(details)
+
+
+def get_horizontal_coords(cube):
+    """Get 2D (j, i) latitude and longitude arrays."""
+
+    lats = cube.coord('latitude').points
+    lons = cube.coord('longitude').points
+    if lats.ndim == 1:
+        lons, lats = numpy.meshgrid(lons, lats)
+
+    return lats, lons
+
+
+def get_grid_context(b_cube, measure_cube=None, cache_file=None, source_files=()):
+    """Build (or load from disk) the static grid information.
+
+    Args:
+      b_cube (iris.cube.Cube)       -- basin cube
+      measure_cube (iris.cube.Cube) -- cell area or volume cube
+                                       (i.e. areacello or volcello)
+      cache_file (str)              -- file for persisting the grid context
+      source_files (list)           -- basin and cell measure files
+                                       (used to check that a saved
+                                       grid context is still valid)
+
+    """
+
+    source = get_file_details(source_files)
+    if cache_file and os.path.isfile(cache_file):
+        grid = GridContext.load(cache_file)
+        if grid.source == source:
+            logging.info(f"Using grid context from {cache_file}")
+            return grid
+
+    basin = uconv.compact_basin_array(b_cube.data)
+    lats, lons = get_horizontal_coords(b_cube)
+    if measure_cube:
+        shape = measure_cube.shape
+        assert shape[-2:] == basin.shape
+        mask = numpy.ma.getmaskarray(measure_cube.data)
+        cell_measure = numpy.ma.getdata(measure_cube.data).astype(numpy.float64).ravel()
+        measure_name = 'area' if measure_cube.var_name == 'areacello' else 'volume'
+    else:
+        shape = basin.shape
+        mask = numpy.zeros(shape, dtype=bool)
+        cell_measure = measure_name = None
+
+    grid = GridContext(shape, mask, basin, cell_measure=cell_measure,
+                       measure_name=measure_name, latitude=lats,
+                       longitude=lons, source=source)
+    if cache_file:
+        grid.save(cache_file)
+        logging.info(f"Grid context saved to {cache_file}")
+
+    return grid
+
+
 def create_df(w_cube, t_cube, s_cube, b_cube, pct_cube=None,
-              multiply_weights_by_days_in_year_frac=False):
-    """Create DataFrame for water mass analysis.
+              multiply_weights_by_days_in_year_frac=False,
+              columns=('temperature', 'salinity', 'weight', 'basin'),
+              index_cache=None, grid=None):
+    """Create column data for water mass analysis.
+
+    Static cubes (e.g. basin, area, volume) are not broadcast to the
+      shape of the temperature data. Instead, the unmasked points are
+      selected directly using the flattened (compressed) index.
 
     Args:
       w_cube (iris.cube.Cube)    -- weights cube
@@ -83,90 +324,87 @@ def create_df(w_cube, t_cube, s_cube, b_cube, pct_cube=None,
       b_cube (iris.cube.Cube)    -- basin cube
       pct_cube (iris.cube.Cube)  -- percentile weights cube
                                     (i.e. area or volume)
-      days_in_month_weights_adjustment (bool) -- multiply
+      multiply_weights_by_days_in_year_frac (bool) -- multiply
         weights data by (days in month / days in year) 
+      columns (tuple)            -- columns to include in the output
+                                    (latitude and longitude are also available)
+      index_cache (dict)         -- cache for reusing the compressed
+                                    index across time steps
+      grid (GridContext)         -- static grid information (if provided,
+                                    the basin and coordinates are taken from
+                                    the grid and the weights are multiplied
+                                    by the grid cell measure)
+
+    Returns:
+      WaterMassData, salinity units, temperature units
 
     """
 
-    t_ndim = t_cube.ndim
-    w_data = broadcast_data(w_cube, t_cube.shape)
-    b_data = broadcast_data(b_cube, t_cube.shape)
-    if pct_cube:
-        pct_data = broadcast_data(pct_cube, t_cube.shape)
-
-    if multiply_weights_by_days_in_year_frac:
-        w_data = multiply_by_days_in_year_frac(w_data, t_cube.coord('time'))
-
+    target_shape = t_cube.shape
     t_cube = gio.temperature_unit_check(t_cube, 'C', abort=False)
     if s_cube:
         s_cube = gio.salinity_unit_check(s_cube, abort=False)
 
-    coord_names = [coord.name() for coord in t_cube.dim_coords]
-    if t_cube.coord('latitude').points.ndim == 1:
-        lat_pos = coord_names.index('latitude')
-        lon_pos = coord_names.index('longitude')
-    else:
-        lat_pos = lon_pos = [t_ndim - 2, t_ndim -1] 
-    lats = uconv.broadcast_array(t_cube.coord('latitude').points, lat_pos, t_cube.shape)
-    lons = uconv.broadcast_array(t_cube.coord('longitude').points, lon_pos, t_cube.shape)
-   
-    w_masked_points = w_data.mask.sum()
-    t_masked_points = t_cube.data.mask.sum()
+    t_mask = numpy.ma.getmaskarray(t_cube.data)
+    w_mask = broadcast_mask(w_cube.data, target_shape)
+    w_masked_points = w_mask.sum()
+    t_masked_points = t_mask.sum()
     if s_cube:
-        s_masked_points = s_cube.data.mask.sum()
+        s_mask = numpy.ma.getmaskarray(s_cube.data)
+        s_masked_points = s_mask.sum()
         if not t_masked_points == s_masked_points: 
             logging.info(f"salinity ({s_masked_points} points) and temperature ({t_masked_points}) masks are different")
     if not w_masked_points == t_masked_points:
          logging.info(f"temperature ({t_masked_points} points) and weights data ({w_masked_points}) masks are different")
-    common_mask = w_data.mask + t_cube.data.mask
+    common_mask = w_mask | t_mask
+    if grid and (grid.cell_measure is not None):
+        assert target_shape[-len(grid.shape):] == grid.shape
+        common_mask = common_mask | numpy.broadcast_to(grid.mask, target_shape)
     if s_cube:
-        common_mask = common_mask + s_cube.data.mask
+        common_mask = common_mask | s_mask
     if pct_cube:
-        pct_masked_points = pct_data.mask.sum()
+        pct_mask = broadcast_mask(pct_cube.data, target_shape)
+        pct_masked_points = pct_mask.sum()
         if not pct_masked_points == t_masked_points: 
-            logging.info(f"temperature ({s_masked_points} points) and percentile weight ({pct_masked_points}) masks are different")
-        common_mask = common_mask + pct_data.mask
-        pct_data.mask = common_mask
-    t_cube.data.mask = common_mask
-    if s_cube:
-        s_cube.data.mask = common_mask
-    lats = numpy.ma.masked_array(lats, common_mask)
-    lons = numpy.ma.masked_array(lons, common_mask)
-    b_data.mask = common_mask
-    w_data.mask = common_mask
-
-    t_data = t_cube.data.compressed()
-    if s_cube:
-        s_data = s_cube.data.compressed()
-    w_data = w_data.compressed()
-    b_data = b_data.compressed()
-    lat_data = lats.compressed()
-    lon_data = lons.compressed()
-    if pct_cube:
-        pct_data = pct_data.compressed()
-
-    if s_cube:
-        assert t_data.shape == s_data.shape
-    assert t_data.shape == w_data.shape
-    assert t_data.shape == b_data.shape
-    assert t_data.shape == lat_data.shape
-    assert t_data.shape == lon_data.shape
-    if pct_cube:
-        assert t_data.shape == pct_data.shape
-
-    df = pandas.DataFrame(index=range(t_data.shape[0]))
-    df['temperature'] = t_data
-    if s_cube:
-        df['salinity'] = s_data
-    df['weight'] = w_data
-    df['basin'] = b_data
-    df['latitude'] = lat_data
-    df['longitude'] = lon_data
-    if pct_cube:
-        df['percentile_weights'] = pct_data
+            logging.info(f"temperature ({t_masked_points} points) and percentile weight ({pct_masked_points}) masks are different")
+        common_mask = common_mask | pct_mask
+
+    index = get_compressed_index(common_mask, index_cache=index_cache)
+
+    column_dict = {}
+    if 'temperature' in columns:
+        column_dict['temperature'] = gather(t_cube.data, index, target_shape)
+    if s_cube and ('salinity' in columns):
+        column_dict['salinity'] = gather(s_cube.data, index, target_shape)
+    if 'weight' in columns:
+        w_data = gather(w_cube.data, index, target_shape)
+        if multiply_weights_by_days_in_year_frac:
+            month_fracs = days_in_year_frac(t_cube.coord('time'))
+            month_size = int(numpy.prod(target_shape[1:]))
+            w_data = w_data * month_fracs[index // month_size]
+        if grid and (grid.cell_measure is not None):
+            w_data = w_data * gather(grid.cell_measure, index, target_shape)
+        column_dict['weight'] = w_data
+    if 'basin' in columns:
+        b_data = grid.basin if grid else b_cube.data
+        column_dict['basin'] = gather(b_data, index, target_shape)
+    if pct_cube and ('percentile_weights' in columns):
+        column_dict['percentile_weights'] = gather(pct_cube.data, index, target_shape)
+    if grid and (('latitude' in columns) or ('longitude' in columns)):
+        column_dict['latitude'] = gather(grid.latitude, index, target_shape)
+        column_dict['longitude'] = gather(grid.longitude, index, target_shape)
+    elif ('latitude' in columns) or ('longitude' in columns):
+        t_ndim = t_cube.ndim
+        coord_names = [coord.name() for coord in t_cube.dim_coords]
+        for name in ['latitude', 'longitude']:
+            if name in columns:
+                points = t_cube.coord(name).points
+                axis_index = coord_names.index(name) if points.ndim == 1 else [t_ndim - 2, t_ndim - 1]
+                column_dict[name] = gather(points, index, target_shape, axis_index=axis_index)
+
+    df = WaterMassData(**column_dict)
 
     t_units = t_cube.units
     s_units = s_cube.units if s_cube else None
 
     return df, s_units, t_units
-    
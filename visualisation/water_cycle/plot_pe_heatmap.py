@@ -29,8 +29,32 @@ except ImportError:
     raise ImportError('Script and modules in wrong directories')
 
 
+def cube_to_dataframe(cube, var, pct=False):
+    """Convert a (P-E region, basin) cube to a dataframe"""
+
+    basins = ['Atlantic', 'Pacific', 'Indian', 'Arctic', 'Marginal Seas', 'Land', 'Ocean', 'Globe']
+    pe_regions = ['SH-P', 'SH-E', 'T-P', 'NH-E', 'NH-P', 'Globe']
+    df = pd.DataFrame(cube.data, columns=basins, index=pe_regions)
+    #df.loc['Globe', 'Globe'] = np.nan
+    df = df.iloc[::-1]
+    if pct:
+        if var in ['precipitation_minus_evaporation_flux', 'water_flux_into_sea_water']:
+            total_pos= df['Globe']['NH Precip'] + df['Globe']['Tropical Precip'] + df['Globe']['SH Precip']
+            total_neg = abs(df['Globe']['NH Evap'] + df['Globe']['SH Evap'])
+            df = df / max(total_pos, total_neg)
+        else:
+            df = df / df['Globe']['Globe']
+
+    return df
+
+
 def get_data(infiles, var, data_type, time_constraint, agg_method, pct=False):
-    """Get the data for a particular model"""
+    """Get the data for a particular model.
+
+    For agg_method='ci' the dataframe is a (lower, upper) tuple of the
+      confidence interval bounds.
+
+    """
     
     cube_list = iris.cube.CubeList([])
     for ensnum, infile in enumerate(infiles):
@@ -50,21 +74,15 @@ def get_data(infiles, var, data_type, time_constraint, agg_method, pct=False):
 
     if len(cube_list) > 1:
         ens_cube = ensagg.calc_ensagg(cube_list, operator=agg_method)
+    elif agg_method == 'ci':
+        ens_cube = (cube_list[0], cube_list[0])
     else:
         ens_cube = cube_list[0]
 
-    basins = ['Atlantic', 'Pacific', 'Indian', 'Arctic', 'Marginal Seas', 'Land', 'Ocean', 'Globe']
-    pe_regions = ['SH-P', 'SH-E', 'T-P', 'NH-E', 'NH-P', 'Globe']
-    df = pd.DataFrame(ens_cube.data, columns=basins, index=pe_regions)
-    #df.loc['Globe', 'Globe'] = np.nan
-    df = df.iloc[::-1]
-    if pct:
-        if var in ['precipitation_minus_evaporation_flux', 'water_flux_into_sea_water']:
-            total_pos= df['Globe']['NH Precip'] + df['Globe']['Tropical Precip'] + df['Globe']['SH Precip']
-            total_neg = abs(df['Globe']['NH Evap'] + df['Globe']['SH Evap'])
-            df = df / max(total_pos, total_neg)
-        else:
-            df = df / df['Globe']['Globe']
+    if agg_method == 'ci':
+        df = tuple([cube_to_dataframe(cube, var, pct=pct) for cube in ens_cube])
+    else:
+        df = cube_to_dataframe(ens_cube, var, pct=pct)
         
     return df, history
 
@@ -118,10 +136,8 @@ def plot_data(ax, file_list, inargs, experiment, var_abbrev,
 
     df, history = get_data(file_list, inargs.var, data_type,
                            time_constraint, inargs.ensemble_stat, pct=pct)
-    df_ci_lower, history = get_data(file_list, inargs.var, data_type,
-                                    time_constraint, 'ci-lower')   
-    df_ci_upper, history = get_data(file_list, inargs.var, data_type,
-                                    time_constraint, 'ci-upper')    
+    (df_ci_lower, df_ci_upper), history = get_data(file_list, inargs.var, data_type,
+                                                   time_constraint, 'ci')
     if not pct:
         df = df / 10**scale_factor
         df_ci_lower = df_ci_lower / 10**scale_factor
@@ -17,6 +17,8 @@
 PYTHON=/g/data/e14/dbi599/miniconda3/envs/cmip/bin/python
 DATA_SCRIPT_DIR=/home/599/dbi599/ocean-analysis/data_processing
 VIZ_SCRIPT_DIR=/home/599/dbi599/ocean-analysis/visualisation
+## Scripts run through the persistent worker if one is running (see data_processing/pipeline_worker.py)
+RUN_SCRIPT=${PYTHON} ${DATA_SCRIPT_DIR}/pipeline_client.py
 MY_DATA_DIR=/g/data/e14/dbi599
 SHARED_DATA_DIR=/g/data/e14/dbi599
 AUS_CMIP5_DATA_DIR=/g/data/rr3/publications
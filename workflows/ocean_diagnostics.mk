@@ -13,6 +13,8 @@ TIME_CNTRL=095001-144912
 
 PYTHON=/g/data/e14/dbi599/miniconda3/envs/cmip/bin/python
 SCRIPT_DIR=/home/599/dbi599/ocean-analysis/data_processing
+## Scripts run through the persistent worker if one is running (see data_processing/pipeline_worker.py)
+RUN_SCRIPT=${PYTHON} ${SCRIPT_DIR}/pipeline_client.py
 INDIR_HIST=/g/data/fs38/publications/CMIP6/${PROJECT}/CSIRO-ARCCSS/ACCESS-CM2
 INDIR_CNTRL=/g/data/fs38/publications/CMIP6/CMIP/CSIRO-ARCCSS/ACCESS-CM2
 MYDIR_HIST=/g/data/e14/dbi599/CMIP6/${PROJECT}/CSIRO-ARCCSS/ACCESS-CM2
@@ -68,169 +70,169 @@ FRAZIL_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/frazil-3d/gn/${VERSION_H
 FRAZIL_BINNED_HIST_FILE=${FRAZIL_BINNED_HIST_DIR}/frazil-3d-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${FRAZIL_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${FRAZIL_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${FRAZIL_FILES_HIST} ocn_frazil_heat_flux_over_time_step $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${FRAZIL_FILES_HIST} ocn_frazil_heat_flux_over_time_step $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 	
 FRAZIL_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/frazil-3d/gn/${VERSION_CNTRL}
 FRAZIL_BINNED_CNTRL_FILE=${FRAZIL_BINNED_CNTRL_DIR}/frazil-3d-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${FRAZIL_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${FRAZIL_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${FRAZIL_FILES_CNTRL} ocn_frazil_heat_flux_over_time_step $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${FRAZIL_FILES_CNTRL} ocn_frazil_heat_flux_over_time_step $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 
 
 MIXDOWNSLOPE_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/mixdownslope-temp/gn/${VERSION_HIST}
 MIXDOWNSLOPE_BINNED_HIST_FILE=${MIXDOWNSLOPE_BINNED_HIST_DIR}/mixdownslope-temp-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${MIXDOWNSLOPE_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${MIXDOWNSLOPE_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${MIXDOWNSLOPE_FILES_HIST} "cp*mixdownslope*rho*dzt*temp" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${MIXDOWNSLOPE_FILES_HIST} "cp*mixdownslope*rho*dzt*temp" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 	
 MIXDOWNSLOPE_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/mixdownslope-temp/gn/${VERSION_CNTRL}
 MIXDOWNSLOPE_BINNED_CNTRL_FILE=${MIXDOWNSLOPE_BINNED_CNTRL_DIR}/mixdownslope-temp-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${MIXDOWNSLOPE_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${MIXDOWNSLOPE_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${MIXDOWNSLOPE_FILES_CNTRL} "cp*mixdownslope*rho*dzt*temp" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${MIXDOWNSLOPE_FILES_CNTRL} "cp*mixdownslope*rho*dzt*temp" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 
 
 NEUTRAL_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/neutral-diffusion-temp/gn/${VERSION_HIST}
 NEUTRAL_BINNED_HIST_FILE=${NEUTRAL_BINNED_HIST_DIR}/neutral-diffusion-temp-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${NEUTRAL_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${NEUTRAL_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${NEUTRAL_FILES_HIST} "rho*dzt*cp*explicit neutral diffusion tendency (heating)" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${NEUTRAL_FILES_HIST} "rho*dzt*cp*explicit neutral diffusion tendency (heating)" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 	
 NEUTRAL_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/neutral-diffusion-temp/gn/${VERSION_CNTRL}
 NEUTRAL_BINNED_CNTRL_FILE=${NEUTRAL_BINNED_CNTRL_DIR}/neutral-diffusion-temp-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${NEUTRAL_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${NEUTRAL_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${NEUTRAL_FILES_CNTRL} "rho*dzt*cp*explicit neutral diffusion tendency (heating)" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${NEUTRAL_FILES_CNTRL} "rho*dzt*cp*explicit neutral diffusion tendency (heating)" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 
 
 SFCHP_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/sfc-hflux-pme/gn/${VERSION_HIST}
 SFCHP_BINNED_HIST_FILE=${SFCHP_BINNED_HIST_DIR}/sfc-hflux-pme-tos-sos-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${SFCHP_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${SFCHP_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${SFCHP_FILE_HIST} "heat flux (relative to 0C) from pme transfer of water across ocean surface" $< mon $@ --temperature_files ${TOS_FILES_HIST} --temperature_var sea_surface_temperature --salinity_files ${SOS_FILES_HIST} --salinity_var sea_surface_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${SFCHP_FILE_HIST} "heat flux (relative to 0C) from pme transfer of water across ocean surface" $< mon $@ --temperature_files ${TOS_FILES_HIST} --temperature_var sea_surface_temperature --salinity_files ${SOS_FILES_HIST} --salinity_var sea_surface_salinity --area_file $(word 2,$^)
 	
 SFCHP_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/sfc-hflux-pme/gn/${VERSION_CNTRL}
 SFCHP_BINNED_CNTRL_FILE=${SFCHP_BINNED_CNTRL_DIR}/sfc-hflux-pme-tos-sos-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${SFCHP_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${SFCHP_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${SFCHP_FILES_CNTRL} "heat flux (relative to 0C) from pme transfer of water across ocean surface" $< mon $@ --temperature_files ${TOS_FILES_CNTRL} --temperature_var sea_surface_temperature --salinity_files ${SOS_FILES_CNTRL} --salinity_var sea_surface_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${SFCHP_FILES_CNTRL} "heat flux (relative to 0C) from pme transfer of water across ocean surface" $< mon $@ --temperature_files ${TOS_FILES_CNTRL} --temperature_var sea_surface_temperature --salinity_files ${SOS_FILES_CNTRL} --salinity_var sea_surface_salinity --area_file $(word 2,$^)
 
 
 SWHEAT_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/sw-heat/gn/${VERSION_HIST}
 SWHEAT_BINNED_HIST_FILE=${SWHEAT_BINNED_HIST_DIR}/sw-heat-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${SWHEAT_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${SWHEAT_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${SWHEAT_FILES_HIST} downwelling_shortwave_flux_in_sea_water $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${SWHEAT_FILES_HIST} downwelling_shortwave_flux_in_sea_water $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 	
 SWHEAT_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/sw-heat/gn/${VERSION_CNTRL}
 SWHEAT_BINNED_CNTRL_FILE=${SWHEAT_BINNED_CNTRL_DIR}/sw-heat-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${SWHEAT_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${SWHEAT_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${SWHEAT_FILES_CNTRL} downwelling_shortwave_flux_in_sea_water $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${SWHEAT_FILES_CNTRL} downwelling_shortwave_flux_in_sea_water $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 
 
 ETA_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/temp-eta-smooth/gn/${VERSION_HIST}
 ETA_BINNED_HIST_FILE=${ETA_BINNED_HIST_DIR}/temp-eta-smooth-tos-sos-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${ETA_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${ETA_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${ETA_FILE_HIST} "surface smoother for temp" $< mon $@ --temperature_files ${TOS_FILES_HIST} --temperature_var sea_surface_temperature --salinity_files ${SOS_FILES_HIST} --salinity_var sea_surface_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${ETA_FILE_HIST} "surface smoother for temp" $< mon $@ --temperature_files ${TOS_FILES_HIST} --temperature_var sea_surface_temperature --salinity_files ${SOS_FILES_HIST} --salinity_var sea_surface_salinity --area_file $(word 2,$^)
 	
 ETA_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/temp-eta-smooth/gn/${VERSION_CNTRL}
 ETA_BINNED_CNTRL_FILE=${ETA_BINNED_CNTRL_DIR}/temp-eta-smooth-tos-sos-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${ETA_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${ETA_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${ETA_FILES_CNTRL} "surface smoother for temp" $< mon $@ --temperature_files ${TOS_FILES_CNTRL} --temperature_var sea_surface_temperature --salinity_files ${SOS_FILES_CNTRL} --salinity_var sea_surface_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${ETA_FILES_CNTRL} "surface smoother for temp" $< mon $@ --temperature_files ${TOS_FILES_CNTRL} --temperature_var sea_surface_temperature --salinity_files ${SOS_FILES_CNTRL} --salinity_var sea_surface_salinity --area_file $(word 2,$^)
 
 
 KPP_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/temp-nonlocal-KPP/gn/${VERSION_HIST}
 KPP_BINNED_HIST_FILE=${KPP_BINNED_HIST_DIR}/temp-nonlocal-KPP-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${KPP_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${KPP_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${KPP_FILES_HIST} "cp*rho*dzt*nonlocal tendency from KPP" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${KPP_FILES_HIST} "cp*rho*dzt*nonlocal tendency from KPP" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 	
 KPP_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/temp-nonlocal-KPP/gn/${VERSION_CNTRL}
 KPP_BINNED_CNTRL_FILE=${KPP_BINNED_CNTRL_DIR}/temp-nonlocal-KPP-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${KPP_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${KPP_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${KPP_FILES_CNTRL} "cp*rho*dzt*nonlocal tendency from KPP" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${KPP_FILES_CNTRL} "cp*rho*dzt*nonlocal tendency from KPP" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 
 
 RIVER_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/temp-rivermix/gn/${VERSION_HIST}
 RIVER_BINNED_HIST_FILE=${RIVER_BINNED_HIST_DIR}/temp-rivermix-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${RIVER_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${RIVER_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${RIVER_FILES_HIST} "cp*rivermix*rho_dzt*temp" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${RIVER_FILES_HIST} "cp*rivermix*rho_dzt*temp" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 
 RIVER_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/temp-rivermix/gn/${VERSION_CNTRL}
 RIVER_BINNED_CNTRL_FILE=${RIVER_BINNED_CNTRL_DIR}/temp-rivermix-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${RIVER_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${RIVER_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${RIVER_FILES_CNTRL} "cp*rivermix*rho_dzt*temp" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${RIVER_FILES_CNTRL} "cp*rivermix*rho_dzt*temp" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 
 
 SIGMA_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/temp-sigma-diff/gn/${VERSION_HIST}
 SIGMA_BINNED_HIST_FILE=${SIGMA_BINNED_HIST_DIR}/temp-sigma-diff-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${SIGMA_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${SIGMA_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${SIGMA_FILES_HIST} "thk wghtd sigma-diffusion heating" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${SIGMA_FILES_HIST} "thk wghtd sigma-diffusion heating" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 	
 SIGMA_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/temp-sigma-diff/gn/${VERSION_CNTRL}
 SIGMA_BINNED_CNTRL_FILE=${SIGMA_BINNED_CNTRL_DIR}/temp-sigma-diff-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${SIGMA_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${SIGMA_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${SIGMA_FILES_CNTRL} "thk wghtd sigma-diffusion heating" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${SIGMA_FILES_CNTRL} "thk wghtd sigma-diffusion heating" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 
 
 TENDENCY_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/temp-tendency/gn/${VERSION_HIST}
 TENDENCY_BINNED_HIST_FILE=${TENDENCY_BINNED_HIST_DIR}/temp-tendency-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${TENDENCY_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${TENDENCY_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${TENDENCY_FILES_HIST} "time tendency for tracer Conservative temperature" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${TENDENCY_FILES_HIST} "time tendency for tracer Conservative temperature" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 
 TENDENCY_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/temp-tendency/gn/${VERSION_CNTRL}
 TENDENCY_BINNED_CNTRL_FILE=${TENDENCY_BINNED_CNTRL_DIR}/temp-tendency-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${TENDENCY_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${TENDENCY_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${TENDENCY_FILES_CNTRL} "time tendency for tracer Conservative temperature" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${TENDENCY_FILES_CNTRL} "time tendency for tracer Conservative temperature" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 
 
 CBT_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/temp-vdiffuse-diff-cbt/gn/${VERSION_HIST}
 CBT_BINNED_HIST_FILE=${CBT_BINNED_HIST_DIR}/temp-vdiffuse-diff-cbt-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${CBT_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${CBT_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${CBT_FILES_HIST} "vert diffusion of heat due to diff_cbt" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${CBT_FILES_HIST} "vert diffusion of heat due to diff_cbt" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 	
 CBT_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/temp-vdiffuse-diff-cbt/gn/${VERSION_CNTRL}
 CBT_BINNED_CNTRL_FILE=${CBT_BINNED_CNTRL_DIR}/temp-vdiffuse-diff-cbt-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${CBT_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${CBT_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${CBT_FILES_CNTRL} "vert diffusion of heat due to diff_cbt" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${CBT_FILES_CNTRL} "vert diffusion of heat due to diff_cbt" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 	
 	
 K33_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/temp-vdiffuse-k33/gn/${VERSION_HIST}
 K33_BINNED_HIST_FILE=${K33_BINNED_HIST_DIR}/temp-vdiffuse-k33-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${K33_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${K33_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${K33_FILES_HIST} "vert diffusion of heat due to K33 from neutral diffusion" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${K33_FILES_HIST} "vert diffusion of heat due to K33 from neutral diffusion" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 	
 K33_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/temp-vdiffuse-k33/gn/${VERSION_CNTRL}
 K33_BINNED_CNTRL_FILE=${K33_BINNED_CNTRL_DIR}/temp-vdiffuse-k33-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${K33_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${K33_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${K33_FILES_CNTRL} "vert diffusion of heat due to K33 from neutral diffusion" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${K33_FILES_CNTRL} "vert diffusion of heat due to K33 from neutral diffusion" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 
 
 SBC_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/temp-vdiffuse-sbc/gn/${VERSION_HIST}
 SBC_BINNED_HIST_FILE=${SBC_BINNED_HIST_DIR}/temp-vdiffuse-sbc-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${SBC_BINNED_HIST_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${SBC_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${SBC_FILES_HIST} "vert diffusion of heat due to surface flux" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${SBC_FILES_HIST} "vert diffusion of heat due to surface flux" $< mon $@ --temperature_files ${THETAO_FILES_HIST} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_HIST} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 	
 SBC_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/temp-vdiffuse-sbc/gn/${VERSION_CNTRL}
 SBC_BINNED_CNTRL_FILE=${SBC_BINNED_CNTRL_DIR}/temp-vdiffuse-sbc-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${SBC_BINNED_CNTRL_FILE} : ${BASIN_FILE} ${AREACELLO_FILE}
 	mkdir -p ${SBC_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/water_mass_binning.py ${SBC_FILES_CNTRL} "vert diffusion of heat due to surface flux" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
+	${RUN_SCRIPT} ${SCRIPT_DIR}/water_mass_binning.py ${SBC_FILES_CNTRL} "vert diffusion of heat due to surface flux" $< mon $@ --temperature_files ${THETAO_FILES_CNTRL} --temperature_var sea_water_potential_temperature --salinity_files ${SO_FILES_CNTRL} --salinity_var sea_water_salinity --area_file $(word 2,$^)
 
 
 # Secondary variables
@@ -239,104 +241,104 @@ VMIX_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/vmix/gn/${VERSION_HIST}
 VMIX_BINNED_HIST_FILE=${VMIX_BINNED_HIST_DIR}/vmix-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${VMIX_BINNED_HIST_FILE} : ${CBT_BINNED_HIST_FILE} ${KPP_BINNED_HIST_FILE}
 	mkdir -p ${VMIX_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) vmix $@ --invars "vert diffusion of heat due to diff_cbt" "cp*rho*dzt*nonlocal tendency from KPP" 
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) vmix $@ --invars "vert diffusion of heat due to diff_cbt" "cp*rho*dzt*nonlocal tendency from KPP" 
 
 VMIX_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/vmix/gn/${VERSION_CNTRL}
 VMIX_BINNED_CNTRL_FILE=${VMIX_BINNED_CNTRL_DIR}/vmix-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${VMIX_BINNED_CNTRL_FILE} : ${CBT_BINNED_CNTRL_FILE} ${KPP_BINNED_CNTRL_FILE}
 	mkdir -p ${VMIX_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) vmix $@ --invars "vert diffusion of heat due to diff_cbt" "cp*rho*dzt*nonlocal tendency from KPP" 
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) vmix $@ --invars "vert diffusion of heat due to diff_cbt" "cp*rho*dzt*nonlocal tendency from KPP" 
 
 
 SMIX_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/smix/gn/${VERSION_HIST}
 SMIX_BINNED_HIST_FILE=${SMIX_BINNED_HIST_DIR}/smix-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${SMIX_BINNED_HIST_FILE} : ${MIXDOWNSLOPE_BINNED_HIST_FILE} ${SIGMA_BINNED_HIST_FILE}
 	mkdir -p ${SMIX_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) smix $@ --invars "cp*mixdownslope*rho*dzt*temp" "thk wghtd sigma-diffusion heating" 
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) smix $@ --invars "cp*mixdownslope*rho*dzt*temp" "thk wghtd sigma-diffusion heating" 
 
 SMIX_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/smix/gn/${VERSION_CNTRL}
 SMIX_BINNED_CNTRL_FILE=${SMIX_BINNED_CNTRL_DIR}/smix-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${SMIX_BINNED_CNTRL_FILE} : ${MIXDOWNSLOPE_BINNED_CNTRL_FILE} ${SIGMA_BINNED_CNTRL_FILE}
 	mkdir -p ${SMIX_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) smix $@ --invars "cp*mixdownslope*rho*dzt*temp" "thk wghtd sigma-diffusion heating" 
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) smix $@ --invars "cp*mixdownslope*rho*dzt*temp" "thk wghtd sigma-diffusion heating" 
 
 
 SFCV_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/sfcv/gn/${VERSION_HIST}
 SFCV_BINNED_HIST_FILE=${SFCV_BINNED_HIST_DIR}/sfcv-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${SFCV_BINNED_HIST_FILE} : ${RIVER_BINNED_HIST_FILE} ${SFCHP_BINNED_HIST_FILE}
 	mkdir -p ${SFCV_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) sfcv $@ --invars "cp*rivermix*rho_dzt*temp" "heat flux (relative to 0C) from pme transfer of water across ocean surface" 
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) sfcv $@ --invars "cp*rivermix*rho_dzt*temp" "heat flux (relative to 0C) from pme transfer of water across ocean surface" 
 
 SFCV_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/sfcv/gn/${VERSION_CNTRL}
 SFCV_BINNED_CNTRL_FILE=${SFCV_BINNED_CNTRL_DIR}/sfcv-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${SFCV_BINNED_CNTRL_FILE} : ${RIVER_BINNED_CNTRL_FILE} ${SFCHP_BINNED_CNTRL_FILE}
 	mkdir -p ${SFCV_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) sfcv $@ --invars "cp*rivermix*rho_dzt*temp" "heat flux (relative to 0C) from pme transfer of water across ocean surface"
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) sfcv $@ --invars "cp*rivermix*rho_dzt*temp" "heat flux (relative to 0C) from pme transfer of water across ocean surface"
 	
 
 SFCH_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/sfch/gn/${VERSION_HIST}
 SFCH_BINNED_HIST_FILE=${SFCH_BINNED_HIST_DIR}/sfch-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${SFCH_BINNED_HIST_FILE} : ${SBC_BINNED_HIST_FILE} ${SWHEAT_BINNED_HIST_FILE} ${FRAZIL_BINNED_HIST_FILE} ${ETA_BINNED_HIST_FILE}
 	mkdir -p ${SFCH_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) $(word 3,$^) $(word 4,$^) sfch $@ --invars "vert diffusion of heat due to surface flux" "penetrative shortwave heating" "ocn frazil heat flux over time step" "surface smoother for temp"
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) $(word 3,$^) $(word 4,$^) sfch $@ --invars "vert diffusion of heat due to surface flux" "penetrative shortwave heating" "ocn frazil heat flux over time step" "surface smoother for temp"
 	
 SFCH_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/sfch/gn/${VERSION_CNTRL}
 SFCH_BINNED_CNTRL_FILE=${SFCH_BINNED_CNTRL_DIR}/sfch-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${SFCH_BINNED_CNTRL_FILE} : ${SBC_BINNED_CNTRL_FILE} ${SWHEAT_BINNED_CNTRL_FILE} ${FRAZIL_BINNED_CNTRL_FILE} ${ETA_BINNED_CNTRL_FILE}
 	mkdir -p ${SFCH_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) $(word 3,$^) $(word 4,$^) sfch $@ --invars "vert diffusion of heat due to surface flux" "penetrative shortwave heating" "ocn frazil heat flux over time step" "surface smoother for temp"
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) $(word 3,$^) $(word 4,$^) sfch $@ --invars "vert diffusion of heat due to surface flux" "penetrative shortwave heating" "ocn frazil heat flux over time step" "surface smoother for temp"
 
 
 SFC_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/sfc/gn/${VERSION_HIST}
 SFC_BINNED_HIST_FILE=${SFC_BINNED_HIST_DIR}/sfc-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${SFC_BINNED_HIST_FILE} : ${SFCH_BINNED_HIST_FILE} ${SFCV_BINNED_HIST_FILE}
 	mkdir -p ${SFC_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) sfc $@ --invars "surface heat fluxes" "surface heat fluxes from surface volume fluxes"
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) sfc $@ --invars "surface heat fluxes" "surface heat fluxes from surface volume fluxes"
 
 SFC_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/sfc/gn/${VERSION_CNTRL}
 SFC_BINNED_CNTRL_FILE=${SFC_BINNED_CNTRL_DIR}/sfc-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${SFC_BINNED_CNTRL_FILE} : ${SFCH_BINNED_CNTRL_FILE} ${SFCV_BINNED_CNTRL_FILE}
 	mkdir -p ${SFC_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) sfc $@ --invars "surface heat fluxes" "surface heat fluxes from surface volume fluxes"
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) sfc $@ --invars "surface heat fluxes" "surface heat fluxes from surface volume fluxes"
 
 
 RMIX_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/rmix/gn/${VERSION_HIST}
 RMIX_BINNED_HIST_FILE=${RMIX_BINNED_HIST_DIR}/rmix-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${RMIX_BINNED_HIST_FILE} : ${K33_BINNED_HIST_FILE} ${NEUTRAL_BINNED_HIST_FILE}
 	mkdir -p ${RMIX_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) rmix $@ --invars "vert diffusion of heat due to K33 from neutral diffusion" "rho*dzt*cp*explicit neutral diffusion tendency (heating)"
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) rmix $@ --invars "vert diffusion of heat due to K33 from neutral diffusion" "rho*dzt*cp*explicit neutral diffusion tendency (heating)"
 
 RMIX_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/rmix/gn/${VERSION_CNTRL}
 RMIX_BINNED_CNTRL_FILE=${RMIX_BINNED_CNTRL_DIR}/rmix-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${RMIX_BINNED_CNTRL_FILE} : ${K33_BINNED_CNTRL_FILE} ${NEUTRAL_BINNED_CNTRL_FILE}
 	mkdir -p ${RMIX_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) rmix $@ --invars "vert diffusion of heat due to K33 from neutral diffusion" "rho*dzt*cp*explicit neutral diffusion tendency (heating)"
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) rmix $@ --invars "vert diffusion of heat due to K33 from neutral diffusion" "rho*dzt*cp*explicit neutral diffusion tendency (heating)"
 
 
 MIX_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/mix/gn/${VERSION_HIST}
 MIX_BINNED_HIST_FILE=${MIX_BINNED_HIST_DIR}/mix-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${MIX_BINNED_HIST_FILE} : ${VMIX_BINNED_HIST_FILE} ${SMIX_BINNED_HIST_FILE} ${RMIX_BINNED_HIST_FILE}
 	mkdir -p ${MIX_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) $(word 3,$^) mix $@ --invars "vertical mixing" "miscellaneous mixing" "neutral diffusion"
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) $(word 3,$^) mix $@ --invars "vertical mixing" "miscellaneous mixing" "neutral diffusion"
 
 MIX_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/mix/gn/${VERSION_CNTRL}
 MIX_BINNED_CNTRL_FILE=${MIX_BINNED_CNTRL_DIR}/mix-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${MIX_BINNED_CNTRL_FILE} : ${VMIX_BINNED_CNTRL_FILE} ${SMIX_BINNED_CNTRL_FILE} ${RMIX_BINNED_CNTRL_FILE}
 	mkdir -p ${MIX_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) $(word 3,$^) mix $@ --invars "vertical mixing" "miscellaneous mixing" "neutral diffusion"
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_binned_flux_sum.py $< $(word 2,$^) $(word 3,$^) mix $@ --invars "vertical mixing" "miscellaneous mixing" "neutral diffusion"
 
 
 SFCI_BINNED_HIST_DIR=${MYDIR_HIST}/${EXP}/${RUN}/Omon/sfci/gn/${VERSION_HIST}
 SFCI_BINNED_HIST_FILE=${SFCI_BINNED_HIST_DIR}/sfci-thetao-so-binned_Omon_ACCESS-CM2_${EXP}_${RUN}_gn_${TIME_HIST}.nc
 ${SFCI_BINNED_HIST_FILE} : ${SFC_BINNED_HIST_FILE} ${WFO_BINNED_HIST_FILE}
 	mkdir -p ${SFCI_BINNED_HIST_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_sfci.py $< $(word 2,$^) $@
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_sfci.py $< $(word 2,$^) $@
 
 SFCI_BINNED_CNTRL_DIR=${MYDIR_CNTRL}/piControl/r1i1p1f1/Omon/sfci/gn/${VERSION_CNTRL}
 SFCI_BINNED_CNTRL_FILE=${SFCI_BINNED_CNTRL_DIR}/sfci-thetao-so-binned_Omon_ACCESS-CM2_piControl_r1i1p1f1_gn_${TIME_CNTRL}.nc
 ${SFCI_BINNED_CNTRL_FILE} : ${SFC_BINNED_CNTRL_FILE} ${WFO_BINNED_CNTRL_FILE}
 	mkdir -p ${SFCI_BINNED_CNTRL_DIR}
-	${PYTHON} ${SCRIPT_DIR}/calc_sfci.py $< $(word 2,$^) $@
+	${RUN_SCRIPT} ${SCRIPT_DIR}/calc_sfci.py $< $(word 2,$^) $@
 
 
 # Documentation
@@ -38,13 +38,13 @@ BINNED_ALPHA_DIR_EXP=${SHARED_DATA_DIR}/${PROJECT}/${MIP}/${INSTITUTION}/${MODEL
 BINNED_ALPHA_FILE_EXP=${BINNED_ALPHA_DIR_EXP}/alpha-binned_O${BIN_FREQ}_${MODEL}_${EXPERIMENT}_${EXP_RUN}_${GRID_OCEAN}_${EXP_TIME}.nc
 ${BINNED_ALPHA_FILE_EXP} : ${BASIN_FILE} ${VOLCELLO_FILE}
 	mkdir -p ${BINNED_ALPHA_DIR_EXP}
-	${PYTHON} ${DATA_SCRIPT_DIR}/water_mass_binning.py ${ALPHA_FILES_EXP} thermal_expansion_coefficient $< ${BIN_FREQ} $@ --salinity_files ${SALINITY_FILES_EXP} --salinity_var sea_water_salinity --temperature_files ${TEMPERATURE_FILES_EXP} --temperature_var sea_water_potential_temperature --volume_file $(word 2,$^)
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/water_mass_binning.py ${ALPHA_FILES_EXP} thermal_expansion_coefficient $< ${BIN_FREQ} $@ --salinity_files ${SALINITY_FILES_EXP} --salinity_var sea_water_salinity --temperature_files ${TEMPERATURE_FILES_EXP} --temperature_var sea_water_potential_temperature --volume_file $(word 2,$^)
 
 BINNED_ALPHA_DIR_CNTRL=${SHARED_DATA_DIR}/${PROJECT}/CMIP/${INSTITUTION}/${MODEL}/piControl/${CNTRL_RUN}/O${BIN_FREQ}/alpha/${GRID_OCEAN}/${CNTRL_VERSION}
 BINNED_ALPHA_FILE_CNTRL=${BINNED_ALPHA_DIR_CNTRL}/alpha-binned_O${BIN_FREQ}_${MODEL}_piControl_${CNTRL_RUN}_${GRID_OCEAN}_${CNTRL_TIME}.nc
 ${BINNED_ALPHA_FILE_CNTRL} : ${BASIN_FILE} ${VOLCELLO_FILE}
 	mkdir -p ${BINNED_ALPHA_DIR_CNTRL}
-	${PYTHON} ${DATA_SCRIPT_DIR}/water_mass_binning.py ${ALPHA_FILES_CNTRL} thermal_expansion_coefficient $< ${BIN_FREQ} $@ --salinity_files ${SALINITY_FILES_CNTRL} --salinity_var sea_water_salinity --temperature_files ${TEMPERATURE_FILES_CNTRL} --temperature_var sea_water_potential_temperature --volume_file $(word 2,$^)
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/water_mass_binning.py ${ALPHA_FILES_CNTRL} thermal_expansion_coefficient $< ${BIN_FREQ} $@ --salinity_files ${SALINITY_FILES_CNTRL} --salinity_var sea_water_salinity --temperature_files ${TEMPERATURE_FILES_CNTRL} --temperature_var sea_water_potential_temperature --volume_file $(word 2,$^)
 
 
 # BINNING - saline contraction coefficient (beta)
@@ -53,13 +53,13 @@ BINNED_BETA_DIR_EXP=${SHARED_DATA_DIR}/${PROJECT}/${MIP}/${INSTITUTION}/${MODEL}
 BINNED_BETA_FILE_EXP=${BINNED_BETA_DIR_EXP}/beta-binned_O${BIN_FREQ}_${MODEL}_${EXPERIMENT}_${EXP_RUN}_${GRID_OCEAN}_${EXP_TIME}.nc
 ${BINNED_BETA_FILE_EXP} : ${BASIN_FILE} ${VOLCELLO_FILE}
 	mkdir -p ${BINNED_BETA_DIR_EXP}
-	${PYTHON} ${DATA_SCRIPT_DIR}/water_mass_binning.py ${BETA_FILES_EXP} saline_contraction_coefficient $< ${BIN_FREQ} $@ --salinity_files ${SALINITY_FILES_EXP} --salinity_var sea_water_salinity --temperature_files ${TEMPERATURE_FILES_EXP} --temperature_var sea_water_potential_temperature --volume_file $(word 2,$^)
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/water_mass_binning.py ${BETA_FILES_EXP} saline_contraction_coefficient $< ${BIN_FREQ} $@ --salinity_files ${SALINITY_FILES_EXP} --salinity_var sea_water_salinity --temperature_files ${TEMPERATURE_FILES_EXP} --temperature_var sea_water_potential_temperature --volume_file $(word 2,$^)
 
 BINNED_BETA_DIR_CNTRL=${SHARED_DATA_DIR}/${PROJECT}/CMIP/${INSTITUTION}/${MODEL}/piControl/${CNTRL_RUN}/O${BIN_FREQ}/beta/${GRID_OCEAN}/${CNTRL_VERSION}
 BINNED_BETA_FILE_CNTRL=${BINNED_BETA_DIR_CNTRL}/beta-binned_O${BIN_FREQ}_${MODEL}_piControl_${CNTRL_RUN}_${GRID_OCEAN}_${CNTRL_TIME}.nc
 ${BINNED_BETA_FILE_CNTRL} : ${BASIN_FILE} ${VOLCELLO_FILE}
 	mkdir -p ${BINNED_BETA_DIR_CNTRL}
-	${PYTHON} ${DATA_SCRIPT_DIR}/water_mass_binning.py ${BETA_FILES_CNTRL} saline_contraction_coefficient $< ${BIN_FREQ} $@ --salinity_files ${SALINITY_FILES_CNTRL} --salinity_var sea_water_salinity --temperature_files ${TEMPERATURE_FILES_CNTRL} --temperature_var sea_water_potential_temperature --volume_file $(word 2,$^)
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/water_mass_binning.py ${BETA_FILES_CNTRL} saline_contraction_coefficient $< ${BIN_FREQ} $@ --salinity_files ${SALINITY_FILES_CNTRL} --salinity_var sea_water_salinity --temperature_files ${TEMPERATURE_FILES_CNTRL} --temperature_var sea_water_potential_temperature --volume_file $(word 2,$^)
 
 
 # targets
@@ -22,7 +22,7 @@ FLUX_REMAPPED_DIR_EXP=${MY_DATA_DIR}/${PROJECT}/${MIP}/${INSTITUTION}/${MODEL}/$
 FLUX_REMAPPED_FILE_EXP=${FLUX_REMAPPED_DIR_EXP}/${VAR}_Oyr_${MODEL}_${EXPERIMENT}_${EXP_RUN}_x360y180_${EXP_TIME}.nc
 ${FLUX_REMAPPED_FILE_EXP} :
 	mkdir -p ${FLUX_REMAPPED_DIR_EXP}
-	${PYTHON} ${DATA_SCRIPT_DIR}/regrid.py ${FLUX_FILES_EXP} ${FLUX_STD_NAME} $@ --annual --lats -89.5 89.5 1 --lons 0.5 359.5 1
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/regrid.py ${FLUX_FILES_EXP} ${FLUX_STD_NAME} $@ --annual --lats -89.5 89.5 1 --lons 0.5 359.5 1
 
 # control
 
@@ -30,7 +30,7 @@ FLUX_REMAPPED_DIR_CNTRL=${MY_DATA_DIR}/${PROJECT}/CMIP/${INSTITUTION}/${MODEL}/p
 FLUX_REMAPPED_FILE_CNTRL=${FLUX_REMAPPED_DIR_CNTRL}/${VAR}_Oyr_${MODEL}_piControl_${CNTRL_RUN}_x360y180_${CNTRL_TIME}.nc
 ${FLUX_REMAPPED_FILE_CNTRL} :
 	mkdir -p ${FLUX_REMAPPED_DIR_CNTRL}
-	${PYTHON} ${DATA_SCRIPT_DIR}/regrid.py ${FLUX_FILES_CNTRL} ${FLUX_STD_NAME} $@ --annual --lats -89.5 89.5 1 --lons 0.5 359.5 1
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/regrid.py ${FLUX_FILES_CNTRL} ${FLUX_STD_NAME} $@ --annual --lats -89.5 89.5 1 --lons 0.5 359.5 1
 
 # targets
 
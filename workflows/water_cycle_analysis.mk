@@ -39,7 +39,7 @@ WFO_DIR_HIST=${MY_EXP_DATA_DIR}/${INSTITUTION}/${MODEL}/${EXPERIMENT}/${HIST_RUN
 WFO_ZONAL_SUM_FILE_HIST=${WFO_DIR_HIST}/wfo-zonal-sum_Oyr_${MODEL}_${EXPERIMENT}_${HIST_RUN}_${GRID}_${HIST_TIME}-cumsum.nc
 ${WFO_ZONAL_SUM_FILE_HIST} : ${AREACELLO_FILE}
 	mkdir -p ${WFO_DIR_HIST}
-	${PYTHON} ${DATA_SCRIPT_DIR}/calc_horizontal_aggregate.py ${WFO_FILES_HIST} water_flux_into_sea_water zonal sum $@ --area $< --annual --cumsum --flux_to_mag ${REF_FILE}
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/calc_horizontal_aggregate.py ${WFO_FILES_HIST} water_flux_into_sea_water zonal sum $@ --area $< --annual --cumsum --flux_to_mag ${REF_FILE}
 
 ## control zonal sum
 
@@ -47,17 +47,17 @@ WFO_DIR_CNTRL=${MY_CNTRL_DATA_DIR}/${INSTITUTION}/${MODEL}/piControl/${CNTRL_RUN
 WFO_ZONAL_SUM_FILE_CNTRL=${WFO_DIR_CNTRL}/wfo-zonal-sum_Oyr_${MODEL}_piControl_${CNTRL_RUN}_${GRID}_${CNTRL_TIME}-cumsum.nc
 ${WFO_ZONAL_SUM_FILE_CNTRL} : ${AREACELLO_FILE}
 	mkdir -p ${WFO_DIR_CNTRL}
-	${PYTHON} ${DATA_SCRIPT_DIR}/calc_horizontal_aggregate.py ${WFO_FILES_CNTRL} water_flux_into_sea_water zonal sum $@ --area $< --annual --cumsum --flux_to_mag ${REF_FILE}
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/calc_horizontal_aggregate.py ${WFO_FILES_CNTRL} water_flux_into_sea_water zonal sum $@ --area $< --annual --cumsum --flux_to_mag ${REF_FILE}
 
 ## cumulative anomaly
 
 WFO_COEFFICIENTS=${WFO_DIR_CNTRL}/wfo-zonal-sum-coefficients_Oyr_${MODEL}_piControl_${CNTRL_RUN}_${GRID}_${CNTRL_TIME}-cumsum.nc
 ${WFO_COEFFICIENTS} : ${WFO_ZONAL_SUM_FILE_CNTRL}
-	${PYTHON} ${DATA_SCRIPT_DIR}/calc_drift_coefficients.py $< water_flux_into_sea_water $@
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/calc_drift_coefficients.py $< water_flux_into_sea_water $@
 
 WFO_ANOMALY_CUMSUM=${WFO_DIR_HIST}/wfo-zonal-sum-anomaly_Oyr_${MODEL}_${EXPERIMENT}_${HIST_RUN}_${GRID}_${HIST_TIME}-cumsum.nc
 ${WFO_ANOMALY_CUMSUM} : ${WFO_ZONAL_SUM_FILE_HIST} ${WFO_COEFFICIENTS} 
-	${PYTHON} ${DATA_SCRIPT_DIR}/remove_drift.py $< water_flux_into_sea_water annual $(word 2,$^) $@ --no_parent_check
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/remove_drift.py $< water_flux_into_sea_water annual $(word 2,$^) $@ --no_parent_check
 
 
 # so
@@ -68,11 +68,11 @@ MY_VOLCELLO_DIR=${MY_FX_DATA_DIR}/${INSTITUTION}/${MODEL}/${FX_EXP}/${FX_RUN}/Of
 VOLCELLO_VS=${MY_VOLCELLO_DIR}/volcello-vertical-sum_Ofx_${MODEL}_${FX_EXP}_${FX_RUN}_${GRID}.nc
 ${VOLCELLO_VS} : ${VOLCELLO_FILE}
 	mkdir -p ${MY_VOLCELLO_DIR}	
-	${PYTHON} ${DATA_SCRIPT_DIR}/calc_vertical_aggregate.py $< ocean_volume sum $@
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/calc_vertical_aggregate.py $< ocean_volume sum $@
 
 VOLCELLO_VZS=${MY_VOLCELLO_DIR}/volcello-vertical-zonal-sum_Ofx_${MODEL}_${FX_EXP}_${FX_RUN}_${GRID}.nc
 ${VOLCELLO_VZS} : ${VOLCELLO_VS}
-	${PYTHON} ${DATA_SCRIPT_DIR}/calc_horizontal_aggregate.py $< ocean_volume zonal sum $@ ${REF_FILE}
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/calc_horizontal_aggregate.py $< ocean_volume zonal sum $@ ${REF_FILE}
 
 ## experiment vertical zonal mean
 
@@ -81,7 +81,7 @@ SO_VZM_HIST=${SO_DIR_HIST}/so-vertical-zonal-mean_Oyr_${MODEL}_${EXPERIMENT}_${H
 ${SO_VZM_HIST} : ${VOLCELLO_VS}
 	mkdir -p ${SO_DIR_HIST}
 	bash ${DATA_SCRIPT_DIR}/calc_vertical_aggregate.sh ${SO_DIR_HIST} ${SALINITY_FILES_HIST}
-	${PYTHON} ${DATA_SCRIPT_DIR}/calc_horizontal_aggregate.py ${SO_DIR_HIST}/so-vertical-mean_*.nc sea_water_salinity zonal mean $@ --weights $< ${REF_FILE}
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/calc_horizontal_aggregate.py ${SO_DIR_HIST}/so-vertical-mean_*.nc sea_water_salinity zonal mean $@ --weights $< ${REF_FILE}
 
 ## control vertical zonal mean
 
@@ -90,28 +90,28 @@ SO_VZM_CNTRL=${SO_DIR_CNTRL}/so-vertical-zonal-mean_Oyr_${MODEL}_piControl_${CNT
 ${SO_VZM_CNTRL} : ${VOLCELLO_VS}
 	mkdir -p ${SO_DIR_CNTRL}
 	bash ${DATA_SCRIPT_DIR}/calc_vertical_aggregate.sh ${SO_DIR_CNTRL} ${SALINITY_FILES_CNTRL}
-	${PYTHON} ${DATA_SCRIPT_DIR}/calc_horizontal_aggregate.py ${SO_DIR_CNTRL}/so-vertical-mean_*.nc sea_water_salinity zonal mean $@ --weights $< ${REF_FILE}
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/calc_horizontal_aggregate.py ${SO_DIR_CNTRL}/so-vertical-mean_*.nc sea_water_salinity zonal mean $@ --weights $< ${REF_FILE}
 
 ## dedrifting
 
 SO_COEFFICIENTS=${SO_DIR_CNTRL}/so-vertical-zonal-mean-coefficients_Oyr_${MODEL}_piControl_${CNTRL_RUN}_${GRID}_${CNTRL_TIME}.nc
 ${SO_COEFFICIENTS} : ${SO_VZM_CNTRL}
-	${PYTHON} ${DATA_SCRIPT_DIR}/calc_drift_coefficients.py $< sea_water_salinity $@ --outlier_threshold 0.01
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/calc_drift_coefficients.py $< sea_water_salinity $@ --outlier_threshold 0.01
 
 SO_VZM_HIST_DEDRIFTED=${SO_DIR_HIST}/so-vertical-zonal-mean-dedrifted_Oyr_${MODEL}_${EXPERIMENT}_${HIST_RUN}_${GRID}_${HIST_TIME}.nc
 ${SO_VZM_HIST_DEDRIFTED} : ${SO_VZM_HIST} ${SO_COEFFICIENTS}
-	${PYTHON} ${DATA_SCRIPT_DIR}/remove_drift.py $< sea_water_salinity annual $(word 2,$^) $@ --no_parent_check
+	${RUN_SCRIPT} ${DATA_SCRIPT_DIR}/remove_drift.py $< sea_water_salinity annual $(word 2,$^) $@ --no_parent_check
 
 SO_VZM_PLOT=/g/data/r87/dbi599/temp/so-vertical-zonal-mean-dedrifted_Oyr_${MODEL}_piControl_${CNTRL_RUN}_${GRID}_${CNTRL_TIME}_grid-point-50.png
 ${SO_VZM_PLOT} : ${SO_COEFFICIENTS} ${SO_VZM_CNTRL} ${SO_VZM_HIST} ${SO_VZM_HIST_DEDRIFTED}
-	${PYTHON} ${VIZ_SCRIPT_DIR}/plot_drift.py sea_water_salinity $@ --coefficient_file $< --control_files $(word 2,$^) --experiment_files $(word 3,$^) --dedrifted_files $(word 4,$^) --grid_point 50 --outlier_threshold 0.01 ${BRANCH_TIME}
+	${RUN_SCRIPT} ${VIZ_SCRIPT_DIR}/plot_drift.py sea_water_salinity $@ --coefficient_file $< --control_files $(word 2,$^) --experiment_files $(word 3,$^) --dedrifted_files $(word 4,$^) --grid_point 50 --outlier_threshold 0.01 ${BRANCH_TIME}
 
 
 # final plot
 
 FINAL_PLOT=/g/data/r87/dbi599/temp/water-cycle-change_Oyr_${MODEL}_${EXPERIMENT}_${HIST_RUN}_${GRID}_${HIST_TIME}.png
 ${FINAL_PLOT} : ${VOLCELLO_VZS} ${WFO_ANOMALY_CUMSUM} ${SO_VZM_HIST_DEDRIFTED}
-	${PYTHON} ${VIZ_SCRIPT_DIR}/water_cycle/plot_zonal_water_budget_change.py $@ $< --hist_files $(word 2,$^) $(word 3,$^) --experiments ${EXPERIMENT} 
+	${RUN_SCRIPT} ${VIZ_SCRIPT_DIR}/water_cycle/plot_zonal_water_budget_change.py $@ $< --hist_files $(word 2,$^) $(word 3,$^) --experiments ${EXPERIMENT} 
 
 # targets
 